@@ -0,0 +1,74 @@
+"""Microbenchmark: compiled BlockerMatcher vs the per-call scans it replaced
+
+Run with: python benchmarks/bench_blocker_detection.py [n_items]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import timeit
+from core.blocker_detection import BlockerMatcher
+
+MESSAGE_PHRASES = ["blocked", "stuck", "waiting", "help", "issue"]
+CARD_PHRASES = ['blocker', 'blocked', 'stuck', 'help needed', 'urgent', 'critical']
+WORDS = ("the deploy api review merge sprint ticket login payment test build "
+         "release backend frontend design docs pipeline cache query").split()
+
+def legacy_detect_blocker(text):
+    """Previous bots.slack_bot.detect_blocker"""
+    blocker_phrases = ["blocked", "stuck", "waiting", "help", "issue"]
+    return any(phrase in text.lower() for phrase in blocker_phrases)
+
+def legacy_card_flags(cards):
+    """Previous ui.dashboard.show_blockers_section trigger loop"""
+    flags = []
+    for card in cards:
+        blocker_triggers = ['blocker', 'blocked', 'stuck', 'help needed', 'urgent', 'critical']
+        flags.append(any(trigger in card.get('name', '').lower() or
+                         trigger in card.get('desc', '').lower()
+                         for trigger in blocker_triggers))
+    return flags
+
+def make_corpus(n, phrases, words_per_item=25):
+    rng = random.Random(42)
+    items = []
+    for _ in range(n):
+        words = [rng.choice(WORDS) for _ in range(words_per_item)]
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words)), rng.choice(phrases).upper())
+        items.append(" ".join(words))
+    return items
+
+def bench(label, fn, repeat=5):
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print(f"{label:<42} {best * 1e3:9.2f} ms")
+    return best
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    messages = make_corpus(n, MESSAGE_PHRASES)
+    cards = [{'name': name, 'desc': desc}
+             for name, desc in zip(make_corpus(n, CARD_PHRASES, 6), make_corpus(n, CARD_PHRASES))]
+    message_matcher = BlockerMatcher(MESSAGE_PHRASES)
+    card_matcher = BlockerMatcher(CARD_PHRASES)
+
+    print(f"Messages: {n}")
+    legacy = bench("legacy detect_blocker (per message)",
+                   lambda: [legacy_detect_blocker(m) for m in messages])
+    single = bench("BlockerMatcher.matches (per message)",
+                   lambda: [message_matcher.matches(m) for m in messages])
+    batch = bench("BlockerMatcher.match_many (one pass)",
+                  lambda: message_matcher.match_many(messages))
+    print(f"  speedup: {legacy / single:.1f}x per message, {legacy / batch:.1f}x batched")
+
+    print(f"Cards: {n}")
+    legacy = bench("legacy dashboard trigger loop",
+                   lambda: legacy_card_flags(cards))
+    batch = bench("BlockerMatcher.match_many (name + desc)",
+                  lambda: card_matcher.match_many(
+                      f"{c['name']}\n{c['desc']}" for c in cards))
+    print(f"  speedup: {legacy / batch:.1f}x")
+
+if __name__ == "__main__":
+    main()
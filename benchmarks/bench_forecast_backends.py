@@ -0,0 +1,105 @@
+"""Benchmark: risk forecast backends on the fallback series and recorded boards
+
+For each series and backend, reports fit+predict latency and rolling-origin
+accuracy: the model is trained up to each of the last few weeks, forecasts
+the following 7 days and is scored by MAE of yhat and by how often the
+actual value stays under yhat_upper (about 90% is expected). Prophet's
+import time is measured separately in a fresh interpreter.
+
+Recorded boards are board snapshot files (board_<id>.json in BOARD_CACHE_DIR
+by default), or any paths given on the command line.
+
+Run with: python benchmarks/bench_forecast_backends.py [snapshot.json ...]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import glob
+import json
+import time
+import subprocess
+import numpy as np
+import pandas as pd
+from core.config import BOARD_CACHE_DIR
+from core.board_snapshot import SNAPSHOT_FORMAT
+from models.forecast_backends import BACKENDS
+from models.risk_predictor import RiskPredictor, PROPHET_PARAMS, daily_task_series
+
+HORIZON = 7
+ORIGINS = 3  # Weekly forecast origins per series
+REPEATS = 5
+
+class ProphetAdapter:
+    """Prophet behind the fit/predict(periods) backend interface"""
+    name = 'prophet'
+
+    def fit(self, df):
+        from prophet import Prophet
+        self.model = Prophet(**PROPHET_PARAMS).fit(df)
+        return self
+
+    def predict(self, periods):
+        future = self.model.make_future_dataframe(periods=periods)
+        return self.model.predict(future)[['ds', 'yhat', 'yhat_upper']].tail(periods)
+
+def load_series(paths):
+    series = {'fallback': RiskPredictor(backend='robust-trend')._generate_fallback_data()}
+    for path in paths:
+        with open(path) as f:
+            snapshot = json.load(f)
+        if snapshot.get('format') != SNAPSHOT_FORMAT:
+            print(f"Skipping {path}: snapshot format {snapshot.get('format')}, expected {SNAPSHOT_FORMAT}")
+            continue
+        end_date = pd.Timestamp(snapshot.get('fetched_at') or time.time(), unit='s').date()
+        df = daily_task_series(snapshot['cards'], end_date=end_date)
+        if len(df) >= 7 + ORIGINS * HORIZON:
+            series[f"board {snapshot.get('board_id', os.path.basename(path))}"] = df
+        else:
+            print(f"Skipping {path}: only {len(df)} active days")
+    return series
+
+def evaluate(make_backend, df):
+    """Median fit+predict seconds on the full series, then rolling-origin MAE and coverage"""
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        make_backend().fit(df).predict(HORIZON)
+        timings.append(time.perf_counter() - started)
+
+    daily = df.set_index(pd.to_datetime(df['ds']).dt.normalize())['y'].asfreq('D', fill_value=0)
+    errors, covered = [], []
+    for k in range(ORIGINS, 0, -1):
+        cutoff = len(daily) - k * HORIZON
+        train = daily.iloc[:cutoff].rename_axis('ds').reset_index()
+        actual = daily.iloc[cutoff:cutoff + HORIZON].to_numpy()
+        forecast = make_backend().fit(train).predict(HORIZON)
+        errors.extend(np.abs(forecast['yhat'].to_numpy() - actual))
+        covered.extend(actual <= forecast['yhat_upper'].to_numpy())
+    return float(np.median(timings)), float(np.mean(errors)), float(np.mean(covered))
+
+def prophet_import_seconds():
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', 'import prophet'], capture_output=True)
+    return time.perf_counter() - started if result.returncode == 0 else None
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(BOARD_CACHE_DIR, 'board_*.json')))
+    series = load_series(paths)
+    backends = dict(BACKENDS)
+
+    import_seconds = prophet_import_seconds()
+    if import_seconds is None:
+        print("prophet not installed, comparing NumPy backends only")
+    else:
+        backends['prophet'] = ProphetAdapter
+        print(f"prophet import: {import_seconds:.2f}s (fresh interpreter)")
+
+    print(f"{'series':<24}{'backend':<14}{'fit+predict ms':>16}{'MAE':>8}{'coverage':>10}")
+    for name, df in series.items():
+        for backend_name, backend in backends.items():
+            seconds, mae, coverage = evaluate(backend, df)
+            print(f"{name:<24}{backend_name:<14}{seconds * 1e3:>16.1f}{mae:>8.2f}{coverage:>10.0%}")
+
+if __name__ == "__main__":
+    main()
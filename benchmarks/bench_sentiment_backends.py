@@ -0,0 +1,102 @@
+"""Benchmark: sentiment backends on a fixed retro-message corpus
+
+Each backend runs in a fresh process so load time and peak RSS are not
+shared. Reports messages/s with fixed batches of 8 and with the length-bucketed
+scheduler, per-batch latency, peak RSS and top-label agreement with the
+full-precision pipeline.
+
+Run with: python benchmarks/bench_sentiment_backends.py [n_messages] [backend ...]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import resource
+import time
+import multiprocessing
+import numpy as np
+
+BATCH_SIZE = 8
+OPENERS = ["I think", "Honestly", "This sprint", "The team", "Our standups", "Release week"]
+PHRASES = [
+    "went really well and we shipped everything we planned",
+    "was frustrating because the CI kept failing on unrelated tests",
+    "felt okay, nothing special to report",
+    "had too many meetings and not enough focus time",
+    "was great, pairing on the payment flow helped a lot",
+    "slipped because requirements changed twice mid-sprint",
+    "needs better handoffs between design and backend",
+    "was calm and predictable",
+]
+
+def make_corpus(n):
+    """Deterministic mix of short and long messages"""
+    rng = random.Random(13)
+    corpus = []
+    for _ in range(n):
+        parts = [f"{rng.choice(OPENERS)} {rng.choice(PHRASES)}" for _ in range(rng.choice([1, 1, 2, 4]))]
+        corpus.append(". ".join(parts) + ".")
+    return corpus
+
+def run_backend(backend, corpus, queue):
+    from models.sentiment_backends import load_sentiment_analyzer, classify_batched
+    started = time.perf_counter()
+    analyzer = load_sentiment_analyzer(backend)
+    load_time = time.perf_counter() - started
+
+    analyzer(corpus[:BATCH_SIZE])  # Warm-up
+    latencies = []
+    labels = []
+    started = time.perf_counter()
+    for i in range(0, len(corpus), BATCH_SIZE):
+        batch_started = time.perf_counter()
+        results = analyzer(corpus[i:i + BATCH_SIZE])
+        latencies.append(time.perf_counter() - batch_started)
+        labels.extend(max(r, key=lambda x: x['score'])['label'] for r in results)
+    elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    classify_batched(analyzer, corpus)
+    bucketed_elapsed = time.perf_counter() - started
+
+    queue.put({
+        'backend': backend,
+        'load_s': load_time,
+        'msgs_per_s': len(corpus) / elapsed,
+        'bucketed_per_s': len(corpus) / bucketed_elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)) * 1e3,
+        'p95_ms': float(np.percentile(latencies, 95)) * 1e3,
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'labels': labels,
+    })
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    backends = sys.argv[2:] or ['pytorch', 'pytorch-int8', 'onnx', 'onnx-int8']
+    corpus = make_corpus(n)
+    ctx = multiprocessing.get_context('spawn')
+
+    results = []
+    for backend in backends:
+        queue = ctx.Queue()
+        process = ctx.Process(target=run_backend, args=(backend, corpus, queue))
+        process.start()
+        try:
+            results.append(queue.get(timeout=1800))
+        except Exception:
+            print(f"{backend}: failed (see log output above)")
+        process.join()
+
+    reference = next((r['labels'] for r in results if r['backend'] == 'pytorch'), None)
+    print(f"Messages: {n}, batch size {BATCH_SIZE}")
+    print(f"{'backend':<14}{'load s':>8}{'msg/s':>9}{'bucketed':>10}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'RSS MB':>9}{'agree':>8}")
+    for r in results:
+        agree = (f"{np.mean(np.array(r['labels']) == np.array(reference)):.1%}"
+                 if reference is not None else '-')
+        print(f"{r['backend']:<14}{r['load_s']:>8.1f}{r['msgs_per_s']:>9.1f}{r['bucketed_per_s']:>10.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['rss_mb']:>9.0f}{agree:>8}")
+
+if __name__ == "__main__":
+    main()
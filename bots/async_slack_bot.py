@@ -0,0 +1,148 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
+from slack_sdk.errors import SlackApiError
+from core.config import (
+    SLACK_BOT_TOKEN,
+    SLACK_SIGNING_SECRET,
+    SLACK_APP_TOKEN
+)
+from core.logger import configure_logger
+from core.blocker_detection import detect_blocker
+from core.trello_client import AsyncTrelloClient
+from bots.blocker_queue import BlockerQueue, AsyncBlockerWorker
+from bots.channel_cache import get_channel_cache
+from bots.standup_dispatcher import dispatch_standup, new_run_id
+from bots.event_dispatcher import SeenEvents, make_async_dedupe_middleware
+
+logger = configure_logger(__name__)
+
+# asyncio counterpart of bots/slack_bot.py: one event loop serves every event,
+# with Slack calls on AsyncWebClient and Trello calls on AsyncTrelloClient
+app = AsyncApp(
+    token=SLACK_BOT_TOKEN,
+    signing_secret=SLACK_SIGNING_SECRET
+)
+
+blocker_queue = BlockerQueue(source='async_bot')
+# Redeliveries of events already seen are acked without running listeners again
+app.use(make_async_dedupe_middleware(SeenEvents()))
+trello_client = AsyncTrelloClient()
+
+@app.event("app_mention")
+async def handle_mentions(event, say):
+    user_id = event["user"]
+    await say(
+        channel=user_id,
+        text="Hello! I'm your AI Scrum Master. Type `daily-standup` to start!"
+    )
+
+@app.message("daily-standup")
+async def trigger_daily_standup(message):
+    """Fan the standup out to every configured team channel and user"""
+    # Each trigger is its own run; redeliveries of the same message share it
+    return await run_daily_standup(run_id=new_run_id(message['ts']))
+
+@app.message("retry-standup")
+async def trigger_standup_retry():
+    """Re-send only the failures of today's latest standup run"""
+    return await run_daily_standup(retry=True)
+
+async def run_daily_standup(run_id=None, retry=False):
+    try:
+        # The dispatcher paces its own threads against Slack's rate tiers
+        summary = await asyncio.to_thread(dispatch_standup, run_id=run_id, retry=retry)
+        if summary['skipped_targets']:
+            logger.info(f"Standup {summary['run_id']} already sent to {', '.join(summary['skipped_targets'])}")
+        return summary
+    except Exception as e:
+        logger.error(f"Standup failed: {str(e)}")
+        return None
+
+async def join_channel(channel_id):
+    channel_cache = get_channel_cache()
+    if channel_cache.is_member(channel_id):
+        return
+    try:
+        response = await app.client.conversations_join(channel=channel_id)
+        if not response["ok"]:
+            logger.warning(f"Already in channel {channel_id}")
+        await asyncio.to_thread(channel_cache.update, channel_id, is_member=True)
+    except SlackApiError as e:
+        if e.response['error'] == 'already_in_channel':
+            await asyncio.to_thread(channel_cache.update, channel_id, is_member=True)
+            return
+        raise
+
+@app.event("member_joined_channel")
+@app.event("member_left_channel")
+@app.event("channel_left")
+@app.event("channel_rename")
+@app.event("channel_created")
+@app.event("channel_deleted")
+@app.event("channel_archive")
+async def handle_channel_change(event, context):
+    await asyncio.to_thread(get_channel_cache().handle_event, event, context.get('bot_user_id'))
+
+@app.event("message")
+async def handle_message(event, say):
+    if event.get('subtype') == 'bot_message':
+        return
+
+    text = event.get('text', '').lower()
+    channel = event.get('channel')
+    user_id = event.get('user')
+
+    # Join channel if not already member (answered from the channel cache)
+    await join_channel(channel)
+
+    if detect_blocker(text):
+        try:
+            await asyncio.to_thread(
+                blocker_queue.enqueue,
+                text,
+                channel=channel,
+                user_id=user_id,
+                thread_ts=event['ts'],
+                key=event.get('client_msg_id') or f"{channel}:{event['ts']}"
+            )
+        except Exception as e:
+            logger.error(f"Block handler failed: {str(e)}")
+            await say(
+                channel=channel,
+                text="Failed to create Trello card. Please notify admin."
+            )
+
+async def notify_blocker(job, card):
+    """Report the worker's outcome back to the thread the blocker came from"""
+    if card is None:
+        await app.client.chat_postMessage(
+            channel=job['channel'],
+            text="Failed to create Trello card. Please notify admin."
+        )
+        return
+    await app.client.chat_postMessage(
+        channel=job['channel'],
+        thread_ts=job['thread_ts'],
+        text=("🚨 Blocker already tracked! Added to existing Trello card."
+              if card.get('duplicate') else "🚨 Blocker detected! Created Trello card.")
+    )
+
+async def main():
+    logger.info("Starting AI Scrum Master Bot (asyncio runtime)")
+    worker = AsyncBlockerWorker(blocker_queue, trello_client, notify=notify_blocker)
+    worker_task = asyncio.create_task(worker.run())
+    handler = AsyncSocketModeHandler(app, SLACK_APP_TOKEN)
+    try:
+        await handler.start_async()
+    finally:
+        worker.stop()
+        await worker_task
+        await trello_client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
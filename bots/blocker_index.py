@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import zlib
+import threading
+from collections import defaultdict
+import numpy as np
+from core.config import BLOCKER_DUPLICATE_THRESHOLD
+from core.database import ThreadLocalDatabase
+from core.logger import configure_logger
+
+logger = configure_logger(__name__)
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: candidates above ~0.5 Jaccard collide in some band
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 4
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(7)
+_A = _rng.randint(1, _PRIME, NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, NUM_PERM).astype(np.uint64)
+_NON_WORD = re.compile(r'[^a-z0-9 ]+')
+_SPACES = re.compile(r'\s+')
+
+def minhash(text):
+    """MinHash signature over character shingles of the normalised text"""
+    text = _SPACES.sub(' ', _NON_WORD.sub(' ', text.lower())).strip()
+    if len(text) < SHINGLE_SIZE:
+        text = text.ljust(SHINGLE_SIZE)
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles),
+                         dtype=np.uint64, count=len(shingles))
+    # a < 2^31 and crc32 < 2^32, so a*x + b stays inside uint64
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+class BlockerIndex(ThreadLocalDatabase):
+    """LSH index of open blocker cards, persisted in SQLite and held in memory"""
+    def __init__(self, db_name='sprints.db', threshold=None):
+        super().__init__(db_name)
+        self.threshold = BLOCKER_DUPLICATE_THRESHOLD if threshold is None else threshold
+        self._lock = threading.Lock()
+        self._signatures = {}
+        self._buckets = defaultdict(set)
+        self._load()
+
+    def _load(self):
+        for card_id, blob in self.conn.execute('SELECT card_id, signature FROM blocker_index'):
+            self._insert(card_id, np.frombuffer(blob, dtype=np.uint32))
+        logger.info(f"Loaded {len(self._signatures)} open blockers into duplicate index")
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+    def _insert(self, card_id, signature):
+        self._signatures[card_id] = signature
+        for key in self._band_keys(signature):
+            self._buckets[key].add(card_id)
+
+    def find_duplicate(self, text):
+        """Return (card_id, similarity) of the closest open blocker above the threshold"""
+        signature = minhash(text)
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates |= self._buckets.get(key, set())
+            best = None
+            for card_id in candidates:
+                similarity = float(np.mean(self._signatures[card_id] == signature))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (card_id, similarity)
+        return best
+
+    def add(self, card_id, text):
+        signature = minhash(text)
+        with self._lock:
+            self._remove(card_id)
+            self._insert(card_id, signature)
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO blocker_index (card_id, text, signature) VALUES (?, ?, ?)',
+                (card_id, text, signature.tobytes())
+            )
+
+    def remove(self, card_ids):
+        """Forget cards that were closed or archived"""
+        card_ids = list(card_ids)
+        with self._lock:
+            for card_id in card_ids:
+                self._remove(card_id)
+        with self.conn:
+            self.conn.executemany('DELETE FROM blocker_index WHERE card_id = ?',
+                                  [(card_id,) for card_id in card_ids])
+
+    def _remove(self, card_id):
+        signature = self._signatures.pop(card_id, None)
+        if signature is None:
+            return
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket:
+                bucket.discard(card_id)
+                if not bucket:
+                    del self._buckets[key]
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_blocker_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = BlockerIndex()
+        return _index
@@ -0,0 +1,217 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import asyncio
+import threading
+from core.config import BLOCKER_QUEUE_BATCH_SIZE, BLOCKER_QUEUE_MAX_ATTEMPTS, BLOCKER_QUEUE_LEASE_SECONDS
+from core.database import ThreadLocalDatabase
+from core.board_snapshot import get_board_snapshot
+from core.logger import configure_logger
+from bots.trello_integration import create_trello_card, create_trello_card_async
+
+logger = configure_logger(__name__)
+
+JOB_COLUMNS = ['id', 'idempotency_key', 'text', 'channel', 'user_id', 'thread_ts', 'attempts']
+
+def find_existing_card(job):
+    """Find a card already created for this job, e.g. when the create response was lost"""
+    snapshot = get_board_snapshot()
+    snapshot.invalidate()
+    marker = f"Blocker-Key: {job['idempotency_key']}"
+    for card in snapshot.cards():
+        if marker in (card.get('desc') or ''):
+            return card
+    return None
+
+class BlockerQueue(ThreadLocalDatabase):
+    """SQLite-backed queue of blockers waiting to become Trello cards
+
+    Each bot process owns the jobs it queued (`source`), so bots sharing
+    sprints.db never claim or recover each other's work. Claims are leases:
+    a job left in processing longer than `lease_seconds` (its worker died)
+    becomes claimable again.
+    """
+    def __init__(self, db_name='sprints.db', max_attempts=None, source='slack_bot', lease_seconds=None):
+        super().__init__(db_name)
+        self.max_attempts = max_attempts or BLOCKER_QUEUE_MAX_ATTEMPTS
+        self.source = source
+        self.lease_seconds = lease_seconds if lease_seconds is not None else BLOCKER_QUEUE_LEASE_SECONDS
+
+    def enqueue(self, text, channel=None, user_id=None, thread_ts=None, key=None):
+        """Queue a blocker; returns False when the idempotency key was already seen"""
+        key = key or f"{channel}:{thread_ts}"
+        with self.conn:
+            cursor = self.conn.execute('''
+                INSERT OR IGNORE INTO blocker_queue
+                (idempotency_key, text, channel, user_id, thread_ts, source)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (key, text, channel, user_id, thread_ts, self.source))
+        if not cursor.rowcount:
+            logger.info(f"Ignoring duplicate blocker {key}")
+        return bool(cursor.rowcount)
+
+    def claim(self, limit):
+        """Atomically lease up to `limit` due jobs of this source and return them
+
+        Due jobs are pending ones past their backoff and processing ones whose
+        lease has expired.
+        """
+        now = time.time()
+        conn = self.conn
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute(f'''
+                SELECT {", ".join(JOB_COLUMNS)} FROM blocker_queue
+                WHERE source = ? AND (
+                    (status = 'pending' AND next_attempt_at <= ?)
+                    OR (status = 'processing' AND COALESCE(claimed_at, 0) <= ?)
+                )
+                ORDER BY id LIMIT ?
+            ''', (self.source, now, now - self.lease_seconds, limit)).fetchall()
+            conn.executemany('''
+                UPDATE blocker_queue SET status = 'processing', claimed_at = ?, attempts = attempts + 1
+                WHERE id = ?
+            ''', [(now, row[0]) for row in rows])
+        return [dict(zip(JOB_COLUMNS, row)) for row in rows]
+
+    def complete(self, job_id, card_id):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE blocker_queue SET status = 'done', card_id = ?, last_error = NULL WHERE id = ?",
+                (card_id, job_id)
+            )
+
+    def fail(self, job, error):
+        """Schedule a retry with exponential backoff; returns True once attempts run out"""
+        exhausted = job['attempts'] + 1 >= self.max_attempts
+        with self.conn:
+            self.conn.execute(
+                "UPDATE blocker_queue SET status = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                ('failed' if exhausted else 'pending',
+                 time.time() + 2 ** job['attempts'], str(error), job['id'])
+            )
+        return exhausted
+
+    def recover(self):
+        """Return this source's jobs whose lease expired (the worker died) to the queue
+
+        Jobs still within their lease may belong to a live worker, e.g. one
+        restarted alongside this one, and are left alone.
+        """
+        with self.conn:
+            cursor = self.conn.execute('''
+                UPDATE blocker_queue SET status = 'pending', claimed_at = NULL
+                WHERE source = ? AND status = 'processing' AND COALESCE(claimed_at, 0) <= ?
+            ''', (self.source, time.time() - self.lease_seconds))
+        if cursor.rowcount:
+            logger.info(f"Re-queued {cursor.rowcount} blocker jobs with expired leases")
+        return cursor.rowcount
+
+    def depth(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM blocker_queue WHERE source = ? AND status IN ('pending', 'processing')",
+            (self.source,)
+        ).fetchone()[0]
+
+class BlockerWorker(threading.Thread):
+    """Background thread draining the blocker queue into Trello in batches"""
+    def __init__(self, queue, notify=None, create_card=create_trello_card,
+                 batch_size=None, poll_interval=1.0):
+        super().__init__(daemon=True, name="blocker-worker")
+        self.queue = queue
+        self.notify = notify
+        self.create_card = create_card
+        self.batch_size = batch_size or BLOCKER_QUEUE_BATCH_SIZE
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        self.queue.recover()
+        logger.info("Blocker worker started")
+        while not self._stop_event.is_set():
+            try:
+                jobs = self.queue.claim(self.batch_size)
+            except Exception as e:
+                logger.error(f"Blocker queue claim failed: {str(e)}")
+                jobs = []
+            for job in jobs:
+                self.process(job)
+            if not jobs:
+                self._stop_event.wait(self.poll_interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def process(self, job):
+        try:
+            # A retry may follow a create whose response was lost; reuse that card
+            card = find_existing_card(job) if job['attempts'] else None
+            if card is None:
+                card = self.create_card(job['text'], idempotency_key=job['idempotency_key'])
+            self.queue.complete(job['id'], card.get('id'))
+            self._notify(job, card)
+        except Exception as e:
+            logger.error(f"Blocker job {job['id']} failed: {str(e)}")
+            if self.queue.fail(job, e):
+                self._notify(job, None)
+
+    def _notify(self, job, card):
+        if not self.notify:
+            return
+        try:
+            self.notify(job, card)
+        except Exception as e:
+            logger.error(f"Blocker notification failed: {str(e)}")
+
+class AsyncBlockerWorker:
+    """asyncio drain loop for the blocker queue, creating cards concurrently"""
+    def __init__(self, queue, client, notify=None, batch_size=None, poll_interval=1.0):
+        self.queue = queue
+        self.client = client
+        self.notify = notify
+        self.batch_size = batch_size or BLOCKER_QUEUE_BATCH_SIZE
+        self.poll_interval = poll_interval
+        self._stopped = False
+
+    async def run(self):
+        await asyncio.to_thread(self.queue.recover)
+        logger.info("Async blocker worker started")
+        while not self._stopped:
+            try:
+                jobs = await asyncio.to_thread(self.queue.claim, self.batch_size)
+            except Exception as e:
+                logger.error(f"Blocker queue claim failed: {str(e)}")
+                jobs = []
+            if jobs:
+                await asyncio.gather(*(self.process(job) for job in jobs))
+            else:
+                await asyncio.sleep(self.poll_interval)
+
+    def stop(self):
+        self._stopped = True
+
+    async def process(self, job):
+        try:
+            card = None
+            if job['attempts']:
+                card = await asyncio.to_thread(find_existing_card, job)
+            if card is None:
+                card = await create_trello_card_async(
+                    job['text'], self.client, idempotency_key=job['idempotency_key']
+                )
+            await asyncio.to_thread(self.queue.complete, job['id'], card.get('id'))
+            await self._notify(job, card)
+        except Exception as e:
+            logger.error(f"Blocker job {job['id']} failed: {str(e)}")
+            if await asyncio.to_thread(self.queue.fail, job, e):
+                await self._notify(job, None)
+
+    async def _notify(self, job, card):
+        if not self.notify:
+            return
+        try:
+            await self.notify(job, card)
+        except Exception as e:
+            logger.error(f"Blocker notification failed: {str(e)}")
@@ -0,0 +1,131 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import threading
+from core.config import CHANNEL_CACHE_REFRESH_INTERVAL
+from core.database import ThreadLocalDatabase
+from core.logger import configure_logger
+
+logger = configure_logger(__name__)
+
+class ChannelCache(ThreadLocalDatabase):
+    """Process-wide Slack channel name->ID and bot membership cache backed by SQLite"""
+    def __init__(self, db_name='sprints.db', refresh_interval=None):
+        super().__init__(db_name)
+        self.refresh_interval = (CHANNEL_CACHE_REFRESH_INTERVAL
+                                 if refresh_interval is None else refresh_interval)
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._members = set()
+        self._names = {}
+        self._last_refresh = 0.0
+        self._load()
+
+    def _load(self):
+        for channel_id, name, is_member in self.conn.execute(
+            'SELECT id, name, is_member FROM slack_channels'
+        ):
+            self._remember(channel_id, name, bool(is_member))
+
+    def _remember(self, channel_id, name, is_member=None):
+        old_name = self._names.get(channel_id)
+        if old_name and self._ids.get(old_name.lower()) == channel_id:
+            del self._ids[old_name.lower()]
+        if name:
+            self._names[channel_id] = name
+            self._ids[name.lower()] = channel_id
+        if is_member is True:
+            self._members.add(channel_id)
+        elif is_member is False:
+            self._members.discard(channel_id)
+
+    def _persist(self, rows):
+        with self.conn:
+            self.conn.executemany('''
+                INSERT INTO slack_channels (id, name, is_member, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = COALESCE(excluded.name, slack_channels.name),
+                    is_member = excluded.is_member,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', rows)
+
+    def update(self, channel_id, name=None, is_member=None):
+        """Record a channel's name and/or the bot's membership"""
+        with self._lock:
+            self._remember(channel_id, name, is_member)
+            row = (channel_id, name or self._names.get(channel_id), channel_id in self._members)
+        self._persist([row])
+
+    def forget(self, channel_id):
+        with self._lock:
+            name = self._names.pop(channel_id, None)
+            if name and self._ids.get(name.lower()) == channel_id:
+                del self._ids[name.lower()]
+            self._members.discard(channel_id)
+        with self.conn:
+            self.conn.execute('DELETE FROM slack_channels WHERE id = ?', (channel_id,))
+
+    def is_member(self, channel_id):
+        return channel_id in self._members
+
+    def resolve(self, name, client, force_refresh=False):
+        """Channel ID for a name, listing channels only on a miss (at most once per interval)"""
+        channel_id = self._ids.get(name.lower())
+        if channel_id and not force_refresh:
+            return channel_id
+        if force_refresh or time.time() - self._last_refresh >= self.refresh_interval:
+            self.refresh(client)
+        return self._ids.get(name.lower())
+
+    def refresh(self, client):
+        """Page through every public channel and store names and membership"""
+        rows = []
+        cursor = None
+        while True:
+            response = client.conversations_list(
+                types="public_channel",
+                exclude_archived=True,
+                limit=1000,
+                cursor=cursor
+            )
+            rows.extend(
+                (channel['id'], channel['name'], bool(channel.get('is_member')))
+                for channel in response.get('channels', [])
+            )
+            cursor = response.get('response_metadata', {}).get('next_cursor')
+            if not cursor:
+                break
+
+        with self._lock:
+            for channel_id, name, is_member in rows:
+                self._remember(channel_id, name, is_member)
+            self._last_refresh = time.time()
+        self._persist(rows)
+        logger.info(f"Channel cache refreshed with {len(rows)} channels")
+
+    def handle_event(self, event, bot_user_id=None):
+        """Apply membership/rename events so the cache never needs polling"""
+        event_type = event.get('type')
+        if event_type == 'member_joined_channel' and event.get('user') == bot_user_id:
+            self.update(event['channel'], is_member=True)
+        elif event_type == 'member_left_channel' and event.get('user') == bot_user_id:
+            self.update(event['channel'], is_member=False)
+        elif event_type == 'channel_left':
+            self.update(event['channel'], is_member=False)
+        elif event_type in ('channel_rename', 'channel_created'):
+            self.update(event['channel']['id'], name=event['channel']['name'])
+        elif event_type in ('channel_deleted', 'channel_archive'):
+            self.forget(event['channel'])
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_channel_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ChannelCache()
+        return _cache
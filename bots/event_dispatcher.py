@@ -0,0 +1,174 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import queue
+import threading
+from collections import OrderedDict, defaultdict, deque
+from slack_bolt.response import BoltResponse
+from core.config import (
+    EVENT_WORKERS,
+    EVENT_QUEUE_SIZE,
+    EVENT_DEDUP_TTL,
+    EVENT_METRICS_INTERVAL
+)
+from core.logger import configure_logger
+
+logger = configure_logger(__name__)
+
+class SeenEvents:
+    """Thread-safe set of recently seen event IDs that forgets them after `ttl` seconds"""
+    def __init__(self, ttl=None):
+        self.ttl = EVENT_DEDUP_TTL if ttl is None else ttl
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, event_id):
+        """Record an event; returns False when it was already seen within the TTL"""
+        now = time.monotonic()
+        with self._lock:
+            # Entries are in arrival order, so expired ones are always at the front
+            while self._seen and next(iter(self._seen.values())) <= now:
+                self._seen.popitem(last=False)
+            if event_id in self._seen:
+                return False
+            self._seen[event_id] = now + self.ttl
+            return True
+
+    def discard(self, event_id):
+        """Forget an event, so its next delivery is handled rather than skipped"""
+        with self._lock:
+            self._seen.pop(event_id, None)
+
+    def __len__(self):
+        return len(self._seen)
+
+class EventWorkerPool:
+    """Bounded queue and worker threads so Slack listeners return (and ack) immediately
+
+    `seen` is the SeenEvents the dedupe middleware records into; events whose
+    work is dropped are removed from it so Slack's redelivery runs again.
+    """
+    def __init__(self, workers=None, max_queue=None, metrics_interval=None, seen=None):
+        self.workers = workers or EVENT_WORKERS
+        self.seen = seen if seen is not None else SeenEvents()
+        self.metrics_interval = EVENT_METRICS_INTERVAL if metrics_interval is None else metrics_interval
+        self._queue = queue.Queue(max_queue or EVENT_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._latencies = defaultdict(lambda: deque(maxlen=500))
+        self._counts = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._dropped = 0
+        self._duplicates = 0
+        self._started = False
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for i in range(self.workers):
+            threading.Thread(target=self._run, daemon=True, name=f"event-worker-{i}").start()
+        if self.metrics_interval:
+            threading.Thread(target=self._report, daemon=True, name="event-metrics").start()
+
+    def submit(self, name, fn, *args, **kwargs):
+        """Queue a handler call; returns False (and drops it) when the queue is full"""
+        self.start()
+        try:
+            self._queue.put_nowait((name, fn, args, kwargs, time.monotonic()))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            logger.error(f"Event queue full, dropping {name} event")
+            return False
+
+    def submit_event(self, body, name, fn, *args, **kwargs):
+        """submit() on behalf of a Slack event; a dropped event is forgotten by `seen`"""
+        if self.submit(name, fn, *args, **kwargs):
+            return True
+        if body.get('event_id'):
+            self.seen.discard(body['event_id'])
+        return False
+
+    def full(self):
+        return self._queue.full()
+
+    def record_duplicate(self):
+        with self._lock:
+            self._duplicates += 1
+
+    def _run(self):
+        while True:
+            name, fn, args, kwargs, queued_at = self._queue.get()
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"{name} handler failed: {str(e)}")
+                with self._lock:
+                    self._errors[name] += 1
+            finally:
+                with self._lock:
+                    self._counts[name] += 1
+                    self._latencies[name].append(time.monotonic() - queued_at)
+                self._queue.task_done()
+
+    def metrics(self):
+        """Queue depth, drop/duplicate counts and per-handler latency (queue wait included)"""
+        with self._lock:
+            handlers = {}
+            for name, latencies in self._latencies.items():
+                ordered = sorted(latencies)
+                handlers[name] = {
+                    'handled': self._counts[name],
+                    'errors': self._errors[name],
+                    'p50_ms': round(ordered[len(ordered) // 2] * 1e3, 1),
+                    'p95_ms': round(ordered[int(len(ordered) * 0.95)] * 1e3, 1),
+                    'max_ms': round(ordered[-1] * 1e3, 1)
+                }
+            return {
+                'queue_depth': self._queue.qsize(),
+                'dropped': self._dropped,
+                'duplicates': self._duplicates,
+                'handlers': handlers
+            }
+
+    def _report(self):
+        while True:
+            time.sleep(self.metrics_interval)
+            metrics = self.metrics()
+            if metrics['handlers'] or metrics['queue_depth']:
+                logger.info(f"Event metrics: {metrics}")
+
+def make_dedupe_middleware(seen, pool=None):
+    """Bolt middleware that acks redelivered events without running listeners again
+
+    Events are acked before their listener runs, so while the pool's queue is
+    full they are refused (and not recorded) instead, for Slack to redeliver.
+    """
+    def dedupe_events(body, request, next):
+        event_id = body.get('event_id')
+        if event_id and pool and pool.full():
+            logger.warning(f"Event queue full, leaving {event_id} for Slack to redeliver")
+            return BoltResponse(status=503, body="")
+        if event_id and not seen.add(event_id):
+            retry_num = (request.headers.get('x-slack-retry-num') or [None])[0]
+            logger.info(f"Skipping duplicate event {event_id} (retry {retry_num})")
+            if pool:
+                pool.record_duplicate()
+            return BoltResponse(status=200, body="")
+        return next()
+    return dedupe_events
+
+def make_async_dedupe_middleware(seen):
+    """asyncio counterpart of make_dedupe_middleware for AsyncApp"""
+    async def dedupe_events(body, request, next):
+        event_id = body.get('event_id')
+        if event_id and not seen.add(event_id):
+            retry_num = (request.headers.get('x-slack-retry-num') or [None])[0]
+            logger.info(f"Skipping duplicate event {event_id} (retry {retry_num})")
+            return BoltResponse(status=200, body="")
+        return await next()
+    return dedupe_events
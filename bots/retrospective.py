@@ -3,48 +3,87 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from datetime import datetime, timedelta
-from transformers import pipeline
-import torch
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
-from core.config import SLACK_BOT_TOKEN, SLACK_RETRO_CHANNEL
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from core.config import SLACK_BOT_TOKEN, SLACK_RETRO_CHANNEL, SENTIMENT_MODEL, SENTIMENT_BACKEND
 from core.logger import configure_logger
+from core.database import ThreadLocalDatabase
+from core.pipeline import Pipeline
+from bots.channel_cache import get_channel_cache
+from bots.sentiment_cache import SentimentCache
+from models.sentiment_backends import load_sentiment_analyzer, classify_batched
+from models.sentiment_worker import connect_sentiment_worker
 
 logger = configure_logger(__name__)
 
-class RetrospectiveAnalyzer:
+PAGE_SIZE = 200  # conversations.history page limit, also used for stored-message chunks
+
+# Compiled once instead of on every message
+_SLACK_MARKUP = re.compile(r'<[^>]+>')
+_TIMESTAMP = re.compile(r'\b\d{1,2}:\d{2}\s?(?:AM|PM)?\b')
+_URL = re.compile(r'http\S+')
+_SPECIAL_CHARS = re.compile(r'[^a-zA-Z0-9\s.,!?]')
+
+def clean_message(text):
+    """Remove timestamps, metadata, and formatting from messages"""
+    # Remove Slack mentions and formatting
+    text = _SLACK_MARKUP.sub('', text)
+    # Remove any timestamps like "11:35 PM"
+    text = _TIMESTAMP.sub('', text)
+    # Remove URLs
+    text = _URL.sub('', text)
+    # Remove special characters except basic punctuation
+    return _SPECIAL_CHARS.sub('', text).strip()
+
+def sentiment_label(message_results):
+    """Top label when confident, otherwise neutral; None when inference failed"""
+    if not message_results:
+        return None
+    top_score = max(message_results, key=lambda x: x['score'])
+    # Adjusted confidence threshold
+    if top_score['score'] > 0.6 and top_score['label'] in ('positive', 'negative'):
+        return top_score['label']
+    return 'neutral'
+
+class RetrospectiveAnalyzer(ThreadLocalDatabase):
     def __init__(self):
-        self.slack_client = WebClient(token=SLACK_BOT_TOKEN)
+        # The dashboard shares one analyzer across Streamlit script threads
+        super().__init__()
+        self._slack_client = None
+        self.channel_cache = get_channel_cache()
+        # Quantized backends score slightly differently, so they get their own cache entries
+        # and stored labels from another model or backend are relabelled
+        self.model_key = f"{SENTIMENT_MODEL}:{SENTIMENT_BACKEND}"
+        self.sentiment_cache = SentimentCache(self.model_key)
         self.sentiment_analyzer = self._init_sentiment_analyzer()
-        logger.info(f"Device set to use {'cuda' if torch.cuda.is_available() else 'cpu'}")
+
+    @property
+    def slack_client(self):
+        # slack_sdk is only imported once Slack is actually called
+        if self._slack_client is None:
+            from slack_sdk import WebClient
+            self._slack_client = WebClient(token=SLACK_BOT_TOKEN)
+        return self._slack_client
 
     def _init_sentiment_analyzer(self):
         try:
-            device = 0 if torch.cuda.is_available() else -1
-            return pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                device=device,
-                top_k=None,
-                max_length=128,
-                truncation=True,
-                batch_size=8
-            )
+            # Prefer the shared warm model over loading another copy in this process;
+            # the client loads one itself if the worker goes away later
+            client = connect_sentiment_worker(fallback=lambda: load_sentiment_analyzer(SENTIMENT_BACKEND))
+            if client:
+                logger.info(f"Using sentiment worker at {client.socket_path}")
+                return client
+            return load_sentiment_analyzer(SENTIMENT_BACKEND)
         except Exception as e:
             logger.error(f"Sentiment analyzer init failed: {str(e)}")
             return None
 
     def _get_or_create_retro_channel(self):
+        from slack_sdk.errors import SlackApiError
         try:
-            response = self.slack_client.conversations_list(
-                types="public_channel",
-                exclude_archived=True
-            )
-            
-            for channel in response.get('channels', []):
-                if channel['name'].lower() == SLACK_RETRO_CHANNEL.lower():
-                    return channel['id']
+            channel_id = self.channel_cache.resolve(SLACK_RETRO_CHANNEL, self.slack_client)
+            if channel_id:
+                return channel_id
 
             logger.info(f"Creating new retrospective channel: {SLACK_RETRO_CHANNEL}")
             try:
@@ -52,7 +91,9 @@ class RetrospectiveAnalyzer:
                     name=SLACK_RETRO_CHANNEL,
                     is_private=False
                 )
-                return new_channel['channel']['id']
+                channel_id = new_channel['channel']['id']
+                self.channel_cache.update(channel_id, name=SLACK_RETRO_CHANNEL, is_member=True)
+                return channel_id
             except SlackApiError as e:
                 if e.response['error'] == 'name_taken':
                     logger.warning(f"Channel {SLACK_RETRO_CHANNEL} exists but wasn't found initially")
@@ -66,100 +107,110 @@ class RetrospectiveAnalyzer:
             return None
 
     def _find_existing_channel(self):
+        from slack_sdk.errors import SlackApiError
         try:
-            response = self.slack_client.conversations_list(
-                types="public_channel",
-                exclude_archived=True,
-                limit=1000
-            )
-            for channel in response.get('channels', []):
-                if channel['name'].lower() == SLACK_RETRO_CHANNEL.lower():
-                    return channel['id']
-            return None
+            return self.channel_cache.resolve(SLACK_RETRO_CHANNEL, self.slack_client,
+                                              force_refresh=True)
         except SlackApiError as e:
             logger.error(f"Channel search failed: {e.response['error']}")
             return None
 
-    def analyze_sentiment(self):
+    def _fetch_history(self, channel_id, oldest, latest=None):
+        """Yield each page of messages in (oldest, latest), newest page first"""
+        cursor = None
+        while True:
+            params = {"channel": channel_id, "oldest": f"{oldest:.6f}", "limit": PAGE_SIZE}
+            if latest is not None:
+                params["latest"] = f"{latest:.6f}"
+            response = self.slack_client.conversations_history(cursor=cursor, **params)
+            yield response.get('messages', [])
+            cursor = response.get('response_metadata', {}).get('next_cursor')
+            if not cursor:
+                return
+
+    def _iter_window_rows(self, channel_id, window_start):
+        """Yield chunks of (ts, text, sentiment) rows in the window: stored ones first, then pages
+        the local store lacks (newer than the high-water ts, or older than anything
+        stored so far) as they arrive from Slack"""
+        latest_ts, covered_from = self.db.get_retro_cursor(channel_id)
+        if covered_from is None:
+            ranges = [(window_start, None)]
+            covered_from = window_start
+        else:
+            if latest_ts:
+                yield from self.db.iter_retro_messages(channel_id, window_start, float(latest_ts),
+                                                       self.model_key, PAGE_SIZE)
+            ranges = [(float(latest_ts) if latest_ts else covered_from, None)]
+            if window_start < covered_from:
+                ranges.append((window_start, covered_from))
+                covered_from = window_start
+
+        stored = 0
+        for oldest, latest in ranges:
+            for page in self._fetch_history(channel_id, oldest, latest):
+                for msg in page:
+                    if latest_ts is None or float(msg['ts']) > float(latest_ts):
+                        latest_ts = msg['ts']
+                messages = [msg for msg in page if msg.get('text') and not msg.get('bot_id')]
+                # Store page by page; the cursor only moves once every range is complete
+                self.db.save_retro_messages(channel_id, messages)
+                stored += len(messages)
+                if messages:
+                    yield [(msg['ts'], msg['text'], None) for msg in messages]
+
+        self.db.set_retro_cursor(channel_id, latest_ts, covered_from)
+        logger.info(f"Stored {stored} new retro messages")
+
+    def analyze_sentiment(self, days=7):
         if not self.sentiment_analyzer:
             return {"error": "Sentiment analyzer not initialized"}
-            
+
+        from slack_sdk.errors import SlackApiError
         try:
             channel_id = self._get_or_create_retro_channel()
             if not channel_id:
                 return {"error": "Failed to access retrospective channel"}
             
-            one_week_ago = datetime.now() - timedelta(days=7)
-            messages = []
-            cursor = None
-            
-            # Paginate through all messages
-            for _ in range(10):  # Max 1000 messages
-                response = self.slack_client.conversations_history(
-                    channel=channel_id,
-                    oldest=one_week_ago.timestamp(),
-                    limit=200,
-                    cursor=cursor
-                )
-                messages.extend(response.get('messages', []))
-                cursor = response.get('response_metadata', {}).get('next_cursor')
-                if not cursor:
-                    break
-
-            if not messages:
-                return {"error": "No messages in retrospective channel"}
-            
-            valid_messages = [
-                self._clean_message(msg.get('text', '')) 
-                for msg in messages 
-                if msg.get('text') and not msg.get('bot_id')
-            ]
-
-            logger.debug(f"Messages to analyze: {len(valid_messages)}")
-            
-            if not valid_messages:
-                return {"error": "No analyzable text found"}
-
-            # Batch processing with error handling
-            batch_size = 8
-            results = []
-            for i in range(0, len(valid_messages), batch_size):
-                try:
-                    batch = valid_messages[i:i+batch_size]
-                    results.extend(self.sentiment_analyzer(batch))
-                except Exception as e:
-                    logger.error(f"Batch {i//batch_size} failed: {str(e)}")
-                    results.extend([[]] * len(batch))  # Add empty results for failed batch
+            window_start = (datetime.now() - timedelta(days=days)).timestamp()
+            # Slack fetches, cleaning and inference overlap; only in-flight chunks are held
+            pipeline = Pipeline(
+                ("fetch", self._iter_window_rows(channel_id, window_start)),
+                [
+                    ("clean", lambda rows: [(ts, clean_message(text), label) for ts, text, label in rows]),
+                    ("infer", self._label_rows)
+                ]
+            )
 
             sentiment_counts = {
                 "positive": 0,
                 "negative": 0,
                 "neutral": 0
             }
+            samples = 0
+            labelled_from, labelled_until = None, None
 
-            for i, message_results in enumerate(results):
-                if not message_results:  # Skip failed analyses
-                    continue
-                    
-                top_score = max(message_results, key=lambda x: x['score'])
-                
-                # DEBUG: Log raw classification
-                logger.debug(f"Message: '{valid_messages[i]}'")
-                logger.debug(f"Top classification: {top_score['label']} ({top_score['score']:.2f})")
-                
-                if top_score['score'] > 0.6:  # Adjusted confidence threshold
-                    if top_score['label'] == 'positive':
-                        sentiment_counts["positive"] += 1
-                    elif top_score['label'] == 'negative':
-                        sentiment_counts["negative"] += 1
-                    else:
-                        sentiment_counts["neutral"] += 1
-                else:
-                    sentiment_counts["neutral"] += 1
+            for labels, new_labels in pipeline:
+                samples += len(labels)
+                for _, label in labels:
+                    if label:  # Skip failed analyses
+                        sentiment_counts[label] += 1
+                if new_labels:
+                    # Stored labels keep later runs and the daily rollups off the model
+                    self.db.set_retro_sentiments(channel_id, new_labels, self.model_key)
+                    epochs = [float(ts) for ts, _ in new_labels]
+                    labelled_from = min(epochs) if labelled_from is None else min(labelled_from, *epochs)
+                    labelled_until = max(epochs) if labelled_until is None else max(labelled_until, *epochs)
+
+            logger.info(f"Retro pipeline throughput: {pipeline.summary()}")
+            if labelled_from is not None:
+                self.db.refresh_retro_rollups(channel_id, labelled_from, labelled_until, self.model_key)
+            if not samples:
+                return {"error": "No messages in retrospective channel"}
 
             return {
                 **sentiment_counts,
-                "samples": len(valid_messages)
+                "samples": samples,
+                "throughput": {stats.name: round(stats.rate, 1) for stats in pipeline.stats}
             }
             
         except SlackApiError as e:
@@ -169,17 +220,47 @@ class RetrospectiveAnalyzer:
             logger.error(f"Analysis failed: {str(e)}")
             return {"error": "Technical failure in analysis"}
 
-    def _clean_message(self, text):
-        """Remove timestamps, metadata, and formatting from messages"""
-        # Remove Slack mentions and formatting
-        text = re.sub(r'<[^>]+>', '', text)  # Remove all Slack markup
-        # Remove any timestamps like "11:35 PM"
-        text = re.sub(r'\b\d{1,2}:\d{2}\s?(?:AM|PM)?\b', '', text)
-        # Remove URLs
-        text = re.sub(r'http\S+', '', text)
-        # Remove special characters except basic punctuation
-        return re.sub(r'[^a-zA-Z0-9\s.,!?]', '', text).strip()
-    
+    def _label_rows(self, rows):
+        """Label (ts, text, sentiment) rows, sending only unlabelled ones to the model
+
+        Returns every row's (ts, label) and the subset that was newly labelled.
+        """
+        pending = [i for i, (_, _, label) in enumerate(rows) if label is None]
+        # Chunks of stored messages are often fully labelled already
+        results = self._classify([rows[i][1] for i in pending]) if pending else []
+        labels = [(ts, label) for ts, _, label in rows]
+        new_labels = []
+        for i, message_results in zip(pending, results):
+            label = sentiment_label(message_results)
+            # DEBUG: Log raw classification
+            logger.debug(f"Message: '{rows[i][1]}' -> {label}")
+            labels[i] = (rows[i][0], label)
+            if label:
+                new_labels.append(labels[i])
+        return labels, new_labels
+
+    def sentiment_trend(self, days=90):
+        """Daily sentiment rollups for the retro channel over the last `days` days"""
+        channel_id = self._get_or_create_retro_channel()
+        if not channel_id:
+            return pd.DataFrame()
+        since_day = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d')
+        return self.db.get_sentiment_trend(channel_id, since_day)
+
+    def _classify(self, texts):
+        """Sentiment scores per text, running only cache misses through the model"""
+        cached = self.sentiment_cache.get_many(texts)
+        misses = list(dict.fromkeys(text for text in texts if text not in cached))
+        logger.debug(f"Sentiment cache: {len(texts) - len(misses)} hits, {len(misses)} misses")
+
+        scores = classify_batched(self.sentiment_analyzer, misses)
+        fresh = {text: score for text, score in zip(misses, scores) if score}
+
+        self.sentiment_cache.put_many(fresh)
+        cached.update(fresh)
+        # Messages that failed inference get empty results and are retried on the next run
+        return [cached.get(text, []) for text in texts]
+
 if __name__ == "__main__":
     analyzer = RetrospectiveAnalyzer()
     print(analyzer.analyze_sentiment())
\ No newline at end of file
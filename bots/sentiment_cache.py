@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import hashlib
+from core.config import SENTIMENT_CACHE_MAX_ENTRIES, SENTIMENT_CACHE_MAX_AGE_DAYS
+from core.database import ThreadLocalDatabase
+from core.logger import configure_logger
+
+logger = configure_logger(__name__)
+
+def cache_key(model_id, text):
+    return hashlib.sha256(f"{model_id}\x00{text}".encode('utf-8')).hexdigest()
+
+class SentimentCache(ThreadLocalDatabase):
+    """Content-addressed store of sentiment results with LRU and age eviction"""
+    def __init__(self, model_id, db_name='sprints.db', max_entries=None, max_age_days=None):
+        super().__init__(db_name)
+        self.model_id = model_id
+        self.max_entries = SENTIMENT_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_age = 86400 * (SENTIMENT_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days)
+
+    def get_many(self, texts):
+        """Map each cached text to its result; misses are left out"""
+        keys = {cache_key(self.model_id, text): text for text in set(texts)}
+        found = {}
+        key_list = list(keys)
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(key_list), 500):
+            chunk = key_list[i:i + 500]
+            rows = self.conn.execute(
+                f'SELECT key, result FROM sentiment_cache WHERE key IN ({",".join("?" * len(chunk))})',
+                chunk
+            ).fetchall()
+            for key, result in rows:
+                found[keys[key]] = json.loads(result)
+        if found:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    'UPDATE sentiment_cache SET last_used = ? WHERE key = ?',
+                    [(now, cache_key(self.model_id, text)) for text in found]
+                )
+        return found
+
+    def put_many(self, results):
+        """Store {text: result} pairs, then evict stale and least recently used entries"""
+        if not results:
+            return
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO sentiment_cache (key, result, last_used) VALUES (?, ?, ?)',
+                [(cache_key(self.model_id, text), json.dumps(result), now)
+                 for text, result in results.items()]
+            )
+        self.evict()
+
+    def evict(self):
+        with self.conn:
+            self.conn.execute('DELETE FROM sentiment_cache WHERE last_used < ?',
+                              (time.time() - self.max_age,))
+            self.conn.execute('''
+                DELETE FROM sentiment_cache WHERE key IN (
+                    SELECT key FROM sentiment_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
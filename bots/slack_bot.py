@@ -9,21 +9,28 @@ from core.config import (
     SLACK_BOT_TOKEN,
     SLACK_SIGNING_SECRET,
     SLACK_APP_TOKEN,
-    SLACK_TEAM_CHANNEL
+    SLACK_TOKEN_VERIFICATION
 )
 from core.logger import configure_logger
-from bots.trello_integration import create_trello_card
+from core.blocker_detection import detect_blocker
+from bots.blocker_queue import BlockerQueue, BlockerWorker
+from bots.channel_cache import get_channel_cache
+from bots.standup_dispatcher import dispatch_standup, new_run_id
+from bots.event_dispatcher import EventWorkerPool, make_dedupe_middleware
 
 logger = configure_logger(__name__)
 
 app = App(
     token=SLACK_BOT_TOKEN,
-    signing_secret=SLACK_SIGNING_SECRET
+    signing_secret=SLACK_SIGNING_SECRET,
+    token_verification_enabled=SLACK_TOKEN_VERIFICATION
 )
 
-def detect_blocker(text):
-    blocker_phrases = ["blocked", "stuck", "waiting", "help", "issue"]
-    return any(phrase in text.lower() for phrase in blocker_phrases)
+blocker_queue = BlockerQueue(source='slack_bot')
+# Listeners only queue work, so Slack gets its ack well inside 3 seconds;
+# redeliveries of events already seen are acked and dropped
+event_pool = EventWorkerPool()
+app.use(make_dedupe_middleware(event_pool.seen, event_pool))
 
 def handle_standup_reminder(channel):
     questions = (
@@ -47,61 +54,77 @@ def handle_mentions(event, say):
     )
 
 @app.message("daily-standup")
-def trigger_daily_standup():
-    from slack_sdk import WebClient
-    from core.config import SLACK_BOT_TOKEN, SLACK_TEAM_CHANNEL
-    
-    client = WebClient(token=SLACK_BOT_TOKEN)
-    
+def trigger_daily_standup(message, body):
+    # Each trigger is its own run; redeliveries of the same message share it
+    event_pool.submit_event(body, "daily-standup", run_daily_standup, new_run_id(message['ts']))
+
+@app.message("retry-standup")
+def trigger_standup_retry(body):
+    event_pool.submit_event(body, "retry-standup", run_daily_standup, retry=True)
+
+def run_daily_standup(run_id=None, retry=False):
+    """Fan the standup out to every configured team channel and user
+
+    Returns the dispatch summary, or None when the standup could not be sent.
+    `retry` re-sends only the failures of today's latest run.
+    """
     try:
-        # 1. Join channel first
-        join_response = client.conversations_join(channel=SLACK_TEAM_CHANNEL)
-        if not join_response["ok"]:
-            raise Exception("Failed to join channel")
-            
-        # 2. Post message
-        post = client.chat_postMessage(
-            channel=SLACK_TEAM_CHANNEL,
-            text="🕗 Daily Standup Reminder 🕗"
-        )
-        
-        return True
+        summary = dispatch_standup(app.client, run_id=run_id, retry=retry)
+        if summary['skipped_targets']:
+            logger.info(f"Standup {summary['run_id']} already sent to {', '.join(summary['skipped_targets'])}")
+        return summary
     except Exception as e:
         logger.error(f"Standup failed: {str(e)}")
-        return False
+        return None
 
 def join_channel(channel_id):
+    channel_cache = get_channel_cache()
+    if channel_cache.is_member(channel_id):
+        return
     try:
         response = app.client.conversations_join(channel=channel_id)
         if not response["ok"]:
             logger.warning(f"Already in channel {channel_id}")
+        channel_cache.update(channel_id, is_member=True)
     except SlackApiError as e:
         if e.response['error'] == 'already_in_channel':
+            channel_cache.update(channel_id, is_member=True)
             return
         raise
 
+@app.event("member_joined_channel")
+@app.event("member_left_channel")
+@app.event("channel_left")
+@app.event("channel_rename")
+@app.event("channel_created")
+@app.event("channel_deleted")
+@app.event("channel_archive")
+def handle_channel_change(event, context):
+    get_channel_cache().handle_event(event, context.get('bot_user_id'))
+
 @app.event("message")
-def handle_message(event, say):
+def handle_message(event, say, body):
     if event.get('subtype') == 'bot_message':
         return
-    
+    event_pool.submit_event(body, "message", process_message, event, say)
+
+def process_message(event, say):
     text = event.get('text', '').lower()
     channel = event.get('channel')
     user_id = event.get('user')
     
-    # Join channel if not already member
+    # Join channel if not already member (answered from the channel cache)
     join_channel(channel)
     
-    if 'daily-standup' in text:
-        trigger_daily_standup(event, say)
-    
     if detect_blocker(text):
+        # Card creation happens on the blocker worker so the handler returns immediately
         try:
-            create_trello_card(text)
-            say(
-                thread_ts=event['ts'],
+            blocker_queue.enqueue(
+                text,
                 channel=channel,
-                text="🚨 Blocker detected! Created Trello card."
+                user_id=user_id,
+                thread_ts=event['ts'],
+                key=event.get('client_msg_id') or f"{channel}:{event['ts']}"
             )
         except Exception as e:
             logger.error(f"Block handler failed: {str(e)}")
@@ -109,8 +132,24 @@ def handle_message(event, say):
                 channel=channel,
                 text="Failed to create Trello card. Please notify admin."
             )
+
+def notify_blocker(job, card):
+    """Report the worker's outcome back to the thread the blocker came from"""
+    if card is None:
+        app.client.chat_postMessage(
+            channel=job['channel'],
+            text="Failed to create Trello card. Please notify admin."
+        )
+        return
+    app.client.chat_postMessage(
+        channel=job['channel'],
+        thread_ts=job['thread_ts'],
+        text=("🚨 Blocker already tracked! Added to existing Trello card."
+              if card.get('duplicate') else "🚨 Blocker detected! Created Trello card.")
+    )
     
 if __name__ == "__main__":
     logger.info("Starting AI Scrum Master Bot")
+    BlockerWorker(blocker_queue, notify=notify_blocker).start()
     handler = SocketModeHandler(app, SLACK_APP_TOKEN)
     handler.start()
\ No newline at end of file
@@ -4,20 +4,26 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
-from core.config import SLACK_BOT_TOKEN, SLACK_SIGNING_SECRET, SLACK_APP_TOKEN
+from core.config import SLACK_BOT_TOKEN, SLACK_SIGNING_SECRET, SLACK_APP_TOKEN, SLACK_TOKEN_VERIFICATION
 from core.logger import configure_logger
-from bots.trello_integration import create_trello_card
+from core.blocker_detection import detect_blocker
+from bots.blocker_queue import BlockerQueue, BlockerWorker
+from bots.standup_dispatcher import dispatch_standup, new_run_id
+from bots.event_dispatcher import EventWorkerPool, make_dedupe_middleware
 
 logger = configure_logger(__name__)
 
 app = App(
     token=SLACK_BOT_TOKEN,
-    signing_secret=SLACK_SIGNING_SECRET
+    signing_secret=SLACK_SIGNING_SECRET,
+    token_verification_enabled=SLACK_TOKEN_VERIFICATION
 )
 
-def detect_blocker(text):
-    blocker_phrases = ["blocked", "stuck", "waiting", "help", "issue"]
-    return any(phrase in text.lower() for phrase in blocker_phrases)
+blocker_queue = BlockerQueue(source='standup_bot')
+# Listeners only queue work, so Slack gets its ack well inside 3 seconds;
+# redeliveries of events already seen are acked and dropped
+event_pool = EventWorkerPool()
+app.use(make_dedupe_middleware(event_pool.seen, event_pool))
 
 @app.event("app_mention")
 def handle_mentions(event, client):
@@ -28,7 +34,10 @@ def handle_mentions(event, client):
     )
 
 @app.message("daily-standup")
-def trigger_daily_standup(message, say):
+def trigger_daily_standup(message, say, body):
+    event_pool.submit_event(body, "daily-standup", run_daily_standup, message, say)
+
+def run_daily_standup(message, say):
     try:
         # Send questions as a threaded response
         response = say(
@@ -43,17 +52,12 @@ def trigger_daily_standup(message, say):
             )
         )
         
-        # Also send a DM with the questions
-        app.client.chat_postMessage(
-            channel=message['user'],
-            text=(
-                "Here are your daily standup questions:\n"
-                "1. What did you accomplish yesterday?\n"
-                "2. What will you work on today?\n"
-                "3. Any blockers or impediments?"
-            )
-        )
-        
+        # Then push the questions to every team channel and DM on the roster, requester included.
+        # Each trigger is its own run; redeliveries of the same message share it
+        summary = dispatch_standup(app.client, run_id=new_run_id(message['ts']),
+                                   extra_targets=[message['user']])
+        report_standup(summary, message, say)
+
     except Exception as e:
         logger.error(f"Standup failed: {str(e)}")
         say(
@@ -61,25 +65,60 @@ def trigger_daily_standup(message, say):
             text="Failed to start standup. Please try again."
         )
 
+@app.message("retry-standup")
+def trigger_standup_retry(message, say, body):
+    event_pool.submit_event(body, "retry-standup", run_standup_retry, message, say)
+
+def run_standup_retry(message, say):
+    """Re-send only the failures of today's latest standup run"""
+    try:
+        report_standup(dispatch_standup(app.client, retry=True), message, say)
+    except Exception as e:
+        logger.error(f"Standup retry failed: {str(e)}")
+        say(channel=message['channel'], text="Failed to retry standup. Please try again.")
+
+def report_standup(summary, message, say):
+    if summary['run_id'] is None:
+        text = "No standup was sent today, nothing to retry."
+    else:
+        text = f"Standup sent to {summary['sent']} targets, {summary['failed']} failed."
+        if summary['skipped_targets']:
+            text += f" Already sent, skipped: {', '.join(summary['skipped_targets'])}."
+    say(thread_ts=message['ts'], channel=message['channel'], text=text)
+
 @app.event("message")
-def handle_message(event, client):
+def handle_message(event, client, body):
     if event.get('subtype') == 'bot_message':
         return
-    
+    event_pool.submit_event(body, "message", process_message, event)
+
+def process_message(event):
     text = event.get('text', '')
     user_id = event.get('user')
     
     if detect_blocker(text):
         try:
-            create_trello_card(text)
-            client.chat_postMessage(
-                channel=user_id,
-                text="🚨 Blocker detected! Created Trello card."
+            blocker_queue.enqueue(
+                text,
+                channel=event.get('channel'),
+                user_id=user_id,
+                thread_ts=event.get('ts'),
+                key=event.get('client_msg_id') or f"{event.get('channel')}:{event.get('ts')}"
             )
         except Exception as e:
             logger.error(f"Block handler failed: {str(e)}")
 
+def notify_blocker(job, card):
+    """DM the reporter once the worker has created their card"""
+    if card is not None:
+        app.client.chat_postMessage(
+            channel=job['user_id'],
+            text=("🚨 Blocker already tracked! Added to existing Trello card."
+                  if card.get('duplicate') else "🚨 Blocker detected! Created Trello card.")
+        )
+
 if __name__ == "__main__":
     logger.info("Starting AI Scrum Master Bot")
+    BlockerWorker(blocker_queue, notify=notify_blocker).start()
     handler = SocketModeHandler(app, SLACK_APP_TOKEN)
     handler.start()
\ No newline at end of file
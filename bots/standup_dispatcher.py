@@ -0,0 +1,208 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from slack_sdk.errors import SlackApiError
+from core.config import (
+    SLACK_BOT_TOKEN,
+    STANDUP_CHANNELS,
+    STANDUP_USERS,
+    STANDUP_MAX_WORKERS,
+    SLACK_POST_RATE
+)
+from core.database import ThreadLocalDatabase
+from core.logger import configure_logger
+from core.rate_limit import RateLimiter
+from bots.channel_cache import get_channel_cache
+
+logger = configure_logger(__name__)
+
+STANDUP_MESSAGE = (
+    "🕗 *Daily Standup Reminder* 🕗\n"
+    "1. What did you accomplish yesterday?\n"
+    "2. What will you work on today?\n"
+    "3. Any blockers or impediments?\n"
+    "Please reply in thread!"
+)
+
+# Requests per minute for Slack Web API rate tiers
+TIER_LIMITS = {1: 1, 2: 20, 3: 50, 4: 100}
+METHOD_TIERS = {
+    'conversations.join': 3,
+    'conversations.list': 2,
+}
+SLACK_ID = re.compile(r'^[CGDUW][A-Z0-9]{6,}$')
+
+class SlackRateLimits:
+    """One token bucket per Web API method, sized by the method's rate tier"""
+    def __init__(self, post_rate=None):
+        self.post_rate = post_rate or SLACK_POST_RATE
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, method):
+        with self._lock:
+            if method not in self._limiters:
+                # chat.postMessage has its own "special" tier
+                rate = (self.post_rate if method == 'chat.postMessage'
+                        else TIER_LIMITS[METHOD_TIERS.get(method, 2)])
+                self._limiters[method] = RateLimiter(rate, period=60)
+            return self._limiters[method]
+
+def new_run_id(event_id=None):
+    """Run id for a fresh standup trigger
+
+    `event_id` (e.g. the triggering message's ts) keeps redeliveries of one
+    trigger in the same run; without it every call starts a new run. The
+    date prefix lets a retry find today's runs.
+    """
+    return f"standup-{datetime.now():%Y-%m-%d}-{event_id or f'{time.time():.6f}'}"
+
+def _retry_after(error):
+    headers = getattr(error.response, 'headers', None) or {}
+    return float(headers.get('Retry-After') or headers.get('retry-after') or 1)
+
+class StandupDispatcher(ThreadLocalDatabase):
+    """Sends one message to many channels and DMs concurrently, recording each delivery"""
+    def __init__(self, client, db_name='sprints.db', max_workers=None, max_attempts=3, limits=None):
+        self.client = client
+        super().__init__(db_name)
+        self.max_workers = max_workers or STANDUP_MAX_WORKERS
+        self.max_attempts = max_attempts
+        self.limits = limits or SlackRateLimits()
+        self._dispatch_lock = threading.Lock()
+
+    def call(self, method, **kwargs):
+        """Rate-limited Web API call; a 429 pauses every caller of the method for Retry-After"""
+        limiter = self.limits.limiter(method)
+        for attempt in range(self.max_attempts):
+            limiter.acquire()
+            try:
+                return getattr(self.client, method.replace('.', '_'))(**kwargs)
+            except SlackApiError as e:
+                if e.response.status_code != 429 or attempt == self.max_attempts - 1:
+                    raise
+                retry_after = _retry_after(e)
+                logger.warning(f"{method} rate limited, retrying in {retry_after:.0f}s")
+                limiter.pause(retry_after)
+
+    def deliver(self, run_id, target, text):
+        try:
+            try:
+                response = self.call('chat.postMessage', channel=target, text=text)
+            except SlackApiError as e:
+                if e.response.get('error') != 'not_in_channel':
+                    raise
+                self.call('conversations.join', channel=target)
+                get_channel_cache().update(target, is_member=True)
+                response = self.call('chat.postMessage', channel=target, text=text)
+            self._record(run_id, target, 'sent', message_ts=response.get('ts'))
+            return True
+        except Exception as e:
+            logger.error(f"Standup delivery to {target} failed: {str(e)}")
+            self._record(run_id, target, 'failed', error=str(e))
+            return False
+
+    def _record(self, run_id, target, status, message_ts=None, error=None):
+        with self.conn:
+            self.conn.execute('''
+                INSERT INTO standup_deliveries (run_id, target, status, message_ts, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(run_id, target) DO UPDATE SET
+                    status = excluded.status,
+                    message_ts = excluded.message_ts,
+                    error = excluded.error,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (run_id, target, status, message_ts, error))
+
+    def _sent_targets(self, run_id):
+        return {row[0] for row in self.conn.execute(
+            "SELECT target FROM standup_deliveries WHERE run_id = ? AND status = 'sent'", (run_id,)
+        )}
+
+    def _failed_targets(self, run_id):
+        return [row[0] for row in self.conn.execute(
+            "SELECT target FROM standup_deliveries WHERE run_id = ? AND status = 'failed'", (run_id,)
+        )]
+
+    def latest_run(self, day=None):
+        """Id of the most recently started run on `day` (default today), or None"""
+        day = day or datetime.now().date()
+        row = self.conn.execute('''
+            SELECT run_id FROM standup_deliveries WHERE run_id LIKE ?
+            GROUP BY run_id ORDER BY MIN(rowid) DESC LIMIT 1
+        ''', (f"standup-{day:%Y-%m-%d}%",)).fetchone()
+        return row[0] if row else None
+
+    def dispatch(self, targets, text, run_id=None):
+        """Fan `text` out to every target; targets already sent in this run are skipped,
+        so re-running a run only retries its failures. Without `run_id` a new run starts."""
+        run_id = run_id or new_run_id()
+        with self._dispatch_lock:
+            targets = list(dict.fromkeys(targets))
+            sent = self._sent_targets(run_id)
+            pending = [target for target in targets if target not in sent]
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(lambda target: self.deliver(run_id, target, text), pending))
+
+        summary = {
+            "run_id": run_id,
+            "sent": sum(results),
+            "failed": len(results) - sum(results),
+            "skipped": len(targets) - len(pending),
+            "skipped_targets": [target for target in targets if target in sent],
+            "seconds": round(time.monotonic() - started, 2)
+        }
+        logger.info(f"Standup fan-out {run_id}: {summary}")
+        return summary
+
+def resolve_targets(names, client):
+    """Slack IDs for a roster of IDs and channel names; unknown names are dropped"""
+    channel_cache = get_channel_cache()
+    targets = []
+    for name in names:
+        name = name.strip().lstrip('#')
+        if SLACK_ID.match(name):
+            targets.append(name)
+            continue
+        channel_id = channel_cache.resolve(name, client)
+        if channel_id:
+            targets.append(channel_id)
+        else:
+            logger.warning(f"Standup channel {name} not found")
+    return targets
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+def dispatch_standup(client=None, run_id=None, extra_targets=(), retry=False):
+    """Send the standup to the configured channels and users
+
+    Each call is a new run unless `run_id` is given. With `retry`, today's
+    latest run is dispatched again, so only its failed targets are re-sent.
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            if client is None:
+                from slack_sdk import WebClient
+                client = WebClient(token=SLACK_BOT_TOKEN)
+            _dispatcher = StandupDispatcher(client)
+    if retry:
+        run_id = _dispatcher.latest_run()
+        if run_id is None:
+            logger.info("No standup run today to retry")
+            return {"run_id": None, "sent": 0, "failed": 0, "skipped": 0, "skipped_targets": [], "seconds": 0}
+        # Targets added for that trigger only (e.g. the requester's DM) are not on the roster
+        extra_targets = list(extra_targets) + _dispatcher._failed_targets(run_id)
+    targets = resolve_targets(STANDUP_CHANNELS + STANDUP_USERS + list(extra_targets), _dispatcher.client)
+    return _dispatcher.dispatch(targets, STANDUP_MESSAGE, run_id=run_id)
+
+if __name__ == "__main__":
+    print(dispatch_standup())
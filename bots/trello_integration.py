@@ -2,97 +2,199 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import requests
+import asyncio
 import pandas as pd
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from core.config import *
 from core.logger import configure_logger
+from core.trello_client import TrelloAPIError, get_trello_client
+from core.board_snapshot import get_board_snapshot
+from bots.blocker_index import get_blocker_index
 
 logger = configure_logger(__name__)
 
+_COMMENT_QUERY = {'filter': 'commentCard', 'fields': 'data', 'limit': 1000}
+
 def validate_trello_response(response):
     if response.status_code != 200:
         raise TrelloAPIError(f"API Error {response.status_code}: {response.text}")
     return response.json()
 
-class TrelloAPIError(Exception):
-    pass
-
 def fetch_trello_data():
     try:
-        url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}/cards"
-        params = {
-            "key": TRELLO_API_KEY,
-            "token": TRELLO_TOKEN,
-            "checklists": "all",
-            "fields": "name,desc,dateLastActivity,checklists,closed,labels,idList"
-        }
-        return validate_trello_response(requests.get(url, params=params))
+        return get_board_snapshot().cards()
     except Exception as e:
         logger.error(f"Trello fetch failed: {str(e)}")
         return []
 
-def create_trello_card(blocker_text):
+def _blocker_card_query(blocker_text, idempotency_key=None):
+    desc = f"{blocker_text}\n\nBoard ID: {TRELLO_BOARD_ID}"
+    if idempotency_key:
+        desc += f"\nBlocker-Key: {idempotency_key}"
+    return {
+        'idList': TRELLO_LIST_ID,
+        'name': f"Blocker: {blocker_text[:50]}",
+        'desc': desc, 
+        'pos': 'top'
+    }
+
+def _duplicate_comment(blocker_text, idempotency_key=None):
+    text = f"Reported again: {blocker_text}"
+    # Tagged like the card description, so a retried job can tell it already commented
+    return f"{text}\n\nBlocker-Key: {idempotency_key}" if idempotency_key else text
+
+def _has_comment(actions, text):
+    return any(action.get('data', {}).get('text') == text for action in actions)
+
+def _record_new_card(card, blocker_text):
+    get_board_snapshot().invalidate()
+    get_blocker_index().add(card['id'], blocker_text)
+
+def create_trello_card(blocker_text, idempotency_key=None):
     try:
-        url = "https://api.trello.com/1/cards"
-        query = {
-            'key': TRELLO_API_KEY,
-            'token': TRELLO_TOKEN,
-            'idList': TRELLO_LIST_ID,
-            'name': f"Blocker: {blocker_text[:50]}",
-            'desc': f"{blocker_text}\n\nBoard ID: {TRELLO_BOARD_ID}", 
-            'pos': 'top'
-        }
-        return validate_trello_response(requests.post(url, params=query))
+        duplicate = find_open_duplicate(blocker_text)
+        if duplicate:
+            client = get_trello_client()
+            comment = _duplicate_comment(blocker_text, idempotency_key)
+            # Only a keyed job can be a retry, so unkeyed reports skip the lookup
+            actions = client.get(f"cards/{duplicate['id']}/actions", _COMMENT_QUERY) if idempotency_key else []
+            if _has_comment(actions, comment):
+                logger.info(f"Card {duplicate['id']} already has the comment for {idempotency_key}")
+            else:
+                client.post(f"cards/{duplicate['id']}/actions/comments", {'text': comment})
+            return duplicate
+
+        card = get_trello_client().post("cards", _blocker_card_query(blocker_text, idempotency_key),
+                                        idempotency_key=idempotency_key)
+        _record_new_card(card, blocker_text)
+        return card
+    except TrelloAPIError as e:
+        logger.error(f"Trello API Error: {str(e)}")
+        raise
+
+async def create_trello_card_async(blocker_text, client, idempotency_key=None):
+    """create_trello_card for the asyncio runtime, using an AsyncTrelloClient"""
+    try:
+        # The duplicate check may refresh the board snapshot, so keep it off the loop
+        duplicate = await asyncio.to_thread(find_open_duplicate, blocker_text)
+        if duplicate:
+            comment = _duplicate_comment(blocker_text, idempotency_key)
+            actions = await client.get(f"cards/{duplicate['id']}/actions", _COMMENT_QUERY) if idempotency_key else []
+            if _has_comment(actions, comment):
+                logger.info(f"Card {duplicate['id']} already has the comment for {idempotency_key}")
+            else:
+                await client.post(f"cards/{duplicate['id']}/actions/comments", {'text': comment})
+            return duplicate
+
+        card = await client.post("cards", _blocker_card_query(blocker_text, idempotency_key),
+                                 idempotency_key=idempotency_key)
+        await asyncio.to_thread(_record_new_card, card, blocker_text)
+        return card
     except TrelloAPIError as e:
         logger.error(f"Trello API Error: {str(e)}")
         raise
 
-def archive_old_cards(days=14):
+def _is_open_card(card_id):
+    """Whether a card is still open on the board; looks up only that card"""
     try:
+        card = get_trello_client().get(f"cards/{card_id}", {'fields': 'closed,idBoard'})
+    except TrelloAPIError as e:
+        if e.status_code == 404:
+            return False
+        raise
+    moved = TRELLO_BOARD_ID and card.get('idBoard') not in (None, TRELLO_BOARD_ID)
+    return not card.get('closed') and not moved
+
+def find_open_duplicate(blocker_text):
+    """Return the open near-duplicate blocker card that should absorb this report"""
+    index = get_blocker_index()
+    while True:
+        match = index.find_duplicate(blocker_text)
+        if not match:
+            return None
+        card_id, similarity = match
+        if _is_open_card(card_id):
+            break
+        # Closed, archived or moved since it was indexed; the next best match may still be open
+        index.remove([card_id])
+
+    logger.info(f"Blocker matched card {card_id} ({similarity:.0%} similar), adding comment")
+    return {'id': card_id, 'duplicate': True, 'similarity': similarity}
+
+def select_stale_cards(cards, days=14):
+    """Return ids of cards idle for more than `days`, parsing dates in one pass"""
+    if not cards:
+        return []
+    frame = pd.DataFrame(cards, columns=['id', 'dateLastActivity'])
+    last_active = pd.to_datetime(frame['dateLastActivity'], utc=True,
+                                 format='ISO8601', errors='coerce')
+    cutoff = pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=days)
+    return frame.loc[last_active < cutoff, 'id'].tolist()
+
+def archive_old_cards(days=14, dry_run=False, max_workers=TRELLO_ARCHIVE_WORKERS):
+    """Archive stale cards concurrently; returns archived/failed/skipped counts"""
+    result = {"archived": 0, "failed": 0, "skipped": 0, "dry_run": dry_run}
+    try:
+        cards = fetch_trello_data()
+        stale_ids = select_stale_cards(cards, days)
+        result["skipped"] = len(cards) - len(stale_ids)
+
+        if dry_run or not stale_ids:
+            result["archived"] = len(stale_ids) if dry_run else 0
+            return result
+
         archive_list_id = TRELLO_ARCHIVE_LIST or get_archive_list()
-        
-        archived = 0
-        cutoff = datetime.now().replace(tzinfo=None) - timedelta(days=days)
-        for card in fetch_trello_data():
-            last_active = pd.to_datetime(card['dateLastActivity']).tz_localize(None)
-            if last_active < cutoff:
-                url = f"https://api.trello.com/1/cards/{card['id']}"
-                params = {
-                    'key': TRELLO_API_KEY,
-                    'token': TRELLO_TOKEN,
-                    'closed': 'true',
-                    'idList': archive_list_id
-                }
-                requests.put(url, params=params)
-                archived += 1
-        return archived
+        client = get_trello_client()
+        params = {
+            'closed': 'true',
+            'idList': archive_list_id
+        }
+
+        archived_ids = []
+        # The shared client's rate limiter keeps the pool within Trello's per-token limit
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(client.put, f"cards/{card_id}", params): card_id
+                for card_id in stale_ids
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    archived_ids.append(futures[future])
+                    result["archived"] += 1
+                except Exception as e:
+                    logger.warning(f"Failed to archive card {futures[future]}: {str(e)}")
+                    result["failed"] += 1
+
+        if result["archived"]:
+            get_board_snapshot().invalidate()
+            get_blocker_index().remove(archived_ids)
+        logger.info(f"Archived {result['archived']} cards "
+                    f"({result['failed']} failed, {result['skipped']} skipped)")
+        return result
     except Exception as e:
         logger.error(f"Archive failed: {str(e)}")
-        return 0
+        return result
 
 def get_archive_list():
     try:
-        url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}/lists"
-        params = {'key': TRELLO_API_KEY, 'token': TRELLO_TOKEN}
-        lists = validate_trello_response(requests.get(url, params=params))
+        client = get_trello_client()
+        lists = client.get(f"boards/{TRELLO_BOARD_ID}/lists")
         
         for lst in lists:
             if 'archive' in lst['name'].lower():
                 return lst['id']
             
         # Create new archive list
-        new_list = validate_trello_response(requests.post(
-            "https://api.trello.com/1/lists",
+        new_list = client.post(
+            "lists",
             params={
-                'key': TRELLO_API_KEY,
-                'token': TRELLO_TOKEN,
                 'name': 'Archive',
                 'idBoard': TRELLO_BOARD_ID,
                 'pos': 'bottom'
             }
-        ))
+        )
         return new_list['id']
     except Exception as e:
         logger.error(f"Archive list creation failed: {str(e)}")
-        raise
\ No newline at end of file
+        raise
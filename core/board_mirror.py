@@ -0,0 +1,117 @@
+from datetime import datetime, timezone
+from core.config import TRELLO_BOARD_ID, MIRROR_RESYNC_THRESHOLD
+from core.database import Database
+from core.card_stream import CARD_FIELDS, iter_card_pages
+from core.logger import configure_logger
+from core.trello_client import TrelloAPIError, get_trello_client
+
+logger = configure_logger(__name__)
+
+ACTIONS_PAGE_SIZE = 1000
+
+# Actions that change a card, its checklists or its check items
+CARD_ACTIONS = [
+    'createCard', 'copyCard', 'updateCard', 'deleteCard',
+    'moveCardToBoard', 'moveCardFromBoard', 'convertToCardFromCheckItem',
+    'addChecklistToCard', 'removeChecklistFromCard', 'updateChecklist',
+    'createCheckItem', 'updateCheckItem', 'updateCheckItemStateOnCard', 'deleteCheckItem',
+    'addLabelToCard', 'removeLabelFromCard'
+]
+REMOVAL_ACTIONS = {'deleteCard', 'moveCardFromBoard'}
+
+class BoardMirror:
+    """Keeps the SQLite board mirror current by replaying the board's actions feed"""
+    def __init__(self, board_id=None, db=None, client=None):
+        self.board_id = board_id or TRELLO_BOARD_ID
+        self.db = db or Database()
+        self.client = client or get_trello_client()
+
+    def sync(self):
+        """Bring the mirror up to date; returns the number of cards written or removed"""
+        cursor = self.db.get_sync_cursor(self.board_id)
+        if cursor is None:
+            return self.full_sync()
+
+        actions = self._fetch_actions(cursor)
+        if not actions:
+            self.db.set_sync_cursor(self.board_id, cursor)
+            return 0
+
+        removed, touched = set(), set()
+        # Feed is newest first; the newest action on a card decides its fate
+        for action in actions:
+            data = action.get('data', {})
+            card_id = data.get('card', {}).get('id')
+            if card_id and card_id not in removed and card_id not in touched:
+                if action['type'] in REMOVAL_ACTIONS:
+                    removed.add(card_id)
+                else:
+                    touched.add(card_id)
+            # Converting a check item also edits the card it came from
+            source_id = data.get('cardSource', {}).get('id')
+            if source_id and source_id not in removed:
+                touched.add(source_id)
+
+        if len(touched) > MIRROR_RESYNC_THRESHOLD:
+            logger.info(f"{len(touched)} cards changed, falling back to full sync")
+            return self.full_sync()
+
+        cards = []
+        for card_id in touched:
+            card = self._fetch_card(card_id)
+            if card is None or card.get('idBoard') != self.board_id:
+                removed.add(card_id)
+            else:
+                cards.append(card)
+
+        self.db.upsert_board_cards(self.board_id, cards)
+        self.db.delete_board_cards(removed)
+        self.db.set_sync_cursor(self.board_id, actions[0]['id'])
+        logger.info(f"Mirror delta sync: {len(cards)} updated, {len(removed)} removed")
+        return len(cards) + len(removed)
+
+    def full_sync(self):
+        """Reload every card; the cursor is taken first so concurrent edits replay next sync"""
+        latest = self.client.get(f"boards/{self.board_id}/actions",
+                                 {'filter': ','.join(CARD_ACTIONS), 'limit': 1})
+        cursor = latest[0]['id'] if latest else datetime.now(timezone.utc).isoformat()
+
+        # Clearing also drops the cursor, so an interrupted load is redone next sync
+        self.db.clear_board(self.board_id)
+        total = 0
+        for page in iter_card_pages(self.board_id, self.client, compact=False):
+            total += self.db.upsert_board_cards(self.board_id, page)
+        self.db.set_sync_cursor(self.board_id, cursor)
+        logger.info(f"Mirror full sync: {total} cards")
+        return total
+
+    def cards(self):
+        """Return compact card records (see core.card_stream.compact_card)"""
+        return self.db.get_board_cards(self.board_id)
+
+    def _fetch_actions(self, since):
+        actions = []
+        before = None
+        while True:
+            params = {
+                'filter': ','.join(CARD_ACTIONS),
+                'since': since,
+                'limit': ACTIONS_PAGE_SIZE,
+                'fields': 'type,date,data'
+            }
+            if before:
+                params['before'] = before
+            page = self.client.get(f"boards/{self.board_id}/actions", params)
+            actions.extend(page)
+            if len(page) < ACTIONS_PAGE_SIZE:
+                return actions
+            before = page[-1]['id']
+
+    def _fetch_card(self, card_id):
+        try:
+            return self.client.get(f"cards/{card_id}",
+                                   {'checklists': 'all', 'fields': CARD_FIELDS})
+        except TrelloAPIError as e:
+            if e.status_code == 404:
+                return None
+            raise
@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import threading
+from core.config import (
+    TRELLO_BOARD_ID,
+    BOARD_SNAPSHOT_TTL,
+    BOARD_CACHE_DIR,
+    TRELLO_MIRROR_ENABLED
+)
+from core.logger import configure_logger
+from core.trello_client import get_trello_client
+from core.board_mirror import BoardMirror
+from core.card_stream import iter_board_cards
+from core.card_frame import card_frame
+
+logger = configure_logger(__name__)
+
+# Bumped whenever the card records change shape; cache files of another format are refetched
+SNAPSHOT_FORMAT = 2  # 2: compact cards (core.card_stream.compact_card)
+
+class BoardSnapshot:
+    """Compact board cards fetched once and served from memory/disk until the TTL expires"""
+    def __init__(self, board_id=None, ttl=None, cache_dir=None, client=None):
+        self.board_id = board_id or TRELLO_BOARD_ID
+        self.ttl = BOARD_SNAPSHOT_TTL if ttl is None else ttl
+        self.cache_path = os.path.join(cache_dir or BOARD_CACHE_DIR, f"board_{self.board_id}.json")
+        self.client = client or get_trello_client()
+        self.generation = 0
+        self.fetched_at = 0.0
+        self._cards = None
+        self._frame = None
+        self._frame_cards = None
+        self._lock = threading.Lock()
+
+    def cards(self):
+        """Return the board's cards, refetching only when the snapshot is stale"""
+        with self._lock:
+            if self._cards is not None and self._is_fresh(self.fetched_at):
+                return self._cards
+            if self._load_from_disk():
+                return self._cards
+            try:
+                self._store(self._fetch(), time.time(), self.generation + 1)
+            except Exception as e:
+                if self._cards is None:
+                    raise
+                logger.warning(f"Board refresh failed, serving stale snapshot: {str(e)}")
+            return self._cards
+
+    def frame(self):
+        """Columnar view of cards() (see core.card_frame), rebuilt only when the cards change
+
+        The frame is shared between callers, so filter or copy it rather than mutating it.
+        """
+        cards = self.cards()
+        with self._lock:
+            if self._frame_cards is not cards:
+                self._frame = card_frame(cards)
+                self._frame_cards = cards
+            return self._frame
+
+    def invalidate(self):
+        """Drop the snapshot after a write so the next read sees the change"""
+        with self._lock:
+            self._cards = None
+            self.fetched_at = 0.0
+            self.generation += 1
+            try:
+                os.remove(self.cache_path)
+            except FileNotFoundError:
+                pass
+
+    def _is_fresh(self, fetched_at):
+        return time.time() - fetched_at < self.ttl
+
+    def _fetch(self):
+        if TRELLO_MIRROR_ENABLED:
+            mirror = BoardMirror(self.board_id, client=self.client)
+            mirror.sync()
+            cards = mirror.cards()
+            logger.info(f"Loaded board snapshot with {len(cards)} cards from mirror")
+            return cards
+
+        cards = list(iter_board_cards(self.board_id, self.client))
+        logger.info(f"Fetched board snapshot with {len(cards)} cards")
+        return cards
+
+    def _store(self, cards, fetched_at, generation):
+        self._cards = cards
+        self.fetched_at = fetched_at
+        self.generation = generation
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    "format": SNAPSHOT_FORMAT,
+                    "board_id": self.board_id,
+                    "fetched_at": fetched_at,
+                    "generation": generation,
+                    "cards": cards
+                }, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not persist board snapshot: {str(e)}")
+
+    def _load_from_disk(self):
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        # Files from before the format was recorded hold full Trello cards
+        if cached.get('format') != SNAPSHOT_FORMAT or not self._is_fresh(cached.get('fetched_at', 0)):
+            return False
+        self._cards = cached['cards']
+        self.fetched_at = cached['fetched_at']
+        self.generation = max(self.generation, cached.get('generation', 0))
+        return True
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+def get_board_snapshot(board_id=None):
+    """Return the shared snapshot for a board (defaults to TRELLO_BOARD_ID)"""
+    board_id = board_id or TRELLO_BOARD_ID
+    with _snapshots_lock:
+        if board_id not in _snapshots:
+            _snapshots[board_id] = BoardSnapshot(board_id)
+        return _snapshots[board_id]
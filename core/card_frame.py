@@ -0,0 +1,27 @@
+import pandas as pd
+
+CARD_COLUMNS = [
+    'id', 'name', 'desc', 'due', 'dateLastActivity', 'closed', 'idList', 'labels',
+    'checklistCount', 'checkItemCount', 'completedCount'
+]
+COUNT_COLUMNS = ['checklistCount', 'checkItemCount', 'completedCount']
+
+def _timestamps(values):
+    # Trello timestamps are ISO 8601 in UTC; stored naive so they compare with pd.Timestamp.now()
+    return pd.to_datetime(values, utc=True, errors='coerce', format='ISO8601').dt.tz_localize(None)
+
+def card_frame(cards):
+    """Columnar frame of compact card records (see core.card_stream.compact_card)
+
+    `due` and `dateLastActivity` are parsed once into naive UTC datetimes
+    (NaT when missing or malformed) and the checklist counts are integers,
+    so consumers filter and aggregate with vectorized operations.
+    """
+    frame = pd.DataFrame.from_records(list(cards), columns=CARD_COLUMNS)
+    frame['name'] = frame['name'].fillna('')
+    frame['desc'] = frame['desc'].fillna('')
+    frame['closed'] = frame['closed'].fillna(False).astype(bool)
+    frame['due'] = _timestamps(frame['due'])
+    frame['dateLastActivity'] = _timestamps(frame['dateLastActivity'])
+    frame[COUNT_COLUMNS] = frame[COUNT_COLUMNS].fillna(0).astype('int64')
+    return frame
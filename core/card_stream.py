@@ -0,0 +1,89 @@
+from core.config import TRELLO_BOARD_ID, TRELLO_CARD_PAGE_SIZE
+from core.logger import configure_logger
+from core.trello_client import get_trello_client
+
+try:
+    import ijson  # Optional: parse each page incrementally instead of materialising it
+except ImportError:
+    ijson = None
+
+logger = configure_logger(__name__)
+
+# Union of the card fields every consumer reads, so one request serves them all:
+# report (name, closed), dashboard (name, desc, due, labels, idList, dateLastActivity),
+# risk predictor (dateLastActivity), prioritizer (name, due) and the mirror (idBoard)
+CARD_FIELDS = 'name,desc,due,dateLastActivity,closed,labels,idList,idBoard'
+
+def compact_card(card):
+    """Reduce a card to the fields consumers read, collapsing checklists to counts"""
+    checklists = card.get('checklists') or []
+    items = [item for cl in checklists for item in cl.get('checkItems', [])]
+    return {
+        'id': card['id'],
+        'name': card.get('name', ''),
+        'desc': card.get('desc', ''),
+        'due': card.get('due'),
+        'dateLastActivity': card.get('dateLastActivity'),
+        'closed': bool(card.get('closed')),
+        'idList': card.get('idList'),
+        'labels': [label['name'] for label in card.get('labels') or [] if label.get('name')],
+        'checklistCount': len(checklists),
+        'checkItemCount': len(items),
+        'completedCount': sum(1 for item in items if item.get('state') == 'complete')
+    }
+
+def _iter_json_array(response):
+    if ijson is None:
+        # Without ijson memory is still bounded by one page
+        yield from response.json()
+        return
+    response.raw.decode_content = True
+    yield from ijson.items(response.raw, 'item', use_float=True)
+
+def iter_board_cards(board_id=None, client=None, page_size=None, compact=True):
+    """Yield a board's cards page by page using Trello's limit/before cursor"""
+    board_id = board_id or TRELLO_BOARD_ID
+    client = client or get_trello_client()
+    page_size = page_size or TRELLO_CARD_PAGE_SIZE
+    before = None
+    total = 0
+
+    while True:
+        params = {
+            'checklists': 'all',
+            'fields': CARD_FIELDS,
+            'limit': page_size
+        }
+        if before:
+            params['before'] = before
+
+        response = client.request('GET', f"boards/{board_id}/cards", params, stream=True)
+        count = 0
+        oldest = None
+        try:
+            for card in _iter_json_array(response):
+                count += 1
+                # Card ids are time-ordered ObjectIds, so the smallest is the next cursor
+                if oldest is None or card['id'] < oldest:
+                    oldest = card['id']
+                yield compact_card(card) if compact else card
+        finally:
+            response.close()
+
+        total += count
+        if count < page_size:
+            logger.info(f"Streamed {total} cards from board {board_id}")
+            return
+        before = oldest
+
+def iter_card_pages(board_id=None, client=None, page_size=None, compact=True):
+    """Group streamed cards into lists of at most `page_size` for batched writes"""
+    page_size = page_size or TRELLO_CARD_PAGE_SIZE
+    page = []
+    for card in iter_board_cards(board_id, client, page_size, compact):
+        page.append(card)
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page:
+        yield page
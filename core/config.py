@@ -7,8 +7,18 @@ load_dotenv()
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET")
 SLACK_APP_TOKEN = os.getenv("SLACK_APP_TOKEN")
+SLACK_TOKEN_VERIFICATION = os.getenv("SLACK_TOKEN_VERIFICATION", "true").lower() == "true"  # auth.test when the app is built
 SLACK_TEAM_CHANNEL = os.getenv("SLACK_TEAM_CHANNEL", "general")
 SLACK_RETRO_CHANNEL = os.getenv("SLACK_RETRO_CHANNEL", "retrospective")
+CHANNEL_CACHE_REFRESH_INTERVAL = int(os.getenv("CHANNEL_CACHE_REFRESH_INTERVAL", 300))
+STANDUP_CHANNELS = [c for c in os.getenv("STANDUP_CHANNELS", SLACK_TEAM_CHANNEL).split(",") if c]
+STANDUP_USERS = [u for u in os.getenv("STANDUP_USERS", "").split(",") if u]
+STANDUP_MAX_WORKERS = int(os.getenv("STANDUP_MAX_WORKERS", 16))
+SLACK_POST_RATE = int(os.getenv("SLACK_POST_RATE", 600))  # chat.postMessage calls per minute
+EVENT_WORKERS = int(os.getenv("EVENT_WORKERS", 8))
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", 1000))
+EVENT_DEDUP_TTL = int(os.getenv("EVENT_DEDUP_TTL", 3600))  # Slack retries for up to ~5 minutes
+EVENT_METRICS_INTERVAL = int(os.getenv("EVENT_METRICS_INTERVAL", 60))
 
 # Trello Configuration
 TRELLO_API_KEY = os.getenv("TRELLO_API_KEY")
@@ -16,6 +26,53 @@ TRELLO_TOKEN = os.getenv("TRELLO_TOKEN")
 TRELLO_BOARD_ID = os.getenv("TRELLO_BOARD_ID")
 TRELLO_LIST_ID = os.getenv("TRELLO_LIST_ID")
 TRELLO_ARCHIVE_LIST = os.getenv("TRELLO_ARCHIVE_LIST", "")
+TRELLO_API_URL = os.getenv("TRELLO_API_URL", "https://api.trello.com/1")
+TRELLO_TIMEOUT = float(os.getenv("TRELLO_TIMEOUT", 10))
+TRELLO_MAX_RETRIES = int(os.getenv("TRELLO_MAX_RETRIES", 3))
+TRELLO_POOL_SIZE = int(os.getenv("TRELLO_POOL_SIZE", 10))
+TRELLO_RATE_LIMIT = int(os.getenv("TRELLO_RATE_LIMIT", 100))  # Requests per 10s per token
+TRELLO_ARCHIVE_WORKERS = int(os.getenv("TRELLO_ARCHIVE_WORKERS", 8))
+TRELLO_CARD_PAGE_SIZE = int(os.getenv("TRELLO_CARD_PAGE_SIZE", 500))
+BOARD_SNAPSHOT_TTL = int(os.getenv("BOARD_SNAPSHOT_TTL", 300))
+BOARD_CACHE_DIR = os.getenv("BOARD_CACHE_DIR", ".cache")
+TRELLO_MIRROR_ENABLED = os.getenv("TRELLO_MIRROR_ENABLED", "true").lower() == "true"
+MIRROR_RESYNC_THRESHOLD = int(os.getenv("MIRROR_RESYNC_THRESHOLD", 500))
+BLOCKER_PHRASES = os.getenv("BLOCKER_PHRASES", "blocked,stuck,waiting,help,issue").split(",")
+CARD_BLOCKER_PHRASES = os.getenv(
+    "CARD_BLOCKER_PHRASES", "blocker,blocked,stuck,help needed,urgent,critical"
+).split(",")
+BLOCKER_QUEUE_BATCH_SIZE = int(os.getenv("BLOCKER_QUEUE_BATCH_SIZE", 10))
+BLOCKER_QUEUE_MAX_ATTEMPTS = int(os.getenv("BLOCKER_QUEUE_MAX_ATTEMPTS", 5))
+BLOCKER_QUEUE_LEASE_SECONDS = int(os.getenv("BLOCKER_QUEUE_LEASE_SECONDS", 300))  # Unfinished claims are re-queued after this
+BLOCKER_DUPLICATE_THRESHOLD = float(os.getenv("BLOCKER_DUPLICATE_THRESHOLD", 0.6))
+
+# Sentiment Analysis
+SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "cardiffnlp/twitter-roberta-base-sentiment-latest")
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "pytorch")  # pytorch, pytorch-int8, onnx, onnx-int8
+SENTIMENT_THREADS = int(os.getenv("SENTIMENT_THREADS", os.cpu_count() or 1))
+SENTIMENT_ONNX_DIR = os.getenv("SENTIMENT_ONNX_DIR", ".cache/onnx")
+SENTIMENT_TOKEN_BUDGET = int(os.getenv("SENTIMENT_TOKEN_BUDGET", 2048))  # Padded tokens per batch
+SENTIMENT_MAX_BATCH = int(os.getenv("SENTIMENT_MAX_BATCH", 64))
+# Relative to the project root, so every entry point finds the same socket whatever its working directory
+SENTIMENT_WORKER_SOCKET = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    os.getenv("SENTIMENT_WORKER_SOCKET", ".cache/sentiment.sock")
+)
+SENTIMENT_WORKER_MAX_BATCH = int(os.getenv("SENTIMENT_WORKER_MAX_BATCH", 64))
+SENTIMENT_WORKER_MAX_WAIT_MS = int(os.getenv("SENTIMENT_WORKER_MAX_WAIT_MS", 20))
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", 50000))
+SENTIMENT_CACHE_MAX_AGE_DAYS = int(os.getenv("SENTIMENT_CACHE_MAX_AGE_DAYS", 30))
+
+# Forecasting
+MODEL_STORE_DIR = os.getenv("MODEL_STORE_DIR", ".cache/models")
+MODEL_STORE_MAX_MODELS = int(os.getenv("MODEL_STORE_MAX_MODELS", 50))
+FORECAST_BACKEND = os.getenv("FORECAST_BACKEND", "prophet")  # prophet, holt-winters or robust-trend
+DASHBOARD_FORECAST_BACKEND = os.getenv("DASHBOARD_FORECAST_BACKEND", "holt-winters")
+FORECAST_BOARD_IDS = [b for b in os.getenv("FORECAST_BOARD_IDS", TRELLO_BOARD_ID or "").split(",") if b]
+FORECAST_WORKERS = int(os.getenv("FORECAST_WORKERS", os.cpu_count() or 1))
+PROPHET_WARM_START = os.getenv("PROPHET_WARM_START", "true").lower() == "true"
+PROPHET_WARM_START_TOLERANCE = float(os.getenv("PROPHET_WARM_START_TOLERANCE", 0.1))  # Allowed RMSE increase
+PROPHET_MAX_WARM_STARTS = int(os.getenv("PROPHET_MAX_WARM_STARTS", 14))  # Then a cold fit resets the baseline
 
 # Application Settings
 RISK_THRESHOLD = int(os.getenv("RISK_THRESHOLD", 10))
@@ -2,15 +2,36 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import json
 import sqlite3
+import threading
 import pandas as pd
+from core.config import TRELLO_BOARD_ID
 from core.logger import configure_logger
 
 logger = configure_logger(__name__)
 
+class ThreadLocalDatabase:
+    """Base for objects shared across threads: `db` is this thread's own
+    Database on `db_name`, opened on first use (sqlite3 connections are
+    bound to the thread that opened them)"""
+    def __init__(self, db_name='sprints.db'):
+        self.db_name = db_name
+        self._local = threading.local()
+
+    @property
+    def db(self):
+        if not hasattr(self._local, 'db'):
+            self._local.db = Database(self.db_name)
+        return self._local.db
+
+    @property
+    def conn(self):
+        return self.db.conn
+
 class Database:
     def __init__(self, db_name='sprints.db'):
-        self.conn = sqlite3.connect(db_name)
+        self.conn = sqlite3.connect(db_name, timeout=30)
         self.conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign keys
         self._create_tables()
         
@@ -25,7 +46,8 @@ class Database:
             )
         ''')
 
-        # Get current version
+        # Get current version; the write lock keeps concurrent processes from migrating twice
+        cursor.execute("BEGIN IMMEDIATE")
         cursor.execute("SELECT MAX(version) FROM schema_version")
         current_version = cursor.fetchone()[0] or 0
         
@@ -84,26 +106,255 @@ class Database:
                 )
             ''')
             cursor.execute("INSERT INTO schema_version (version) VALUES (4)")
-        
+
+        # Version 5: Local Trello board mirror
+        if current_version < 5:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS trello_cards (
+                    id TEXT PRIMARY KEY,
+                    board_id TEXT NOT NULL,
+                    name TEXT,
+                    desc TEXT,
+                    due TEXT,
+                    date_last_activity TEXT,
+                    closed BOOLEAN,
+                    id_list TEXT,
+                    labels TEXT
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS trello_checklists (
+                    id TEXT PRIMARY KEY,
+                    card_id TEXT NOT NULL REFERENCES trello_cards(id) ON DELETE CASCADE,
+                    name TEXT,
+                    pos REAL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS trello_check_items (
+                    id TEXT PRIMARY KEY,
+                    checklist_id TEXT NOT NULL REFERENCES trello_checklists(id) ON DELETE CASCADE,
+                    name TEXT,
+                    state TEXT,
+                    pos REAL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS trello_sync_state (
+                    board_id TEXT PRIMARY KEY,
+                    action_cursor TEXT,
+                    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_trello_cards_board
+                ON trello_cards(board_id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_trello_checklists_card
+                ON trello_checklists(card_id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_trello_check_items_checklist
+                ON trello_check_items(checklist_id)
+            ''')
+            cursor.execute("INSERT INTO schema_version (version) VALUES (5)")
+
+        # Version 6: Durable blocker-to-card queue
+        if current_version < 6:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS blocker_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idempotency_key TEXT UNIQUE NOT NULL,
+                    text TEXT NOT NULL,
+                    channel TEXT,
+                    user_id TEXT,
+                    thread_ts TEXT,
+                    status TEXT DEFAULT 'pending',
+                    attempts INTEGER DEFAULT 0,
+                    next_attempt_at REAL DEFAULT 0,
+                    card_id TEXT,
+                    last_error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_blocker_queue_status
+                ON blocker_queue(status, next_attempt_at)
+            ''')
+            cursor.execute("INSERT INTO schema_version (version) VALUES (6)")
+
+        # Version 7: Near-duplicate index of open blocker cards
+        if current_version < 7:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS blocker_index (
+                    card_id TEXT PRIMARY KEY,
+                    text TEXT,
+                    signature BLOB NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute("INSERT INTO schema_version (version) VALUES (7)")
+
+        # Version 8: Slack channel name/membership cache
+        if current_version < 8:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS slack_channels (
+                    id TEXT PRIMARY KEY,
+                    name TEXT,
+                    is_member BOOLEAN DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_slack_channels_name
+                ON slack_channels(name)
+            ''')
+            cursor.execute("INSERT INTO schema_version (version) VALUES (8)")
+
+        # Version 9: Local store of retrospective channel messages
+        if current_version < 9:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS retro_messages (
+                    channel_id TEXT NOT NULL,
+                    ts TEXT NOT NULL,
+                    ts_epoch REAL NOT NULL,
+                    user_id TEXT,
+                    text TEXT,
+                    PRIMARY KEY (channel_id, ts)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_retro_messages_window
+                ON retro_messages(channel_id, ts_epoch)
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS retro_cursors (
+                    channel_id TEXT PRIMARY KEY,
+                    latest_ts TEXT,
+                    covered_from REAL NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute("INSERT INTO schema_version (version) VALUES (9)")
+
+        # Version 10: Sentiment results keyed by model and cleaned message text
+        if current_version < 10:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sentiment_cache (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sentiment_cache_last_used
+                ON sentiment_cache(last_used)
+            ''')
+            cursor.execute("INSERT INTO schema_version (version) VALUES (10)")
+
+        # Version 11: Per-message sentiment labels and daily per-channel rollups
+        if current_version < 11:
+            cursor.execute("ALTER TABLE retro_messages ADD COLUMN sentiment TEXT")
+            for column in ('channel_id TEXT', 'day TEXT', 'positive INTEGER DEFAULT 0',
+                           'negative INTEGER DEFAULT 0', 'neutral INTEGER DEFAULT 0',
+                           'samples INTEGER DEFAULT 0'):
+                cursor.execute(f"ALTER TABLE retrospectives ADD COLUMN {column}")
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_retrospectives_channel_day
+                ON retrospectives(channel_id, day)
+            ''')
+            cursor.execute("INSERT INTO schema_version (version) VALUES (11)")
+
+        # Version 12: Standup fan-out delivery results
+        if current_version < 12:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS standup_deliveries (
+                    run_id TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    message_ts TEXT,
+                    error TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (run_id, target)
+                )
+            ''')
+            cursor.execute("INSERT INTO schema_version (version) VALUES (12)")
+
+        # Version 13: Predictions keyed by board; existing rows belong to the default board
+        if current_version < 13:
+            cursor.execute('''
+                CREATE TABLE predictions_by_board (
+                    board_id TEXT NOT NULL,
+                    ds TEXT NOT NULL,
+                    yhat REAL,
+                    yhat_upper REAL,
+                    risk BOOLEAN,
+                    recommendation TEXT,
+                    PRIMARY KEY (board_id, ds)
+                )
+            ''')
+            # save_prediction used to replace the table wholesale, so columns may be missing
+            existing = {row[1] for row in cursor.execute("PRAGMA table_info(predictions)")}
+            columns = ", ".join(c for c in ('ds', 'yhat', 'yhat_upper', 'risk', 'recommendation')
+                                if c in existing)
+            if 'ds' in existing:
+                cursor.execute(f'''
+                    INSERT OR IGNORE INTO predictions_by_board (board_id, {columns})
+                    SELECT ?, {columns} FROM predictions WHERE ds IS NOT NULL
+                ''', (TRELLO_BOARD_ID or '',))
+            cursor.execute("DROP TABLE IF EXISTS predictions")
+            cursor.execute("ALTER TABLE predictions_by_board RENAME TO predictions")
+            cursor.execute("INSERT INTO schema_version (version) VALUES (13)")
+
+        # Version 14: Blocker jobs are owned by the bot that queued them and claimed under a lease
+        if current_version < 14:
+            existing = {row[1] for row in cursor.execute("PRAGMA table_info(blocker_queue)")}
+            if existing:
+                # Jobs queued before this came from the main Slack bot
+                if 'source' not in existing:
+                    cursor.execute("ALTER TABLE blocker_queue ADD COLUMN source TEXT NOT NULL DEFAULT 'slack_bot'")
+                if 'claimed_at' not in existing:
+                    cursor.execute("ALTER TABLE blocker_queue ADD COLUMN claimed_at REAL")
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_blocker_queue_source
+                    ON blocker_queue(source, status, next_attempt_at)
+                ''')
+            cursor.execute("INSERT INTO schema_version (version) VALUES (14)")
+
+        # Version 15: Retro sentiment labels record the model that produced them
+        if current_version < 15:
+            existing = {row[1] for row in cursor.execute("PRAGMA table_info(retro_messages)")}
+            if existing and 'sentiment_model' not in existing:
+                # Labels from before this have an unknown model and are relabelled on the next run
+                cursor.execute("ALTER TABLE retro_messages ADD COLUMN sentiment_model TEXT")
+            cursor.execute("INSERT INTO schema_version (version) VALUES (15)")
+
         self.conn.commit()
 
-    def save_prediction(self, forecast):
-        """Store prediction results with explicit transaction"""
-        forecast['ds'] = forecast['ds'].dt.strftime('%Y-%m-%d')
+    def save_prediction(self, forecast, board_id=None):
+        """Replace one board's predictions, leaving other boards untouched"""
+        board_id = board_id or TRELLO_BOARD_ID or ''
+        columns = [c for c in ('ds', 'yhat', 'yhat_upper', 'risk', 'recommendation') if c in forecast]
+        frame = forecast[columns].copy()
+        frame['ds'] = pd.to_datetime(frame['ds']).dt.strftime('%Y-%m-%d')
+        frame.insert(0, 'board_id', board_id)
         try:
             with self.conn:
-                forecast.to_sql('predictions', self.conn, 
-                              if_exists='replace', index=False,
-                              dtype={'ds': 'TIMESTAMP'})
-                logger.info(f"Saved {len(forecast)} predictions")
+                self.conn.execute("DELETE FROM predictions WHERE board_id = ?", (board_id,))
+                frame.to_sql('predictions', self.conn, if_exists='append', index=False)
+                logger.info(f"Saved {len(frame)} predictions for board {board_id}")
         except Exception as e:
             logger.error(f"Save failed: {str(e)}")
             raise
 
-    def get_predictions(self):
-        """Retrieve predictions with proper date formatting"""
+    def get_predictions(self, board_id=None):
+        """Retrieve a board's predictions with proper date formatting"""
         try:
-            df = pd.read_sql('SELECT * FROM predictions', self.conn)
+            df = pd.read_sql('''
+                SELECT ds, yhat, yhat_upper, risk, recommendation FROM predictions
+                WHERE board_id = ? ORDER BY ds
+            ''', self.conn, params=(board_id or TRELLO_BOARD_ID or '',))
             if not df.empty:
                 df['ds'] = pd.to_datetime(df['ds'])
             return df
@@ -164,6 +415,175 @@ class Database:
             logger.error(f"Failed to load tasks: {str(e)}")
             return pd.DataFrame()
 
+    def upsert_board_cards(self, board_id, cards):
+        """Insert or replace mirrored cards together with their checklists"""
+        cards = list(cards)
+        if not cards:
+            return 0
+        card_ids = [(card['id'],) for card in cards]
+        checklists = [(card['id'], cl) for card in cards for cl in card.get('checklists', [])]
+        try:
+            with self.conn:
+                # Dropping the card's checklists cascades to their check items
+                self.conn.executemany('DELETE FROM trello_checklists WHERE card_id = ?', card_ids)
+                self.conn.executemany('''
+                    INSERT OR REPLACE INTO trello_cards
+                    (id, board_id, name, desc, due, date_last_activity, closed, id_list, labels)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(
+                    card['id'], board_id, card.get('name'), card.get('desc'),
+                    card.get('due'), card.get('dateLastActivity'),
+                    bool(card.get('closed')), card.get('idList'),
+                    json.dumps(card.get('labels', []))
+                ) for card in cards])
+                self.conn.executemany('''
+                    INSERT OR REPLACE INTO trello_checklists (id, card_id, name, pos)
+                    VALUES (?, ?, ?, ?)
+                ''', [(cl['id'], card_id, cl.get('name'), cl.get('pos'))
+                      for card_id, cl in checklists])
+                self.conn.executemany('''
+                    INSERT OR REPLACE INTO trello_check_items (id, checklist_id, name, state, pos)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [(item['id'], cl['id'], item.get('name'), item.get('state'), item.get('pos'))
+                      for _, cl in checklists for item in cl.get('checkItems', [])])
+            return len(cards)
+        except Exception as e:
+            logger.error(f"Mirror upsert failed: {str(e)}")
+            raise
+
+    def delete_board_cards(self, card_ids):
+        """Remove cards (and cascaded checklists) from the mirror"""
+        with self.conn:
+            self.conn.executemany('DELETE FROM trello_cards WHERE id = ?',
+                                  [(card_id,) for card_id in card_ids])
+
+    def clear_board(self, board_id):
+        with self.conn:
+            self.conn.execute('DELETE FROM trello_cards WHERE board_id = ?', (board_id,))
+            self.conn.execute('DELETE FROM trello_sync_state WHERE board_id = ?', (board_id,))
+
+    def get_board_cards(self, board_id):
+        """Return open mirrored cards as compact records with checklist counts"""
+        rows = self.conn.execute('''
+            SELECT c.id, c.name, c.desc, c.due, c.date_last_activity, c.closed,
+                   c.id_list, c.labels,
+                   COUNT(DISTINCT cl.id),
+                   COUNT(i.id),
+                   COALESCE(SUM(i.state = 'complete'), 0)
+            FROM trello_cards c
+            LEFT JOIN trello_checklists cl ON cl.card_id = c.id
+            LEFT JOIN trello_check_items i ON i.checklist_id = cl.id
+            WHERE c.board_id = ? AND NOT c.closed
+            GROUP BY c.id
+        ''', (board_id,))
+        return [{
+            'id': row[0], 'name': row[1] or '', 'desc': row[2] or '', 'due': row[3],
+            'dateLastActivity': row[4], 'closed': bool(row[5]), 'idList': row[6],
+            'labels': [label['name'] for label in json.loads(row[7] or '[]') if label.get('name')],
+            'checklistCount': row[8], 'checkItemCount': row[9], 'completedCount': row[10]
+        } for row in rows]
+
+    def get_sync_cursor(self, board_id):
+        row = self.conn.execute(
+            'SELECT action_cursor FROM trello_sync_state WHERE board_id = ?', (board_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_sync_cursor(self, board_id, action_cursor):
+        with self.conn:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO trello_sync_state (board_id, action_cursor, synced_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', (board_id, action_cursor))
+
+    def save_retro_messages(self, channel_id, messages):
+        """Store fetched retro messages; re-fetched ones are ignored"""
+        with self.conn:
+            self.conn.executemany('''
+                INSERT OR IGNORE INTO retro_messages (channel_id, ts, ts_epoch, user_id, text)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(channel_id, msg['ts'], float(msg['ts']), msg.get('user'), msg.get('text'))
+                  for msg in messages])
+
+    def set_retro_cursor(self, channel_id, latest_ts, covered_from):
+        """Record the newest Slack ts stored (the high-water mark) and the
+        oldest epoch the local store is complete from"""
+        with self.conn:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO retro_cursors (channel_id, latest_ts, covered_from, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (channel_id, latest_ts, covered_from))
+
+    def get_retro_cursor(self, channel_id):
+        """Return (latest_ts, covered_from) for a channel, or (None, None)"""
+        row = self.conn.execute(
+            'SELECT latest_ts, covered_from FROM retro_cursors WHERE channel_id = ?', (channel_id,)
+        ).fetchone()
+        return row if row else (None, None)
+
+    def iter_retro_messages(self, channel_id, since_epoch, until_epoch, model_key, chunk_size=200):
+        """Yield stored (ts, text, sentiment) rows in [since_epoch, until_epoch] in chunks, oldest first
+
+        Labels produced by a model other than `model_key` come back as None.
+        """
+        cursor = self.conn.execute('''
+            SELECT ts, text, CASE WHEN sentiment_model = ? THEN sentiment END FROM retro_messages
+            WHERE channel_id = ? AND ts_epoch >= ? AND ts_epoch <= ?
+            ORDER BY ts_epoch
+        ''', (model_key, channel_id, since_epoch, until_epoch))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+
+    def set_retro_sentiments(self, channel_id, labels, model_key):
+        """Store sentiment labels given as (ts, label) pairs, produced by `model_key`"""
+        with self.conn:
+            self.conn.executemany(
+                'UPDATE retro_messages SET sentiment = ?, sentiment_model = ? WHERE channel_id = ? AND ts = ?',
+                [(label, model_key, channel_id, ts) for ts, label in labels]
+            )
+
+    def refresh_retro_rollups(self, channel_id, since_epoch, until_epoch, model_key):
+        """Recompute the daily (UTC) rollup rows of every day touching [since_epoch, until_epoch]
+        from the labels `model_key` produced"""
+        with self.conn:
+            self.conn.execute('''
+                INSERT INTO retrospectives
+                    (channel_id, day, positive, negative, neutral, samples, sentiment_score, timestamp)
+                SELECT channel_id, date(ts_epoch, 'unixepoch') AS day,
+                       SUM(sentiment = 'positive'), SUM(sentiment = 'negative'),
+                       SUM(sentiment = 'neutral'), COUNT(*),
+                       (SUM(sentiment = 'positive') - SUM(sentiment = 'negative')) * 1.0 / COUNT(*),
+                       CURRENT_TIMESTAMP
+                FROM retro_messages
+                WHERE channel_id = ? AND sentiment IS NOT NULL AND sentiment_model = ?
+                  AND ts_epoch >= CAST(strftime('%s', date(?, 'unixepoch')) AS REAL)
+                  AND ts_epoch < CAST(strftime('%s', date(?, 'unixepoch', '+1 day')) AS REAL)
+                GROUP BY channel_id, day
+                ON CONFLICT(channel_id, day) DO UPDATE SET
+                    positive = excluded.positive,
+                    negative = excluded.negative,
+                    neutral = excluded.neutral,
+                    samples = excluded.samples,
+                    sentiment_score = excluded.sentiment_score,
+                    timestamp = excluded.timestamp
+            ''', (channel_id, model_key, since_epoch, until_epoch))
+
+    def get_sentiment_trend(self, channel_id, since_day):
+        """Daily rollups for a channel from `since_day` (YYYY-MM-DD) onwards"""
+        try:
+            return pd.read_sql('''
+                SELECT day, positive, negative, neutral, samples, sentiment_score
+                FROM retrospectives
+                WHERE channel_id = ? AND day >= ?
+                ORDER BY day
+            ''', self.conn, params=(channel_id, since_day))
+        except Exception as e:
+            logger.error(f"Sentiment trend read failed: {str(e)}")
+            return pd.DataFrame()
+
 def initialize_database():
     Database()._create_tables()
 
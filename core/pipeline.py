@@ -0,0 +1,112 @@
+import time
+import queue
+import threading
+
+_DONE = object()
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+class StageStats:
+    """Items handled and seconds spent inside one pipeline stage"""
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.seconds = 0.0
+
+    @property
+    def rate(self):
+        return self.items / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return f"{self.name}: {self.items} items in {self.seconds:.2f}s ({self.rate:.1f}/s)"
+
+class Pipeline:
+    """Source and stages on their own threads, joined by bounded queues
+
+    The source yields chunks (lists); each stage maps a chunk to a new
+    chunk. Iterating the pipeline yields the last stage's outputs while
+    earlier stages keep working, and at most `maxsize` chunks wait
+    between any two stages.
+    """
+    def __init__(self, source, stages, maxsize=4):
+        self.source_name, self.source = source
+        self.stages = stages
+        self.maxsize = maxsize
+        self.stats = [StageStats(self.source_name)] + [StageStats(name) for name, _ in stages]
+        self._stopped = threading.Event()
+
+    def _put(self, q, item):
+        while not self._stopped.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run_source(self, out, stats):
+        try:
+            chunks = iter(self.source)
+            while not self._stopped.is_set():
+                started = time.perf_counter()
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                finally:
+                    stats.seconds += time.perf_counter() - started
+                stats.items += len(chunk)
+                if not self._put(out, chunk):
+                    return
+            self._put(out, _DONE)
+        except Exception as e:
+            self._put(out, _Failure(e))
+
+    def _run_stage(self, fn, inbox, out, stats):
+        while True:
+            item = inbox.get()
+            if item is _DONE or isinstance(item, _Failure):
+                self._put(out, item)
+                return
+            try:
+                started = time.perf_counter()
+                result = fn(item)
+                stats.seconds += time.perf_counter() - started
+                stats.items += len(item)
+            except Exception as e:
+                self._put(out, _Failure(e))
+                return
+            if not self._put(out, result):
+                return
+
+    def __iter__(self):
+        queues = [queue.Queue(self.maxsize) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._run_source, args=(queues[0], self.stats[0]),
+                                    daemon=True, name=f"pipeline-{self.source_name}")]
+        for i, (name, fn) in enumerate(self.stages):
+            threads.append(threading.Thread(target=self._run_stage,
+                                            args=(fn, queues[i], queues[i + 1], self.stats[i + 1]),
+                                            daemon=True, name=f"pipeline-{name}"))
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            self._stopped.set()
+            # Unblock stages still waiting on an input queue
+            for q in queues[:-1]:
+                try:
+                    q.put_nowait(_DONE)
+                except queue.Full:
+                    pass
+
+    def summary(self):
+        return "; ".join(str(stats) for stats in self.stats)
@@ -0,0 +1,60 @@
+import asyncio
+import time
+import threading
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` calls per `period` seconds"""
+    def __init__(self, rate, period=1.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.rate,
+                    self._tokens + (now - self._updated) * self.rate / self.period
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.period / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Drain the bucket so every caller waits, e.g. after a Retry-After"""
+        with self._lock:
+            self._tokens = min(self._tokens, 0) - seconds * self.rate / self.period
+            self._updated = time.monotonic()
+
+class AsyncRateLimiter:
+    """asyncio counterpart of RateLimiter for coroutines sharing one event loop"""
+    def __init__(self, rate, period=1.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        # Created lazily so the lock binds to the running loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.rate,
+                    self._tokens + (now - self._updated) * self.rate / self.period
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
@@ -0,0 +1,186 @@
+import time
+import asyncio
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from core.config import (
+    TRELLO_API_KEY,
+    TRELLO_TOKEN,
+    TRELLO_API_URL,
+    TRELLO_TIMEOUT,
+    TRELLO_MAX_RETRIES,
+    TRELLO_POOL_SIZE,
+    TRELLO_RATE_LIMIT
+)
+from core.logger import configure_logger
+from core.rate_limit import RateLimiter, AsyncRateLimiter
+
+logger = configure_logger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class TrelloAPIError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+def _retry_post(method, status_code, idempotency_key):
+    # A 429 means nothing was created, but only a keyed request can safely be
+    # repeated: the caller can find its card if an earlier attempt got through
+    return method == 'POST' and status_code == 429 and idempotency_key is not None
+
+class TrelloClient:
+    """Keep-alive Trello REST client shared by bots, models and dashboard"""
+    def __init__(self, api_key=None, token=None, base_url=None, timeout=None,
+                 max_retries=None, backoff_factor=0.5, pool_size=None, rate_limit=None):
+        self.api_key = api_key or TRELLO_API_KEY
+        self.token = token or TRELLO_TOKEN
+        self.base_url = (base_url or TRELLO_API_URL).rstrip('/')
+        self.timeout = timeout or TRELLO_TIMEOUT
+        self.max_retries = TRELLO_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = backoff_factor
+        # Trello allows 100 requests per 10 seconds per token
+        self.limiter = RateLimiter(rate_limit or TRELLO_RATE_LIMIT, period=10)
+        self.session = self._build_session(self.max_retries, backoff_factor, pool_size or TRELLO_POOL_SIZE)
+
+    def _build_session(self, max_retries, backoff_factor, pool_size):
+        # POST is left out of allowed_methods so a retried create can't duplicate cards
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'PUT', 'DELETE']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def request(self, method, path, params=None, timeout=None, idempotency_key=None, **kwargs):
+        """Send an authenticated request and return the raw response
+
+        A POST is retried on 429 only when it carries an `idempotency_key`,
+        i.e. the caller can find the result of an earlier attempt.
+        """
+        query = {'key': self.api_key, 'token': self.token}
+        query.update(params or {})
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                response = self.session.request(
+                    method,
+                    f"{self.base_url}/{path.lstrip('/')}",
+                    params=query,
+                    timeout=timeout or self.timeout,
+                    **kwargs
+                )
+            except requests.exceptions.RequestException as e:
+                raise TrelloAPIError(f"Request to {path} failed: {str(e)}") from e
+            if not (_retry_post(method, response.status_code, idempotency_key)
+                    and attempt < self.max_retries):
+                break
+            delay = response.headers.get('Retry-After')
+            time.sleep(float(delay) if delay else self.backoff_factor * (2 ** attempt))
+
+        if response.status_code >= 400:
+            raise TrelloAPIError(f"API Error {response.status_code}: {response.text}",
+                                 status_code=response.status_code)
+        return response
+
+    def get(self, path, params=None, **kwargs):
+        return self.request('GET', path, params, **kwargs).json()
+
+    def post(self, path, params=None, idempotency_key=None, **kwargs):
+        return self.request('POST', path, params, idempotency_key=idempotency_key, **kwargs).json()
+
+    def put(self, path, params=None, **kwargs):
+        return self.request('PUT', path, params, **kwargs).json()
+
+    def close(self):
+        self.session.close()
+
+class AsyncTrelloClient:
+    """aiohttp-based Trello client for the asyncio bot runtime"""
+    def __init__(self, api_key=None, token=None, base_url=None, timeout=None,
+                 max_retries=None, backoff_factor=0.5, pool_size=None, rate_limit=None):
+        self.api_key = api_key or TRELLO_API_KEY
+        self.token = token or TRELLO_TOKEN
+        self.base_url = (base_url or TRELLO_API_URL).rstrip('/')
+        self.timeout = timeout or TRELLO_TIMEOUT
+        self.max_retries = TRELLO_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size or TRELLO_POOL_SIZE
+        self.limiter = AsyncRateLimiter(rate_limit or TRELLO_RATE_LIMIT, period=10)
+        self._session = None
+
+    def _get_session(self):
+        # aiohttp sessions must be created inside the running event loop
+        import aiohttp
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def request(self, method, path, params=None, idempotency_key=None):
+        """Send an authenticated request and return the decoded JSON body
+
+        Retries follow TrelloClient: a POST only on 429 and only with an `idempotency_key`.
+        """
+        import aiohttp
+        query = {'key': self.api_key, 'token': self.token}
+        query.update({k: str(v) for k, v in (params or {}).items()})
+        url = f"{self.base_url}/{path.lstrip('/')}"
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            try:
+                async with self._get_session().request(method, url, params=query) as response:
+                    retryable = (_retry_post(method, response.status, idempotency_key)
+                                 if method == 'POST' else response.status in RETRY_STATUSES)
+                    if retryable and attempt < self.max_retries:
+                        delay = response.headers.get('Retry-After')
+                        await asyncio.sleep(
+                            float(delay) if delay else self.backoff_factor * (2 ** attempt)
+                        )
+                        continue
+                    if response.status >= 400:
+                        raise TrelloAPIError(
+                            f"API Error {response.status}: {await response.text()}",
+                            status_code=response.status
+                        )
+                    return await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if method == 'POST' or attempt >= self.max_retries:
+                    raise TrelloAPIError(f"Request to {path} failed: {str(e)}") from e
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def get(self, path, params=None):
+        return await self.request('GET', path, params)
+
+    async def post(self, path, params=None, idempotency_key=None):
+        return await self.request('POST', path, params, idempotency_key=idempotency_key)
+
+    async def put(self, path, params=None):
+        return await self.request('PUT', path, params)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_trello_client():
+    """Return the process-wide client so every caller shares one connection pool"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = TrelloClient()
+        return _client
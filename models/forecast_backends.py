@@ -0,0 +1,120 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from core.logger import configure_logger
+
+logger = configure_logger(__name__)
+
+SEASON = 7
+Z_80 = 1.2816  # Upper bound of an 80% interval, Prophet's default interval_width
+
+def _daily(df):
+    """ds/y frame as a gap-free daily series; days without activity count as zero"""
+    series = df.assign(ds=pd.to_datetime(df['ds']).dt.normalize()).groupby('ds')['y'].sum()
+    return series.asfreq('D', fill_value=0).astype(float)
+
+def _future_dates(last, periods):
+    return pd.date_range(last + pd.Timedelta(days=1), periods=periods, freq='D')
+
+class HoltWintersBackend:
+    """Additive Holt-Winters with weekly seasonality
+
+    Smoothing constants come from a grid search; every candidate is run
+    through the recursion at once, so the fit is one pass over the series.
+    """
+    name = 'holt-winters'
+    GRID = np.linspace(0.05, 0.95, 7)
+
+    def fit(self, df):
+        series = _daily(df)
+        y = series.to_numpy()
+        n = len(y)
+        if n < SEASON:
+            raise ValueError(f"Holt-Winters needs at least {SEASON} days of history")
+
+        alpha, beta, gamma = (g.ravel() for g in np.meshgrid(self.GRID, self.GRID, self.GRID, indexing='ij'))
+        level0 = y[:SEASON].mean()
+        trend0 = (y[SEASON:2 * SEASON].mean() - level0) / SEASON if n >= 2 * SEASON else 0.0
+        level = np.full(alpha.shape, level0)
+        trend = np.full(alpha.shape, trend0)
+        season = np.tile(y[:SEASON] - level0, (len(alpha), 1))
+        errors = np.empty((len(alpha), n))
+        for t in range(n):
+            s = season[:, t % SEASON]
+            errors[:, t] = y[t] - (level + trend + s)
+            new_level = alpha * (y[t] - s) + (1 - alpha) * (level + trend)
+            trend = beta * (new_level - level) + (1 - beta) * trend
+            season[:, t % SEASON] = gamma * (y[t] - new_level) + (1 - gamma) * s
+            level = new_level
+
+        # The first week only initializes the seasonal terms
+        scored = errors[:, SEASON:] if n > SEASON else errors
+        best = int(np.argmin((scored ** 2).sum(axis=1)))
+        self.alpha, self.beta, self.gamma = alpha[best], beta[best], gamma[best]
+        self.level, self.trend, self.season = level[best], trend[best], season[best].copy()
+        self.sigma = float(np.sqrt(np.mean(scored[best] ** 2)))
+        self.n = n
+        self.last_ds = series.index[-1]
+        return self
+
+    def predict(self, periods):
+        h = np.arange(1, periods + 1)
+        yhat = self.level + h * self.trend + self.season[(self.n + h - 1) % SEASON]
+        # ETS(A,A,A) forecast variance: sigma^2 * (1 + sum of c_j^2 for j < h)
+        j = np.arange(1, periods)
+        c = self.alpha * (1 + self.beta * j) + self.gamma * (j % SEASON == 0)
+        spread = self.sigma * np.sqrt(1 + np.concatenate(([0.0], np.cumsum(c ** 2))))
+        return pd.DataFrame({
+            'ds': _future_dates(self.last_ds, periods),
+            'yhat': yhat,
+            'yhat_upper': yhat + Z_80 * spread
+        })
+
+class RobustTrendBackend:
+    """Theil-Sen linear trend plus weekday medians, with a MAD-based upper bound"""
+    name = 'robust-trend'
+
+    def fit(self, df):
+        series = _daily(df)
+        y = series.to_numpy()
+        n = len(y)
+        if n < 2:
+            raise ValueError("Robust trend needs at least 2 days of history")
+
+        t = np.arange(n)
+        i, j = np.triu_indices(n, k=1)
+        self.slope = float(np.median((y[j] - y[i]) / (j - i)))
+        self.intercept = float(np.median(y - self.slope * t))
+        residuals = y - (self.intercept + self.slope * t)
+
+        weekdays = series.index.dayofweek.to_numpy()
+        self.weekday = np.array([
+            np.median(residuals[weekdays == day]) if np.any(weekdays == day) else 0.0
+            for day in range(SEASON)
+        ])
+        residuals = residuals - self.weekday[weekdays]
+        self.scale = 1.4826 * float(np.median(np.abs(residuals - np.median(residuals))))
+        self.n = n
+        self.last_ds = series.index[-1]
+        return self
+
+    def predict(self, periods):
+        ds = _future_dates(self.last_ds, periods)
+        yhat = self.intercept + self.slope * np.arange(self.n, self.n + periods) + self.weekday[ds.dayofweek]
+        return pd.DataFrame({'ds': ds, 'yhat': yhat, 'yhat_upper': yhat + Z_80 * self.scale})
+
+BACKENDS = {
+    HoltWintersBackend.name: HoltWintersBackend,
+    RobustTrendBackend.name: RobustTrendBackend
+}
+
+def get_forecast_backend(backend):
+    """Backend instance by name; objects with fit(df)/predict(periods) pass through"""
+    if not isinstance(backend, str):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown forecast backend {backend!r}; expected prophet or one of {sorted(BACKENDS)}")
+    return BACKENDS[backend]()
@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import glob
+import json
+import hashlib
+import pandas as pd
+from core.config import MODEL_STORE_DIR, MODEL_STORE_MAX_MODELS
+from core.logger import configure_logger
+
+logger = configure_logger(__name__)
+
+def fingerprint(df, params):
+    """Stable hash of a training frame's ds/y columns and the model hyperparameters"""
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+    frame = df[['ds', 'y']].reset_index(drop=True)
+    digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()[:32]
+
+class ModelStore:
+    """Directory of serialized models named by their training fingerprint"""
+    def __init__(self, directory=None, max_models=None):
+        self.directory = directory or MODEL_STORE_DIR
+        self.max_models = MODEL_STORE_MAX_MODELS if max_models is None else max_models
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Serialized model for `key`, or None when it was never stored"""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                payload = f.read()
+            os.utime(path)  # Mark as recently used for eviction
+            return payload
+        except OSError:
+            return None
+
+    def _latest_path(self, name):
+        return os.path.join(self.directory, f"{name}.latest")
+
+    def _write(self, path, text):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def put(self, key, payload):
+        try:
+            self._write(self._path(key), payload)
+            self.evict()
+        except OSError as e:
+            logger.warning(f"Could not persist model {key}: {str(e)}")
+
+    def latest(self, name):
+        """(metadata, serialized model) last recorded for series `name`, or None"""
+        try:
+            with open(self._latest_path(name)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        payload = self.get(meta.get('key', ''))
+        return (meta, payload) if payload is not None else None
+
+    def set_latest(self, name, key, **meta):
+        """Point series `name` at model `key`, with metadata such as fit quality"""
+        try:
+            self._write(self._latest_path(name), json.dumps({'key': key, **meta}))
+        except OSError as e:
+            logger.warning(f"Could not record latest model for {name}: {str(e)}")
+
+    def evict(self):
+        """Drop least recently used models beyond `max_models`"""
+        used = []
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                used.append((os.path.getmtime(path), path))
+            except OSError:
+                pass  # Removed by a concurrent forecast worker
+        for _, path in sorted(used, reverse=True)[self.max_models:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -2,71 +2,99 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from collections import defaultdict
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 import pandas as pd
-from prophet import Prophet
 from datetime import datetime, timedelta
-import requests
-from core.config import TRELLO_BOARD_ID, TRELLO_API_KEY, TRELLO_TOKEN, RISK_THRESHOLD
+from core.config import (
+    RISK_THRESHOLD,
+    TRELLO_BOARD_ID,
+    FORECAST_BOARD_IDS,
+    FORECAST_WORKERS,
+    FORECAST_BACKEND,
+    PROPHET_WARM_START,
+    PROPHET_WARM_START_TOLERANCE,
+    PROPHET_MAX_WARM_STARTS
+)
 from core.logger import configure_logger
+from core.board_snapshot import get_board_snapshot
+from core.card_frame import card_frame
+from models.model_store import ModelStore, fingerprint
+from models.forecast_backends import get_forecast_backend
 
 logger = configure_logger(__name__)
 
+PROPHET_PARAMS = {
+    'changepoint_range': 0.8,
+    'n_changepoints': 15,
+    'yearly_seasonality': False,
+    'weekly_seasonality': True,
+    'daily_seasonality': False
+}
+
+def warm_start_params(model):
+    """Stan init values (k, m, sigma_obs, delta, beta) from a fitted model"""
+    return {
+        'k': float(model.params['k'][0][0]),
+        'm': float(model.params['m'][0][0]),
+        'sigma_obs': float(model.params['sigma_obs'][0][0]),
+        'delta': model.params['delta'][0].tolist(),
+        'beta': model.params['beta'][0].tolist()
+    }
+
+def fit_rmse(model, df):
+    """In-sample RMSE of the point forecast, skipping uncertainty sampling"""
+    samples = model.uncertainty_samples
+    model.uncertainty_samples = 0
+    try:
+        yhat = model.predict(df[['ds']])['yhat'].values
+    finally:
+        model.uncertainty_samples = samples
+    return float(np.sqrt(np.mean((yhat - df['y'].values) ** 2)))
+
+def daily_task_series(cards, end_date=None, days=60):
+    """Checklist items per day of last activity over the `days` before `end_date`
+
+    `cards` is a card frame (core.card_frame) or a list of compact card records.
+    """
+    frame = cards if isinstance(cards, pd.DataFrame) else card_frame(cards)
+    end_date = pd.Timestamp(end_date or datetime.now().date())
+    start_date = end_date - timedelta(days=days)
+
+    day = frame['dateLastActivity'].dt.normalize()
+    active = (frame['checklistCount'] > 0) & day.between(start_date, end_date)
+    daily = frame.loc[active, 'checkItemCount'].groupby(day[active]).sum()
+    return pd.DataFrame({'ds': daily.index, 'y': daily.to_numpy()}).sort_values('ds')
+
 class RiskPredictor:
-    def __init__(self):
-        self.model = Prophet(
-            changepoint_range=0.8,
-            n_changepoints=15,
-            yearly_seasonality=False,
-            weekly_seasonality=True,
-            daily_seasonality=False
-        )
+    def __init__(self, board_id=None, model_store=None, backend=None):
+        """`backend` is 'prophet', a name from forecast_backends.BACKENDS or
+        an object with fit(df) and predict(periods)"""
+        self.board_id = board_id or TRELLO_BOARD_ID
+        backend = backend or FORECAST_BACKEND
+        self.backend_name = backend if isinstance(backend, str) else getattr(backend, 'name', type(backend).__name__)
+        # Prophet is imported on first fit, so the lightweight backends never load it
+        self.model = None if backend == 'prophet' else get_forecast_backend(backend)
+        self.model_store = model_store or ModelStore()
+        self.series_name = f"risk-{self.board_id or 'default'}"
+        self.data_source = None
         self._trained = False
-        logger.info("Prophet model initialized")
+        logger.info(f"Risk predictor initialized ({self.backend_name} backend)")
 
     def _fetch_trello_data(self):
         """Fetch and process Trello data with enhanced error handling"""
         try:
-            url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}/cards"
-            params = {
-                "key": TRELLO_API_KEY,
-                "token": TRELLO_TOKEN,
-                "checklists": "all",
-                "fields": "dateLastActivity,checklists"
-            }
+            cards = get_board_snapshot(self.board_id).frame()
             
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            logger.info(f"Found {len(response.json())} cards")
-            
-            end_date = datetime.now().date()
-            start_date = end_date - timedelta(days=60)
-            daily_tasks = defaultdict(int)
-            
-            for card in response.json():
-                try:
-                    if not card.get('dateLastActivity') or not card.get('checklists'):
-                        continue
-                        
-                    card_date = pd.to_datetime(card['dateLastActivity']).date()
-                    tasks = sum(len(cl['checkItems']) for cl in card['checklists'])
-                    
-                    if start_date <= card_date <= end_date:
-                        daily_tasks[card_date] += tasks
-                except Exception as e:
-                    logger.warning(f"Skipping card {card.get('id')}: {str(e)}")
-            
-            df = pd.DataFrame([
-                {"ds": pd.Timestamp(date), "y": count}
-                for date, count in daily_tasks.items()
-            ]).sort_values('ds')
+            logger.info(f"Found {len(cards)} cards")
+            df = daily_task_series(cards)
             
             if df.empty or len(df) < 7:
                 logger.warning("Using enhanced mock data")
                 return self._generate_fallback_data()
-                
+
+            self.data_source = 'trello'
             return df
             
         except Exception as e:
@@ -75,7 +103,8 @@ class RiskPredictor:
 
     def _generate_fallback_data(self):
         """Generate realistic sprint simulation data"""
-        dates = pd.date_range(end=datetime.now(), periods=60, freq='D')
+        self.data_source = 'fallback'
+        dates = pd.date_range(end=datetime.now(), periods=60, freq='D', normalize=True)
         np.random.seed(42)  # For reproducible results
         base_pattern = 8 * np.sin(np.linspace(0, 4*np.pi, 60))  
         noise = np.random.normal(0, 2, 60)
@@ -84,57 +113,165 @@ class RiskPredictor:
             'y': np.clip(base_pattern + noise + 12, 0, None)  
         })
 
-    def train(self):
+    def _warm_fit(self, df, previous):
+        """Fit initialized from the previous model; None when a cold fit should be used instead
+
+        The in-sample RMSE check is a drift heuristic, not a convergence test:
+        it only rejects warm fits noticeably worse than the last cold fit's
+        RMSE, and PROPHET_MAX_WARM_STARTS bounds how long that baseline is trusted.
+        """
+        meta, payload = previous
+        baseline = meta.get('baseline_rmse')
+        warm_starts = meta.get('warm_starts', 0)
+        if baseline is None or warm_starts >= PROPHET_MAX_WARM_STARTS:
+            return None
+        from prophet import Prophet
+        from prophet.serialize import model_from_json
+        try:
+            started = time.perf_counter()
+            model = Prophet(**PROPHET_PARAMS)
+            model.fit(df, init=warm_start_params(model_from_json(payload)))
+            rmse = fit_rmse(model, df)
+        except Exception as e:
+            logger.warning(f"Warm start failed, refitting cold: {str(e)}")
+            return None
+        if rmse > baseline * (1 + PROPHET_WARM_START_TOLERANCE):
+            logger.warning(f"Warm start degraded fit (RMSE {rmse:.2f} vs {baseline:.2f}), refitting cold")
+            return None
+        self.model = model
+        logger.info(f"Warm-started fit in {time.perf_counter() - started:.2f}s (RMSE {rmse:.2f})")
+        return {'rmse': rmse, 'baseline_rmse': baseline, 'warm_starts': warm_starts + 1}
+
+    def _cold_fit(self, df):
+        from prophet import Prophet
+        self.model = Prophet(**PROPHET_PARAMS)
+        self.model.fit(df)
+        rmse = fit_rmse(self.model, df)
+        return {'rmse': rmse, 'baseline_rmse': rmse, 'warm_starts': 0}
+
+    def _train_prophet(self, df, warm_start):
+        import prophet
+        from prophet.serialize import model_to_json, model_from_json
+
+        # Fitted models are reused for as long as the training data is unchanged
+        key = fingerprint(df, {**PROPHET_PARAMS, 'prophet': prophet.__version__})
+        stored = self.model_store.get(key)
+        if stored is not None:
+            try:
+                self.model = model_from_json(stored)
+                logger.info(f"Loaded stored model {key}")
+                return
+            except Exception as e:
+                logger.warning(f"Stored model {key} unreadable, refitting: {str(e)}")
+
+        previous = self.model_store.latest(self.series_name) if warm_start else None
+        fit_meta = (previous and self._warm_fit(df, previous)) or self._cold_fit(df)
+        self.model_store.put(key, model_to_json(self.model))
+        self.model_store.set_latest(self.series_name, key, **fit_meta)
+
+    def train(self, warm_start=None):
+        warm_start = PROPHET_WARM_START if warm_start is None else warm_start
         try:
             df = self._fetch_trello_data()
             
             if len(df) < 7:
                 raise ValueError("Insufficient historical data")
-                
-            self.model.fit(df)
+
+            if self.backend_name == 'prophet':
+                self._train_prophet(df, warm_start)
+            else:
+                self.model.fit(df)
             self._trained = True
-            logger.info(f"Model trained with {len(df)} data points")
+            logger.info(f"Model trained with {len(df)} data points ({self.backend_name})")
             
         except Exception as e:
             logger.error(f"Training failed: {str(e)}")
             self._trained = False
 
+    def _forecast(self, days):
+        """ds/yhat/yhat_upper for the `days` after the training data"""
+        if self.backend_name == 'prophet':
+            future = self.model.make_future_dataframe(periods=days)
+            return self.model.predict(future)[['ds', 'yhat', 'yhat_upper']].tail(days).reset_index(drop=True)
+        return self.model.predict(days)
+
     def predict_risk(self, days=7):
         if not self._trained:
             self.train()
             
         try:
-            future = self.model.make_future_dataframe(periods=days)
-            forecast = self.model.predict(future)
-            
+            forecast = self._forecast(days)
             forecast['ds'] = pd.to_datetime(forecast['ds']).dt.tz_localize(None)
             forecast['yhat'] = forecast['yhat'].clip(0, None).round(1)
             forecast['yhat_upper'] = forecast['yhat_upper'].clip(0, None).round(1)
             forecast['risk'] = forecast['yhat_upper'] > RISK_THRESHOLD
+            excess = (forecast['yhat_upper'] - RISK_THRESHOLD).astype(int).astype(str)
+            forecast['recommendation'] = ("Reduce scope by " + excess + " tasks").where(forecast['risk'], "")
 
-            risk_days = forecast[forecast['risk']]
-            if not risk_days.empty:
-                logger.warning(f"Risk predicted on {len(risk_days)} days")
-                forecast['recommendation'] = forecast.apply(
-                    lambda row: f"Reduce scope by {int(row['yhat_upper'] - RISK_THRESHOLD)} tasks" 
-                    if row['risk'] else "", axis=1)
+            if forecast['risk'].any():
+                logger.warning(f"Risk predicted on {int(forecast['risk'].sum())} days")
             
-            return forecast[['ds', 'yhat', 'yhat_upper', 'risk', 'recommendation']].tail(days)
+            return forecast[['ds', 'yhat', 'yhat_upper', 'risk', 'recommendation']]
             
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
             return pd.DataFrame()
 
+def _forecast_board(board_id, days, backend=None):
+    """Process-pool worker: fetch, fit and forecast a single board"""
+    started = time.perf_counter()
+    predictor = RiskPredictor(board_id, backend=backend)
+    forecast = predictor.predict_risk(days=days)
+    if forecast.empty:
+        raise RuntimeError("Empty forecast (see worker log for the cause)")
+    return forecast, predictor.data_source, time.perf_counter() - started
+
+def forecast_boards(board_ids=None, days=7, workers=None, db_name='sprints.db', backend=None):
+    """Forecast many boards in parallel, saving each board's predictions as it finishes
+
+    Returns a per-board report with timing, data source and any error. A
+    board whose data could not be fetched is forecast from simulated data;
+    it is reported as 'degraded' and its stored predictions are left as they are.
+    """
+    board_ids = list(dict.fromkeys(board_ids or FORECAST_BOARD_IDS or [TRELLO_BOARD_ID]))
+    from core.database import Database
+    db = Database(db_name)
+    report = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(workers or FORECAST_WORKERS, len(board_ids) or 1)) as executor:
+        futures = {executor.submit(_forecast_board, board_id, days, backend): board_id for board_id in board_ids}
+        for future in as_completed(futures):
+            board_id = futures[future]
+            try:
+                forecast, data_source, seconds = future.result()
+                report[board_id] = {
+                    'status': 'ok',
+                    'seconds': round(seconds, 2),
+                    'data_source': data_source,
+                    'risk_days': int(forecast['risk'].sum())
+                }
+                if data_source == 'fallback':
+                    logger.warning(f"Board {board_id} forecast from simulated data, not saved")
+                    report[board_id]['status'] = 'degraded'
+                else:
+                    db.save_prediction(forecast, board_id=board_id)
+            except Exception as e:
+                logger.error(f"Forecast for board {board_id} failed: {str(e)}")
+                report[board_id] = {'status': 'failed', 'error': str(e)}
+    logger.info(f"Forecast {len(board_ids)} boards in {time.perf_counter() - started:.1f}s")
+    return report
+
 if __name__ == "__main__":
     try:
-        predictor = RiskPredictor()
-        forecast = predictor.predict_risk()
-        
-        # Save to database
-        from core.database import Database
-        db = Database()
-        db.save_prediction(forecast[['ds', 'yhat', 'yhat_upper', 'risk', 'recommendation']])
-        
+        report = forecast_boards()
+        for board_id, result in report.items():
+            print(f"{board_id}: {result}")
+        degraded = [board_id for board_id, result in report.items() if result['status'] == 'degraded']
+        if degraded:
+            # Simulated forecasts are not saved; a Trello outage alone should not fail the run
+            logger.warning(f"Boards forecast from fallback data, predictions not updated: {', '.join(degraded)}")
+        if not report or any(result['status'] == 'failed' for result in report.values()):
+            exit(1)
         print("SUCCESS! Data saved to database")
     except Exception as e:
         logger.error(f"Critical failure: {str(e)}")
@@ -0,0 +1,192 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from core.config import (
+    SENTIMENT_MODEL,
+    SENTIMENT_BACKEND,
+    SENTIMENT_THREADS,
+    SENTIMENT_ONNX_DIR,
+    SENTIMENT_TOKEN_BUDGET,
+    SENTIMENT_MAX_BATCH
+)
+from core.logger import configure_logger
+
+logger = configure_logger(__name__)
+
+BACKENDS = ('pytorch', 'pytorch-int8', 'onnx', 'onnx-int8')
+MAX_LENGTH = 128
+
+def _pipeline(model, tokenizer=None, device=None):
+    import torch
+    from transformers import pipeline
+    if device is None:
+        device = 0 if torch.cuda.is_available() else -1
+    logger.info(f"Device set to use {'cuda' if device == 0 else 'cpu'}")
+    return pipeline(
+        "sentiment-analysis",
+        model=model,
+        tokenizer=tokenizer,
+        device=device,
+        top_k=None,
+        max_length=MAX_LENGTH,
+        truncation=True,
+        batch_size=8
+    )
+
+def _quantized_pipeline(model_name):
+    """Pipeline over a dynamically int8-quantized copy of the model (CPU only)"""
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return _pipeline(model, AutoTokenizer.from_pretrained(model_name), device=-1)
+
+def _onnx_path(model_name, quantized):
+    slug = model_name.replace('/', '--')
+    return os.path.join(SENTIMENT_ONNX_DIR, f"{slug}{'.int8' if quantized else ''}.onnx")
+
+def _export_onnx(model_name, path):
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    logger.info(f"Exporting {model_name} to {path}")
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    model.config.return_dict = False
+    sample = AutoTokenizer.from_pretrained(model_name)(["export sample"], return_tensors='pt')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample['input_ids'], sample['attention_mask']),
+            path,
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch'}
+            },
+            opset_version=14
+        )
+
+def _ensure_onnx(model_name, quantized):
+    """Path of the exported (and optionally int8-quantized) model, exporting on first use"""
+    path = _onnx_path(model_name, quantized)
+    if os.path.exists(path):
+        return path
+    if not quantized:
+        _export_onnx(model_name, path)
+        return path
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    quantize_dynamic(_ensure_onnx(model_name, False), path, weight_type=QuantType.QInt8)
+    return path
+
+class OnnxSentimentClassifier:
+    """ONNX Runtime session returning the same label/score lists as the pipeline"""
+    def __init__(self, model_name, quantized=False, threads=None):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.labels = AutoConfig.from_pretrained(model_name).id2label
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads or SENTIMENT_THREADS
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            _ensure_onnx(model_name, quantized), options, providers=['CPUExecutionProvider']
+        )
+
+    def __call__(self, texts, batch_size=None):
+        """Score `texts` in one forward pass; batch_size is accepted for pipeline parity"""
+        if isinstance(texts, str):
+            texts = [texts]
+        encoded = self.tokenizer(list(texts), padding=True, truncation=True,
+                                 max_length=MAX_LENGTH, return_tensors='np')
+        logits = self.session.run(['logits'], {
+            'input_ids': encoded['input_ids'].astype(np.int64),
+            'attention_mask': encoded['attention_mask'].astype(np.int64)
+        })[0]
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = exp / exp.sum(axis=1, keepdims=True)
+        return [
+            [{'label': self.labels[i], 'score': float(row[i])} for i in np.argsort(-row)]
+            for row in probs
+        ]
+
+def load_sentiment_analyzer(backend=None, model_name=None):
+    """Build the configured classifier; every backend is called as analyzer(list_of_texts)"""
+    backend = backend or SENTIMENT_BACKEND
+    model_name = model_name or SENTIMENT_MODEL
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend {backend!r}, expected one of {BACKENDS}")
+
+    logger.info(f"Loading {model_name} with {backend} backend")
+    if backend.startswith('onnx'):
+        return OnnxSentimentClassifier(model_name, quantized=backend == 'onnx-int8')
+
+    import torch
+    torch.set_num_threads(SENTIMENT_THREADS)
+    if backend == 'pytorch-int8':
+        return _quantized_pipeline(model_name)
+    return _pipeline(model_name)
+
+def plan_batches(lengths, token_budget=None, max_batch=None):
+    """Group indices by token length so each batch stays within a padded-token budget
+
+    Indices are visited shortest first, so a batch costs its size times the
+    length of its last (longest) member and short messages are never padded
+    to a long one.
+    """
+    token_budget = token_budget or SENTIMENT_TOKEN_BUDGET
+    max_batch = max_batch or SENTIMENT_MAX_BATCH
+    batches, batch = [], []
+    for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+        if batch and (len(batch) >= max_batch or (len(batch) + 1) * lengths[index] > token_budget):
+            batches.append(batch)
+            batch = []
+        batch.append(index)
+    if batch:
+        batches.append(batch)
+    return batches
+
+def classify_batched(analyzer, texts, token_budget=None, max_batch=None):
+    """Run texts through `analyzer` in length-bucketed batches, in the original order
+
+    A failed batch is retried in halves down to single messages; a message
+    that still fails gets an empty result. Analyzers without a tokenizer
+    (the worker client) receive one request and batch on their side.
+    """
+    texts = list(texts)
+    if not texts:
+        return []  # Tokenizers reject an empty batch
+    tokenizer = getattr(analyzer, 'tokenizer', None)
+    if tokenizer is None:
+        batches = [list(range(len(texts)))] if texts else []
+    else:
+        lengths = [len(ids) for ids in tokenizer(
+            texts, truncation=True, max_length=MAX_LENGTH)['input_ids']]
+        batches = plan_batches(lengths, token_budget, max_batch)
+
+    results = [[] for _ in texts]
+    pending = batches[::-1]
+    while pending:
+        batch = pending.pop()
+        batch_texts = [texts[i] for i in batch]
+        try:
+            if tokenizer is None:
+                scores = analyzer(batch_texts)
+            else:
+                scores = analyzer(batch_texts, batch_size=len(batch_texts))
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Sentiment inference failed for one message: {str(e)}")
+                continue
+            logger.warning(f"Batch of {len(batch)} failed, retrying in halves: {str(e)}")
+            middle = len(batch) // 2
+            pending.extend([batch[middle:], batch[:middle]])
+            continue
+        for index, score in zip(batch, scores):
+            results[index] = score
+    return results
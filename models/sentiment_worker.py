@@ -0,0 +1,214 @@
+"""Long-lived sentiment inference worker shared by the dashboard, bots and reports
+
+Run with: python models/sentiment_worker.py
+
+The model is loaded once and served over a Unix socket. Requests from
+all connected callers are merged into shared model batches.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import queue
+import signal
+import socket
+import time
+import struct
+import threading
+import socketserver
+from concurrent.futures import Future
+from core.config import (
+    SENTIMENT_BACKEND,
+    SENTIMENT_WORKER_SOCKET,
+    SENTIMENT_WORKER_MAX_BATCH,
+    SENTIMENT_WORKER_MAX_WAIT_MS
+)
+from core.logger import configure_logger
+from models.sentiment_backends import load_sentiment_analyzer, classify_batched
+
+logger = configure_logger(__name__)
+
+_HEADER = struct.Struct('>I')
+
+def send_message(sock, payload):
+    body = json.dumps(payload).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+def recv_message(sock):
+    """Read one length-prefixed JSON frame; None on a clean disconnect"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    body = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if body is None:
+        raise ConnectionError("Connection closed mid-message")
+    return json.loads(body)
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+class SentimentBatcher(threading.Thread):
+    """Single inference thread coalescing queued requests into shared batches"""
+    def __init__(self, analyzer, max_batch=None, max_wait_ms=None):
+        super().__init__(daemon=True, name="sentiment-batcher")
+        self.analyzer = analyzer
+        self.max_batch = max_batch or SENTIMENT_WORKER_MAX_BATCH
+        self.max_wait = (SENTIMENT_WORKER_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        self._requests = queue.Queue()
+
+    def submit(self, texts):
+        future = Future()
+        self._requests.put((texts, future))
+        return future
+
+    def run(self):
+        while True:
+            pending = [self._requests.get()]
+            size = len(pending[0][0])
+            # Give concurrent callers a moment to join this batch
+            while size < self.max_batch:
+                try:
+                    request = self._requests.get(timeout=self.max_wait)
+                except queue.Empty:
+                    break
+                pending.append(request)
+                size += len(request[0])
+            self._run_batch(pending)
+
+    def _run_batch(self, pending):
+        texts = [text for request_texts, _ in pending for text in request_texts]
+        try:
+            results = classify_batched(self.analyzer, texts)
+        except Exception as e:
+            logger.error(f"Sentiment batch of {len(texts)} failed: {str(e)}")
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        offset = 0
+        for request_texts, future in pending:
+            future.set_result(results[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (ConnectionError, ValueError) as e:
+                logger.warning(f"Dropping sentiment client: {str(e)}")
+                return
+            if message is None:
+                return
+            if message.get('ping'):
+                send_message(self.request, {'ok': True})
+                continue
+            try:
+                results = self.server.batcher.submit(message.get('texts', [])).result()
+                send_message(self.request, {'results': results})
+            except Exception as e:
+                send_message(self.request, {'error': str(e)})
+
+class SentimentWorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, batcher):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # Stale socket from a previous run
+        os.makedirs(os.path.dirname(socket_path) or '.', exist_ok=True)
+        self.batcher = batcher
+        super().__init__(socket_path, _Handler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+class SentimentClient:
+    """Callable stand-in for a local analyzer that forwards to the worker
+
+    Each request opens its own connection, so a restarted worker is picked
+    up on the next call. When the worker cannot be reached, `fallback` (a
+    loader returning a local analyzer) is called once and used instead; the
+    worker is tried again every `retry_interval` seconds. Without a fallback
+    the connection error is raised.
+    """
+    def __init__(self, socket_path=None, timeout=120, fallback=None, retry_interval=60):
+        self.socket_path = socket_path or SENTIMENT_WORKER_SOCKET
+        self.timeout = timeout
+        self.fallback = fallback
+        self.retry_interval = retry_interval
+        self._local_analyzer = None
+        self._worker_down_since = None
+        self._lock = threading.Lock()
+
+    def _request(self, payload):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            send_message(sock, payload)
+            response = recv_message(sock)
+        if response is None:
+            raise ConnectionError("Sentiment worker closed the connection")
+        if 'error' in response:
+            raise RuntimeError(f"Sentiment worker error: {response['error']}")
+        return response
+
+    def ping(self):
+        try:
+            return self._request({'ping': True}).get('ok', False)
+        except OSError:
+            return False
+
+    def __call__(self, texts):
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = list(texts)
+        down_since = self._worker_down_since
+        if down_since is None or time.monotonic() - down_since >= self.retry_interval:
+            try:
+                results = self._request({'texts': texts})['results']
+                self._worker_down_since = None
+                return results
+            except OSError as e:
+                if self.fallback is None:
+                    raise
+                logger.warning(f"Sentiment worker unavailable, using local model: {str(e)}")
+                self._worker_down_since = time.monotonic()
+        return self._local()(texts)
+
+    def _local(self):
+        with self._lock:
+            if self._local_analyzer is None:
+                self._local_analyzer = self.fallback()
+            return self._local_analyzer
+
+def connect_sentiment_worker(socket_path=None, fallback=None):
+    """Client for a running worker, or None so callers can load the model in-process"""
+    client = SentimentClient(socket_path, fallback=fallback)
+    if os.path.exists(client.socket_path) and client.ping():
+        return client
+    return None
+
+def main():
+    batcher = SentimentBatcher(load_sentiment_analyzer(SENTIMENT_BACKEND))
+    batcher.start()
+    server = SentimentWorkerServer(SENTIMENT_WORKER_SOCKET, batcher)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    logger.info(f"Sentiment worker listening on {SENTIMENT_WORKER_SOCKET}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,11 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import uuid
-import requests
-from core.config import TRELLO_API_KEY, TRELLO_BOARD_ID, TRELLO_TOKEN
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor
 from core.logger import configure_logger
+from core.board_snapshot import get_board_snapshot
 
 logger = configure_logger(__name__)
 
@@ -46,26 +44,13 @@ class Database:
     def get_tasks(self):
         """Retrieve real tasks from Trello"""
         try:
-            url = f"https://api.trello.com/1/boards/{TRELLO_BOARD_ID}/cards"
-            params = {
-                "key": TRELLO_API_KEY,
-                "token": TRELLO_TOKEN,
-                "fields": "name,due,checklists",
-                "checklists": "all"
-            }
-            
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            cards = response.json()
-            tasks = pd.DataFrame([{
-                'id': card['id'],
-                'title': card['name'],
-                'due_date': card.get('due'),
-                'checklists': sum(len(cl['checkItems']) + sum(1 for item in cl['checkItems'] if item['state'] == 'complete')
-                for cl in card.get('checklists', [])
-            )
-            } for card in cards])
+            cards = get_board_snapshot().frame()
+            tasks = pd.DataFrame({
+                'id': cards['id'],
+                'title': cards['name'],
+                'due_date': cards['due'],
+                'checklists': cards['checkItemCount'] + cards['completedCount']
+            })
             
             logger.debug(f"Fetched {len(tasks)} tasks from Trello")
             return tasks
@@ -77,9 +62,17 @@ class Database:
 class TaskPrioritizer:
     def __init__(self):
         self.db = Database()
-        self.model = RandomForestRegressor(n_estimators=100, max_depth=5, min_samples_split=5, random_state=42)
+        self._model = None
         self.features = ['checklists', 'days_until_due']
         
+    @property
+    def model(self):
+        # sklearn is imported on first training, not when the dashboard imports this module
+        if self._model is None:
+            from sklearn.ensemble import RandomForestRegressor
+            self._model = RandomForestRegressor(n_estimators=100, max_depth=5, min_samples_split=5, random_state=42)
+        return self._model
+
     def _generate_features(self, tasks):
         """Create features from task data with NaN handling"""
         tasks = tasks.copy()
@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+class StandInBoard(BaseHTTPRequestHandler):
+    """Local Trello stand-in serving one board's cards and actions feed
+
+    Ids are compared as strings, like Trello's time-ordered ObjectIds: cards
+    and actions are returned newest first and honour `limit`, `before` and
+    (for actions) `since`. Every request's path and query is recorded.
+    """
+    protocol_version = "HTTP/1.1"
+    cards = {}
+    actions = []  # Newest first
+    requests = []
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = url.path.strip('/').split('/')[1:]  # Drop the API version
+        StandInBoard.requests.append((url.path, params))
+
+        if parts[:1] == ['cards'] and len(parts) == 2:
+            card = StandInBoard.cards.get(parts[1])
+            return self._send(404, "card not found") if card is None else self._send(200, card)
+        if parts[:1] == ['boards'] and parts[2:] == ['cards']:
+            items = sorted(StandInBoard.cards.values(), key=lambda card: card['id'], reverse=True)
+        elif parts[:1] == ['boards'] and parts[2:] == ['actions']:
+            items = [a for a in StandInBoard.actions if a['id'] > params.get('since', '')]
+        else:
+            return self._send(404, "unknown route")
+        if 'before' in params:
+            items = [item for item in items if item['id'] < params['before']]
+        self._send(200, items[:int(params.get('limit', 1000))])
+
+    def _send(self, status, payload):
+        body = (json.dumps(payload) if status < 400 else payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json' if status < 400 else 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def make_card(card_id, name=None, board_id="b1", items=()):
+    """Full-shape Trello card with one checklist holding `items` (states)"""
+    checklists = [{
+        'id': f"{card_id}-cl", 'name': "Tasks", 'pos': 1,
+        'checkItems': [{'id': f"{card_id}-i{n}", 'name': f"Item {n}", 'state': state, 'pos': n}
+                       for n, state in enumerate(items)]
+    }] if items else []
+    return {
+        'id': card_id, 'name': name or f"Card {card_id}", 'desc': "", 'due': None,
+        'dateLastActivity': "2024-03-01T10:00:00.000Z", 'closed': False,
+        'idList': "list-1", 'idBoard': board_id, 'labels': [], 'checklists': checklists
+    }
+
+@pytest.fixture
+def board_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInBoard)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StandInBoard.cards = {}
+    StandInBoard.actions = []
+    StandInBoard.requests = []
+    yield f"http://127.0.0.1:{server.server_port}/1"
+    server.shutdown()
@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import pandas as pd
+import bots.trello_integration as trello_integration
+from bots.trello_integration import select_stale_cards, archive_old_cards
+from core.rate_limit import RateLimiter
+from core.trello_client import TrelloAPIError
+
+def iso(days_ago, millis=True):
+    stamp = pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=days_ago)
+    return stamp.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z' if millis else stamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+STALE_CARDS = [
+    {'id': 'old-ms', 'dateLastActivity': iso(30)},
+    {'id': 'old-s', 'dateLastActivity': iso(30, millis=False)},
+    {'id': 'fresh-ms', 'dateLastActivity': iso(1)},
+    {'id': 'fresh-s', 'dateLastActivity': iso(1, millis=False)},
+    {'id': 'no-activity', 'dateLastActivity': None},
+    {'id': 'no-field'}
+]
+
+def test_select_stale_cards_parses_both_iso_forms():
+    assert select_stale_cards(STALE_CARDS, days=14) == ['old-ms', 'old-s']
+    assert select_stale_cards([], days=14) == []
+
+class FakeTrello:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.archived = []
+
+    def put(self, path, params=None):
+        card_id = path.split('/')[1]
+        if card_id in self.failing:
+            raise TrelloAPIError("API Error 500", status_code=500)
+        self.archived.append((card_id, params['idList']))
+        return {'id': card_id}
+
+class FakeIndex:
+    def __init__(self):
+        self.removed = []
+
+    def remove(self, card_ids):
+        self.removed.extend(card_ids)
+
+class FakeSnapshot:
+    invalidated = 0
+
+    def invalidate(self):
+        FakeSnapshot.invalidated += 1
+
+def patch_board(monkeypatch, trello, index):
+    monkeypatch.setattr(trello_integration, 'fetch_trello_data', lambda: STALE_CARDS)
+    monkeypatch.setattr(trello_integration, 'TRELLO_ARCHIVE_LIST', 'archive-list')
+    monkeypatch.setattr(trello_integration, 'get_trello_client', lambda: trello)
+    monkeypatch.setattr(trello_integration, 'get_blocker_index', lambda: index)
+    monkeypatch.setattr(trello_integration, 'get_board_snapshot', FakeSnapshot)
+
+def test_archive_dry_run_changes_nothing(monkeypatch):
+    trello, index = FakeTrello(), FakeIndex()
+    patch_board(monkeypatch, trello, index)
+    result = archive_old_cards(days=14, dry_run=True)
+    assert result == {"archived": 2, "failed": 0, "skipped": 4, "dry_run": True}
+    assert trello.archived == [] and index.removed == []
+
+def test_archive_counts_failures(monkeypatch):
+    trello, index = FakeTrello(failing={'old-s'}), FakeIndex()
+    patch_board(monkeypatch, trello, index)
+    result = archive_old_cards(days=14, max_workers=2)
+    assert result == {"archived": 1, "failed": 1, "skipped": 4, "dry_run": False}
+    assert trello.archived == [('old-ms', 'archive-list')]
+    assert index.removed == ['old-ms']  # The card that failed to archive stays indexed
+
+def timed(fn):
+    started = time.monotonic()
+    fn()
+    return time.monotonic() - started
+
+def test_rate_limiter_blocks_when_empty_and_refills():
+    limiter = RateLimiter(5, period=0.5)  # One token per 0.1s
+    assert timed(lambda: [limiter.acquire() for _ in range(5)]) < 0.05  # Full bucket
+    assert timed(limiter.acquire) >= 0.08
+    time.sleep(0.5)
+    assert timed(lambda: [limiter.acquire() for _ in range(5)]) < 0.05  # Refilled, capped at rate
+    assert timed(limiter.acquire) >= 0.08
+
+def test_rate_limiter_pause_holds_every_caller():
+    limiter = RateLimiter(100, period=1)
+    limiter.pause(0.2)
+    assert timed(limiter.acquire) >= 0.18
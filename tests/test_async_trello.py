@@ -0,0 +1,132 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import bots.blocker_queue as blocker_queue
+from bots.blocker_queue import BlockerQueue, AsyncBlockerWorker
+from core.trello_client import AsyncTrelloClient, TrelloAPIError, TrelloClient
+
+class ScriptedTrello(BaseHTTPRequestHandler):
+    """Answers each path with the queued error statuses, then 200"""
+    protocol_version = "HTTP/1.1"
+    statuses = {}
+    calls = []
+
+    def _respond(self):
+        path = self.path.split('?')[0]
+        ScriptedTrello.calls.append((self.command, path))
+        queued = ScriptedTrello.statuses.get(path, [])
+        status = queued.pop(0) if queued else 200
+        body = json.dumps({"id": "card-1"} if status == 200 else {"error": status}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = _respond
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def scripted_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedTrello)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ScriptedTrello.statuses = {}
+    ScriptedTrello.calls = []
+    yield f"http://127.0.0.1:{server.server_port}/1"
+    server.shutdown()
+
+def async_call(base_url, method, path, **kwargs):
+    async def call():
+        client = AsyncTrelloClient(api_key="k", token="t", base_url=base_url,
+                                   max_retries=2, backoff_factor=0)
+        try:
+            return await getattr(client, method)(path, **kwargs)
+        finally:
+            await client.close()
+    return asyncio.run(call())
+
+def test_async_get_retries_server_errors(scripted_server):
+    ScriptedTrello.statuses = {"/1/cards/c1": [503, 429]}
+    assert async_call(scripted_server, 'get', "cards/c1") == {"id": "card-1"}
+    assert len(ScriptedTrello.calls) == 3
+
+    ScriptedTrello.statuses = {"/1/cards/c1": [503, 503, 503]}
+    with pytest.raises(TrelloAPIError) as error:
+        async_call(scripted_server, 'get', "cards/c1")
+    assert error.value.status_code == 503
+
+def test_async_get_retries_connection_errors():
+    with pytest.raises(TrelloAPIError):
+        async_call("http://127.0.0.1:9/1", 'get', "cards/c1")  # Nothing listens on the discard port
+
+@pytest.mark.parametrize("key, calls", [(None, 1), ("C1:1.0", 2)])
+def test_post_retries_rate_limit_only_with_idempotency_key(scripted_server, key, calls):
+    ScriptedTrello.statuses = {"/1/cards": [429]}
+    client = TrelloClient(api_key="k", token="t", base_url=scripted_server,
+                          max_retries=2, backoff_factor=0)
+    if key is None:
+        with pytest.raises(TrelloAPIError):
+            client.post("cards", {'name': "Blocker"})
+    else:
+        assert client.post("cards", {'name': "Blocker"}, idempotency_key=key)['id'] == "card-1"
+    assert len(ScriptedTrello.calls) == calls
+
+    ScriptedTrello.calls = []
+    ScriptedTrello.statuses = {"/1/cards": [429]}
+    if key is None:
+        with pytest.raises(TrelloAPIError):
+            async_call(scripted_server, 'post', "cards", params={'name': "Blocker"})
+    else:
+        assert async_call(scripted_server, 'post', "cards", params={'name': "Blocker"},
+                          idempotency_key=key)['id'] == "card-1"
+    assert len(ScriptedTrello.calls) == calls
+
+def test_async_post_is_not_retried_on_server_errors(scripted_server):
+    ScriptedTrello.statuses = {"/1/cards": [503]}
+    with pytest.raises(TrelloAPIError):
+        async_call(scripted_server, 'post', "cards", idempotency_key="C1:1.0")
+    assert len(ScriptedTrello.calls) == 1  # The card may have been created
+
+def test_async_worker_creates_cards_concurrently(tmp_path, monkeypatch):
+    queue = BlockerQueue(str(tmp_path / "queue.db"), max_attempts=1)
+    queue.enqueue("Blocked on review", key="ok")
+    queue.enqueue("Blocked on CI", key="broken")
+    in_flight, peak, notified = [0], [0], []
+
+    async def create_card(text, client, idempotency_key=None):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.05)
+        in_flight[0] -= 1
+        if idempotency_key == "broken":
+            raise TrelloAPIError("API Error 500", status_code=500)
+        return {'id': f"card-{idempotency_key}"}
+
+    async def notify(job, card):
+        notified.append((job['idempotency_key'], card and card['id']))
+
+    monkeypatch.setattr(blocker_queue, 'create_trello_card_async', create_card)
+
+    async def run():
+        worker = AsyncBlockerWorker(queue, client=None, notify=notify, poll_interval=0.01)
+        task = asyncio.create_task(worker.run())
+        while len(notified) < 2:
+            await asyncio.sleep(0.01)
+        worker.stop()
+        await task
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+    assert sorted(notified) == [("broken", None), ("ok", "card-ok")]
+    assert peak[0] == 2
+    statuses = dict(queue.conn.execute("SELECT idempotency_key, status FROM blocker_queue"))
+    assert statuses == {"ok": "done", "broken": "failed"}
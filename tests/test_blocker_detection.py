@@ -0,0 +1,18 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.blocker_detection import BlockerMatcher
+
+def test_word_boundaries():
+    matcher = BlockerMatcher(["blocked", "issue", "help needed"])
+    assert matcher.matches("I'm BLOCKED on review")
+    assert matcher.matches("two issues with login")  # Plural still matches
+    assert not matcher.matches("finally unblocked")
+    assert matcher.find("Help needed: blocked by infra") == ["help needed", "blocked"]
+
+def test_batch_matches_single():
+    matcher = BlockerMatcher(["stuck", "waiting"])
+    texts = ["stuck on CI", "", None, "all good", "waiting\x00stuck", "İstanbul stuck"]
+    assert matcher.score_many(texts) == [1, 0, 0, 0, 2, 1]
+    assert matcher.match_many(texts) == [matcher.matches(t) for t in texts]
@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import numpy as np
+import pytest
+import bots.trello_integration as trello_integration
+from bots.blocker_index import BlockerIndex, minhash, NUM_PERM
+from core.trello_client import TrelloAPIError
+
+REPORT = "Blocked on the staging database migration, deploys are failing"
+REWORDED = "blocked on staging database migration - deploys failing!"
+UNRELATED = "Waiting for design sign-off on the onboarding screens"
+
+@pytest.fixture
+def index(tmp_path):
+    return BlockerIndex(str(tmp_path / "index.db"), threshold=0.5)
+
+def test_minhash_normalises_text_before_shingling():
+    assert minhash(REPORT).shape == (NUM_PERM,)
+    assert np.array_equal(minhash("Stuck on CI!"), minhash("  stuck   on ci "))
+    assert minhash("ci").shape == (NUM_PERM,)  # Shorter than one shingle
+    assert np.mean(minhash(REPORT) == minhash(REWORDED)) > np.mean(minhash(REPORT) == minhash(UNRELATED))
+
+def test_near_duplicates_collide_in_a_band(index):
+    bands = lambda text: set(index._band_keys(minhash(text)))
+    assert bands(REPORT) & bands(REWORDED)
+    assert not bands(REPORT) & bands(UNRELATED)
+
+    index.add("card-1", REPORT)
+    index.add("card-2", UNRELATED)
+    card_id, similarity = index.find_duplicate(REWORDED)
+    assert card_id == "card-1" and 0.5 <= similarity < 1
+    assert index.find_duplicate("Laptop battery swollen, need a replacement") is None
+
+def test_index_survives_reload(index):
+    index.add("card-1", REPORT)
+    reloaded = BlockerIndex(index.db_name, threshold=0.5)
+    assert reloaded.find_duplicate(REWORDED)[0] == "card-1"
+
+def test_removed_cards_stay_removed(index):
+    index.add("card-1", REPORT)
+    index.remove(["card-1", "never-indexed"])
+    assert index.find_duplicate(REWORDED) is None
+    assert not index._buckets
+    assert BlockerIndex(index.db_name, threshold=0.5).find_duplicate(REWORDED) is None
+
+class FakeTrello:
+    def __init__(self, cards):
+        self.cards = cards
+        self.fetched = []
+        self.comments = []
+
+    def get(self, path, params=None):
+        card_id = path.split('/')[1]
+        if path.endswith('/actions'):
+            return [{'data': {'text': text}} for posted_to, text in self.comments if posted_to == card_id]
+        self.fetched.append(card_id)
+        if card_id not in self.cards:
+            raise TrelloAPIError("API Error 404: card not found", status_code=404)
+        return self.cards[card_id]
+
+    def post(self, path, params=None, idempotency_key=None):
+        self.comments.append((path.split('/')[1], params['text']))
+        return {}
+
+class AsyncFakeTrello(FakeTrello):
+    async def get(self, path, params=None):
+        return FakeTrello.get(self, path, params)
+
+    async def post(self, path, params=None, idempotency_key=None):
+        return FakeTrello.post(self, path, params)
+
+def test_duplicate_check_looks_up_only_the_candidate(index, monkeypatch):
+    index.add("archived", REPORT)
+    index.add("open", REPORT + " again")
+    trello = FakeTrello({"archived": {'closed': True}, "open": {'closed': False}})
+    monkeypatch.setattr(trello_integration, 'get_blocker_index', lambda: index)
+    monkeypatch.setattr(trello_integration, 'get_trello_client', lambda: trello)
+    monkeypatch.setattr(trello_integration, 'get_board_snapshot', lambda: pytest.fail("board fetched"))
+
+    duplicate = trello_integration.find_open_duplicate(REPORT)
+    assert duplicate['id'] == "open"
+    assert trello.fetched == ["archived", "open"]
+    assert "archived" not in index._signatures  # Dropped once seen closed
+
+def test_retried_job_comments_on_a_duplicate_once(index, monkeypatch):
+    index.add("open", REPORT)
+    monkeypatch.setattr(trello_integration, 'get_blocker_index', lambda: index)
+    trello = FakeTrello({"open": {'closed': False}})
+    monkeypatch.setattr(trello_integration, 'get_trello_client', lambda: trello)
+
+    for _ in range(2):
+        assert trello_integration.create_trello_card(REWORDED, idempotency_key="C1:1.0")['id'] == "open"
+    trello_integration.create_trello_card(REWORDED, idempotency_key="C1:2.0")
+    assert [text.splitlines()[-1] for _, text in trello.comments] == ["Blocker-Key: C1:1.0", "Blocker-Key: C1:2.0"]
+
+    async_trello = AsyncFakeTrello({"open": {'closed': False}})
+    for _ in range(2):
+        asyncio.run(trello_integration.create_trello_card_async(REWORDED, async_trello, idempotency_key="C1:1.0"))
+    assert len(async_trello.comments) == 1
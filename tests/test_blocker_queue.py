@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import pytest
+from bots.blocker_queue import BlockerQueue
+
+@pytest.fixture
+def db_name(tmp_path):
+    return str(tmp_path / "queue.db")
+
+def job_row(queue, job_id):
+    return queue.conn.execute(
+        "SELECT status, attempts, next_attempt_at, claimed_at FROM blocker_queue WHERE id = ?", (job_id,)
+    ).fetchone()
+
+def test_enqueue_ignores_repeated_key(db_name):
+    queue = BlockerQueue(db_name)
+    assert queue.enqueue("Blocked on review", channel="C1", thread_ts="1.0")
+    assert not queue.enqueue("Blocked on review", channel="C1", thread_ts="1.0")
+    assert queue.enqueue("Blocked on CI", key="explicit")
+    assert queue.depth() == 2
+
+def test_claim_and_fail_back_off_until_exhausted(db_name):
+    queue = BlockerQueue(db_name, max_attempts=2)
+    queue.enqueue("Blocked on review", key="k1")
+
+    job, = queue.claim(10)
+    assert job['attempts'] == 0
+    assert queue.claim(10) == []  # Leased to this worker
+    assert not queue.fail(job, "timeout")
+    status, attempts, next_attempt_at, _ = job_row(queue, job['id'])
+    assert (status, attempts) == ('pending', 1)
+    assert next_attempt_at > time.time()
+    assert queue.claim(10) == []  # Still backing off
+
+    queue.conn.execute("UPDATE blocker_queue SET next_attempt_at = 0")
+    queue.conn.commit()
+    job, = queue.claim(10)
+    assert job['attempts'] == 1
+    assert queue.fail(job, "timeout")
+    assert job_row(queue, job['id'])[0] == 'failed'
+    assert queue.depth() == 0
+
+def test_recover_requeues_only_expired_leases_of_own_source(db_name):
+    slack = BlockerQueue(db_name, source='slack_bot', lease_seconds=60)
+    standup = BlockerQueue(db_name, source='standup_bot', lease_seconds=60)
+    slack.enqueue("Blocked on review", key="slack")
+    standup.enqueue("Blocked on CI", key="standup")
+
+    slack_job, = slack.claim(10)
+    standup_job, = standup.claim(10)
+    assert slack_job['idempotency_key'] == 'slack'
+    assert standup_job['idempotency_key'] == 'standup'
+
+    # A restarted worker must not steal a live claim
+    assert slack.recover() == 0
+    assert slack.claim(10) == []
+
+    slack.conn.execute("UPDATE blocker_queue SET claimed_at = ?", (time.time() - 120,))
+    slack.conn.commit()
+    assert slack.recover() == 1
+    assert job_row(slack, slack_job['id'])[0] == 'pending'
+    assert job_row(slack, standup_job['id'])[0] == 'processing'
+
+    # An expired lease is also claimable directly, without a recover pass
+    job, = standup.claim(10)
+    assert job['id'] == standup_job['id'] and job['attempts'] == 1
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import core.board_mirror as board_mirror
+from core.board_mirror import BoardMirror
+from core.database import Database
+from core.trello_client import TrelloClient
+from tests.conftest import StandInBoard, make_card
+
+def action(action_id, action_type, card_id):
+    return {'id': action_id, 'type': action_type, 'date': "2024-03-01T10:00:00.000Z",
+            'data': {'card': {'id': card_id}}}
+
+@pytest.fixture
+def mirror(board_server, tmp_path):
+    StandInBoard.cards = {
+        "c01": make_card("c01", items=["complete", "incomplete"]),
+        "c02": make_card("c02")
+    }
+    StandInBoard.actions = [action("a001", "createCard", "c02")]
+    client = TrelloClient(api_key="k", token="t", base_url=board_server, backoff_factor=0)
+    return BoardMirror("b1", db=Database(str(tmp_path / "mirror.db")), client=client)
+
+def paths():
+    return [path for path, _ in StandInBoard.requests]
+
+def test_first_sync_loads_the_whole_board(mirror):
+    assert mirror.sync() == 2
+    cards = {card['id']: card for card in mirror.cards()}
+    assert set(cards) == {"c01", "c02"}
+    assert (cards["c01"]['checkItemCount'], cards["c01"]['completedCount']) == (2, 1)
+    assert mirror.db.get_sync_cursor("b1") == "a001"
+    assert "/1/boards/b1/cards" in paths()
+
+def test_incremental_sync_replays_updates_and_deletions(mirror):
+    mirror.sync()
+    StandInBoard.requests = []
+    StandInBoard.cards["c01"] = make_card("c01", name="Renamed")
+    StandInBoard.cards["c03"] = make_card("c03")
+    del StandInBoard.cards["c02"]
+    StandInBoard.actions[:0] = [
+        action("a004", "createCard", "c03"),
+        action("a003", "deleteCard", "c02"),
+        action("a002", "updateCard", "c01")
+    ]
+
+    assert mirror.sync() == 3
+    cards = {card['id']: card for card in mirror.cards()}
+    assert set(cards) == {"c01", "c03"}
+    assert cards["c01"]['name'] == "Renamed" and cards["c01"]['checkItemCount'] == 0
+    assert mirror.db.get_sync_cursor("b1") == "a004"
+    # Only the changed cards were fetched, and the deleted one not at all
+    assert sorted(paths()) == ["/1/boards/b1/actions", "/1/cards/c01", "/1/cards/c03"]
+
+def test_large_delta_falls_back_to_full_sync(mirror, monkeypatch):
+    mirror.sync()
+    StandInBoard.requests = []
+    monkeypatch.setattr(board_mirror, 'MIRROR_RESYNC_THRESHOLD', 1)
+    StandInBoard.cards["c03"] = make_card("c03")
+    StandInBoard.actions[:0] = [action("a003", "createCard", "c03"), action("a002", "updateCard", "c01")]
+
+    assert mirror.sync() == 3
+    assert {card['id'] for card in mirror.cards()} == {"c01", "c02", "c03"}
+    assert "/1/boards/b1/cards" in paths()
+    assert not any(path.startswith("/1/cards/") for path in paths())
+    assert mirror.db.get_sync_cursor("b1") == "a003"
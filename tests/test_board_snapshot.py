@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import pytest
+import core.board_snapshot as board_snapshot
+from core.board_snapshot import BoardSnapshot, SNAPSHOT_FORMAT
+from core.trello_client import TrelloClient
+from tests.conftest import StandInBoard, make_card
+
+def test_snapshot_files_of_another_format_are_ignored(tmp_path):
+    snapshot = BoardSnapshot("b1", ttl=300, cache_dir=str(tmp_path), client=object())
+    with open(snapshot.cache_path, 'w') as f:
+        # Written before the format was recorded: full Trello cards
+        json.dump({"board_id": "b1", "fetched_at": time.time(), "cards": [make_card("c01")]}, f)
+    assert not snapshot._load_from_disk()
+
+    snapshot._store([{'id': "c01"}], time.time(), 1)
+    with open(snapshot.cache_path) as f:
+        assert json.load(f)['format'] == SNAPSHOT_FORMAT
+    assert BoardSnapshot("b1", ttl=300, cache_dir=str(tmp_path), client=object())._load_from_disk()
+
+def card_requests():
+    return sum(1 for path, _ in StandInBoard.requests if path == "/1/boards/b1/cards")
+
+@pytest.fixture
+def snapshot(board_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(board_snapshot, 'BOARD_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(board_snapshot, 'TRELLO_MIRROR_ENABLED', False)
+    StandInBoard.cards = {"c01": make_card("c01", items=["complete"]), "c02": make_card("c02")}
+    client = TrelloClient(api_key="k", token="t", base_url=board_server, backoff_factor=0)
+    return BoardSnapshot("b1", ttl=300, client=client)
+
+def test_cards_are_fetched_once_and_shared_through_disk(snapshot, tmp_path):
+    cards = snapshot.cards()
+    assert [card['id'] for card in cards] == ["c02", "c01"]
+    assert cards[1]['completedCount'] == 1 and 'checklists' not in cards[1]
+    assert snapshot.cards() is cards and snapshot.generation == 1
+    assert os.path.exists(tmp_path / "board_b1.json")
+
+    # Another process starts from the file instead of calling Trello
+    restarted = BoardSnapshot("b1", ttl=300, client=snapshot.client)
+    assert restarted.cards() == cards and restarted.generation == 1
+    assert card_requests() == 1
+
+def test_expired_snapshot_is_refetched(snapshot):
+    snapshot.ttl = 0.1
+    snapshot.cards()
+    StandInBoard.cards["c03"] = make_card("c03")
+    assert len(snapshot.cards()) == 2  # Still fresh
+    time.sleep(0.15)
+    assert len(snapshot.cards()) == 3
+    assert (snapshot.generation, card_requests()) == (2, 2)
+
+def test_invalidate_drops_memory_and_disk_copies(snapshot):
+    snapshot.cards()
+    snapshot.invalidate()
+    assert snapshot.generation == 2 and not os.path.exists(snapshot.cache_path)
+    del StandInBoard.cards["c02"]
+    assert [card['id'] for card in snapshot.cards()] == ["c01"]
+    assert (snapshot.generation, card_requests()) == (3, 2)
+
+def test_frame_is_rebuilt_only_when_cards_change(snapshot):
+    frame = snapshot.frame()
+    assert list(frame['id']) == ["c02", "c01"]
+    assert snapshot.frame() is frame
+    snapshot.invalidate()
+    assert snapshot.frame() is not frame
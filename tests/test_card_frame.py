@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from core.card_frame import card_frame
+from models.risk_predictor import daily_task_series
+
+def make_card(card_id, last_activity, checklists=1, items=3, completed=1, due=None):
+    return {
+        'id': card_id, 'name': f"Card {card_id}", 'desc': '', 'due': due,
+        'dateLastActivity': last_activity, 'closed': False, 'idList': 'list-1', 'labels': [],
+        'checklistCount': checklists, 'checkItemCount': items, 'completedCount': completed
+    }
+
+def test_card_frame_parses_timestamps_once():
+    frame = card_frame([
+        make_card('a', '2024-03-01T23:30:00.000Z', due='2024-03-05T12:00:00.000Z'),
+        make_card('b', None, due='not a date')
+    ])
+    assert frame['dateLastActivity'].iloc[0] == pd.Timestamp('2024-03-01 23:30')
+    assert frame['due'].iloc[0] == pd.Timestamp('2024-03-05 12:00')
+    assert frame['dateLastActivity'].isna().iloc[1] and frame['due'].isna().iloc[1]
+    assert frame['checkItemCount'].dtype == 'int64'
+
+def test_card_frame_handles_empty_board():
+    frame = card_frame([])
+    assert frame.empty and 'dateLastActivity' in frame
+
+def test_daily_task_series_sums_items_per_activity_day():
+    cards = [
+        make_card('a', '2024-03-01T09:00:00.000Z', items=3),
+        make_card('b', '2024-03-01T18:00:00.000Z', items=2),
+        make_card('c', '2024-03-03T10:00:00.000Z', items=4),
+        make_card('d', '2024-03-03T10:00:00.000Z', checklists=0, items=0),  # No checklist
+        make_card('e', '2023-12-01T10:00:00.000Z', items=7),  # Outside the window
+        make_card('f', None, items=5)
+    ]
+    series = daily_task_series(cards, end_date=pd.Timestamp('2024-03-10').date())
+    assert list(series['ds']) == [pd.Timestamp('2024-03-01'), pd.Timestamp('2024-03-03')]
+    assert list(series['y']) == [5, 4]
@@ -0,0 +1,32 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.card_stream import compact_card, iter_board_cards, iter_card_pages
+from core.trello_client import TrelloClient
+from tests.conftest import StandInBoard, make_card
+
+def test_compact_card_collapses_checklists_to_counts():
+    card = make_card("c01", items=["complete", "incomplete", "complete"])
+    card['checklists'].append({'id': "c01-cl2", 'checkItems': [{'id': "x", 'state': "incomplete"}]})
+    card['labels'] = [{'name': "Blocker"}, {'name': ""}]
+    compact = compact_card(card)
+    assert (compact['checklistCount'], compact['checkItemCount'], compact['completedCount']) == (2, 4, 2)
+    assert compact['labels'] == ["Blocker"]
+    assert 'checklists' not in compact and 'idBoard' not in compact
+    assert compact_card({'id': "bare"})['checkItemCount'] == 0
+
+def test_streams_pages_with_before_cursor(board_server):
+    StandInBoard.cards = {f"c{n:02d}": make_card(f"c{n:02d}", items=["complete"]) for n in range(5)}
+    client = TrelloClient(api_key="k", token="t", base_url=board_server, backoff_factor=0)
+
+    cards = list(iter_board_cards("b1", client, page_size=2))
+    assert [card['id'] for card in cards] == ["c04", "c03", "c02", "c01", "c00"]
+    assert all(card['completedCount'] == 1 for card in cards)
+    cursors = [params.get('before') for _, params in StandInBoard.requests]
+    assert cursors == [None, "c03", "c01"]  # Oldest id of the previous page
+
+    StandInBoard.requests = []
+    pages = list(iter_card_pages("b1", client, page_size=2, compact=False))
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert 'checklists' in pages[0][0]
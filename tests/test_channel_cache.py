@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from bots.channel_cache import ChannelCache
+
+class FakeSlack:
+    """conversations_list over two pages of channels"""
+    def __init__(self):
+        self.pages = {
+            None: ([{'id': "C001", 'name': "general", 'is_member': True},
+                    {'id': "C002", 'name': "Team-API"}], "page-2"),
+            "page-2": ([{'id': "C003", 'name': "retrospective", 'is_member': False}], "")
+        }
+        self.calls = []
+
+    def conversations_list(self, types, exclude_archived, limit, cursor=None):
+        self.calls.append(cursor)
+        channels, next_cursor = self.pages[cursor]
+        return {'channels': channels, 'response_metadata': {'next_cursor': next_cursor}}
+
+@pytest.fixture
+def db_name(tmp_path):
+    return str(tmp_path / "channels.db")
+
+def test_resolve_pages_through_every_channel(db_name):
+    slack = FakeSlack()
+    cache = ChannelCache(db_name, refresh_interval=300)
+    assert cache.resolve("retrospective", slack) == "C003"
+    assert slack.calls == [None, "page-2"]
+    assert cache.resolve("team-api", slack) == "C002"  # Case-insensitive, served from memory
+    assert cache.is_member("C001") and not cache.is_member("C002")
+    assert len(slack.calls) == 2
+
+    # A new process starts from the stored channels without listing
+    reloaded = ChannelCache(db_name, refresh_interval=300)
+    assert reloaded.resolve("general", slack) == "C001" and reloaded.is_member("C001")
+    assert len(slack.calls) == 2
+
+def test_misses_list_channels_at_most_once_per_interval(db_name):
+    slack = FakeSlack()
+    cache = ChannelCache(db_name, refresh_interval=300)
+    assert cache.resolve("missing", slack) is None
+    assert cache.resolve("also-missing", slack) is None
+    assert len(slack.calls) == 2  # One refresh (two pages) for both misses
+
+    assert cache.resolve("missing", slack, force_refresh=True) is None
+    assert len(slack.calls) == 4
+
+    cache.refresh_interval = 0
+    cache.resolve("missing", slack)
+    assert len(slack.calls) == 6
+
+def test_events_update_membership_and_names(db_name):
+    cache = ChannelCache(db_name, refresh_interval=300)
+    cache.refresh(FakeSlack())
+
+    cache.handle_event({'type': 'member_joined_channel', 'channel': "C002", 'user': "UBOT"}, "UBOT")
+    cache.handle_event({'type': 'member_joined_channel', 'channel': "C003", 'user': "UOTHER"}, "UBOT")
+    assert cache.is_member("C002") and not cache.is_member("C003")
+
+    cache.handle_event({'type': 'channel_left', 'channel': "C001"})
+    cache.handle_event({'type': 'channel_rename', 'channel': {'id': "C002", 'name': "team-platform"}})
+    cache.handle_event({'type': 'channel_archive', 'channel': "C003"})
+    assert not cache.is_member("C001")
+    assert cache.resolve("team-platform", None) == "C002"
+    assert cache._ids.get("team-api") is None and cache._ids.get("retrospective") is None
+
+    reloaded = ChannelCache(db_name, refresh_interval=300)
+    assert reloaded.is_member("C002") and not reloaded.is_member("C001")
+    assert reloaded._ids.get("team-platform") == "C002" and "C003" not in reloaded._names
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import threading
+from bots.event_dispatcher import EventWorkerPool, SeenEvents, make_dedupe_middleware
+
+def test_seen_events_expire_after_ttl():
+    seen = SeenEvents(ttl=0.05)
+    assert seen.add("Ev1")
+    assert not seen.add("Ev1")  # Slack retry inside the TTL
+    time.sleep(0.06)
+    assert seen.add("Ev1")
+    assert len(seen) == 1
+
+def test_pool_bounds_queue_and_reports_metrics():
+    release = threading.Event()
+    pool = EventWorkerPool(workers=1, max_queue=2, metrics_interval=0)
+    assert pool.submit("message", release.wait)
+    time.sleep(0.05)  # The single worker is now busy
+    assert pool.submit("message", lambda: None)
+    assert pool.submit("message", lambda: None)
+    assert not pool.submit("message", lambda: None)
+    assert pool.metrics()['queue_depth'] == 2
+
+    release.set()
+    pool._queue.join()
+    metrics = pool.metrics()
+    assert metrics['dropped'] == 1
+    assert metrics['handlers']['message']['handled'] == 3
+    assert metrics['handlers']['message']['max_ms'] >= 50
+
+class FakeRequest:
+    headers = {}
+
+def test_dropped_events_are_redelivered_not_skipped():
+    release = threading.Event()
+    handled = []
+    pool = EventWorkerPool(workers=1, max_queue=1, metrics_interval=0)
+    dedupe = make_dedupe_middleware(pool.seen, pool)
+    def deliver(event_id, fn=handled.append):
+        body = {'event_id': event_id}
+        return dedupe(body, FakeRequest(), lambda: pool.submit_event(body, "message", fn, event_id))
+
+    assert deliver("Ev1", lambda event_id: release.wait())
+    time.sleep(0.05)  # The single worker is now busy
+    assert deliver("Ev2")
+
+    # Full queue: the event is refused without being recorded
+    assert deliver("Ev3").status == 503
+    # A drop that races past that check is forgotten once submit fails
+    body = {'event_id': "Ev4"}
+    assert pool.seen.add("Ev4")
+    assert not pool.submit_event(body, "message", handled.append, "Ev4")
+
+    release.set()
+    pool._queue.join()
+    # Slack's redeliveries of the dropped events now run; true duplicates are still acked
+    for event_id in ("Ev3", "Ev4"):
+        assert deliver(event_id) is True
+        pool._queue.join()
+    assert deliver("Ev2").status == 200
+    assert handled == ["Ev2", "Ev3", "Ev4"]
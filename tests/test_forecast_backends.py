@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from models.forecast_backends import BACKENDS, get_forecast_backend
+
+WEEK = np.array([2.0, 8.0, 9.0, 7.0, 6.0, 3.0, 1.0])
+
+def weekly_series(weeks=8, slope=0.1):
+    t = np.arange(weeks * 7)
+    return pd.DataFrame({
+        'ds': pd.date_range("2024-01-01", periods=len(t)),  # A Monday
+        'y': np.tile(WEEK, weeks) + slope * t
+    })
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_backend_follows_weekly_pattern(name):
+    df = weekly_series()
+    forecast = get_forecast_backend(name).fit(df).predict(7)
+
+    assert list(forecast.columns) == ['ds', 'yhat', 'yhat_upper']
+    assert forecast['ds'].iloc[0] == df['ds'].iloc[-1] + pd.Timedelta(days=1)
+    expected = WEEK + 0.1 * np.arange(56, 63)
+    assert np.abs(forecast['yhat'].to_numpy() - expected).max() < 1.0
+    assert (forecast['yhat_upper'] >= forecast['yhat']).all()
+
+def test_missing_days_count_as_zero():
+    df = weekly_series().drop(index=[10, 11])
+    forecast = get_forecast_backend('holt-winters').fit(df).predict(3)
+    assert len(forecast) == 3
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_forecast_backend('arima')
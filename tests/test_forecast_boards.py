@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import models.risk_predictor as risk_predictor
+from core.card_frame import card_frame
+from core.database import Database
+from models.risk_predictor import RiskPredictor, forecast_boards
+
+class FakeSnapshot:
+    """Six weeks of activity on every board but 'b-sparse'"""
+    def __init__(self, board_id):
+        self.board_id = board_id
+
+    def frame(self):
+        if self.board_id == 'b-sparse':
+            return card_frame([])
+        days = pd.date_range(end=pd.Timestamp.now().normalize(), periods=42)
+        return card_frame([{
+            'id': f"c{n}", 'dateLastActivity': day.isoformat() + "Z",
+            'checklistCount': 1, 'checkItemCount': 4 + n % 7, 'completedCount': 0
+        } for n, day in enumerate(days)])
+
+def test_forecast_boards_saves_real_boards_and_reports_the_rest(tmp_path, monkeypatch):
+    # Process-pool workers are forked, so they inherit these patches
+    monkeypatch.setattr(risk_predictor, 'get_board_snapshot', FakeSnapshot)
+    predict_risk = RiskPredictor.predict_risk
+    def predict_or_fail(self, days=7):
+        return pd.DataFrame() if self.board_id == 'b-broken' else predict_risk(self, days)
+    monkeypatch.setattr(RiskPredictor, 'predict_risk', predict_or_fail)
+    db_name = str(tmp_path / "forecast.db")
+
+    report = forecast_boards(['b-ok', 'b-ok2', 'b-sparse', 'b-broken'], days=7, workers=2,
+                             db_name=db_name, backend='holt-winters')
+
+    for board_id in ('b-ok', 'b-ok2'):
+        assert report[board_id]['status'] == 'ok' and report[board_id]['data_source'] == 'trello'
+    assert report['b-sparse']['status'] == 'degraded' and report['b-sparse']['data_source'] == 'fallback'
+    assert report['b-broken']['status'] == 'failed' and 'Empty forecast' in report['b-broken']['error']
+    db = Database(db_name)
+    assert len(db.get_predictions('b-ok')) == 7 and len(db.get_predictions('b-ok2')) == 7
+    assert db.get_predictions('b-sparse').empty and db.get_predictions('b-broken').empty
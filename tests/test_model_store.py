@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from models.model_store import ModelStore, fingerprint
+
+PARAMS = {"n_changepoints": 15}
+
+def make_frame(last=3.0):
+    return pd.DataFrame({"ds": pd.date_range("2024-01-01", periods=3), "y": [1.0, 2.0, last]})
+
+def test_fingerprint_tracks_data_and_params():
+    key = fingerprint(make_frame(), PARAMS)
+    assert key == fingerprint(make_frame(), dict(PARAMS))
+    assert key != fingerprint(make_frame(last=4.0), PARAMS)
+    assert key != fingerprint(make_frame(), {"n_changepoints": 10})
+
+def test_round_trip_and_eviction(tmp_path):
+    store = ModelStore(str(tmp_path), max_models=2)
+    assert store.get("a") is None
+    store.put("a", '{"model": "a"}')
+    store.put("b", '{"model": "b"}')
+    os.utime(tmp_path / "a.json", (1, 1))
+    store.put("c", '{"model": "c"}')
+    assert store.get("a") is None
+    assert store.get("c") == '{"model": "c"}'
+
+def test_latest_follows_series(tmp_path):
+    store = ModelStore(str(tmp_path))
+    assert store.latest("risk-board") is None
+    store.put("a", '{"model": "a"}')
+    store.set_latest("risk-board", "a", baseline_rmse=1.5, warm_starts=0)
+    meta, payload = store.latest("risk-board")
+    assert meta == {"key": "a", "baseline_rmse": 1.5, "warm_starts": 0}
+    assert payload == '{"model": "a"}'
@@ -0,0 +1,22 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from core.pipeline import Pipeline
+
+def test_stages_preserve_order_and_count_items():
+    source = ([i, i + 1] for i in range(0, 100, 2))
+    pipeline = Pipeline(("source", source), [
+        ("double", lambda chunk: [x * 2 for x in chunk]),
+        ("sum", lambda chunk: sum(chunk))
+    ], maxsize=2)
+    assert list(pipeline) == [4 * i + 2 for i in range(0, 100, 2)]
+    assert [stats.items for stats in pipeline.stats] == [100, 100, 100]
+
+def test_stage_errors_reach_the_consumer():
+    def explode(chunk):
+        raise ValueError("bad chunk")
+    pipeline = Pipeline(("source", iter([[1], [2]])), [("explode", explode)])
+    with pytest.raises(ValueError, match="bad chunk"):
+        list(pipeline)
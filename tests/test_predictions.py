@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlite3
+import pandas as pd
+from core.database import Database
+
+def make_forecast(start, yhat):
+    return pd.DataFrame({
+        'ds': pd.date_range(start, periods=3),
+        'yhat': [yhat] * 3,
+        'yhat_upper': [yhat + 2] * 3,
+        'risk': [False, True, False],
+        'recommendation': ["", "Reduce scope by 1 tasks", ""]
+    })
+
+def test_predictions_are_kept_per_board(tmp_path):
+    db = Database(str(tmp_path / "sprints.db"))
+    db.save_prediction(make_forecast("2024-01-01", 5.0), board_id="board-a")
+    db.save_prediction(make_forecast("2024-01-01", 9.0), board_id="board-b")
+    db.save_prediction(make_forecast("2024-01-02", 6.0), board_id="board-a")
+
+    board_a = db.get_predictions("board-a")
+    assert list(board_a['ds'].dt.strftime('%Y-%m-%d')) == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert (board_a['yhat'] == 6.0).all()
+    assert (db.get_predictions("board-b")['yhat'] == 9.0).all()
+
+def test_migration_keeps_legacy_predictions(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE schema_version (version INTEGER PRIMARY KEY, applied_at TIMESTAMP)")
+    conn.executemany("INSERT INTO schema_version (version) VALUES (?)", [(v,) for v in range(1, 13)])
+    conn.execute("CREATE TABLE predictions (ds TIMESTAMP, yhat REAL, yhat_upper REAL, risk INTEGER)")
+    conn.execute("INSERT INTO predictions VALUES ('2024-01-01', 4.0, 6.0, 0)")
+    conn.commit()
+    conn.close()
+
+    legacy = Database(path).get_predictions()
+    assert list(legacy['yhat']) == [4.0]
@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import Database
+
+DAY = 1709251200.0  # 2024-03-01 00:00 UTC
+
+def messages(*offsets):
+    return [{'ts': f"{DAY + offset:.6f}", 'user': "U1", 'text': f"message {offset}"} for offset in offsets]
+
+def test_refreshing_a_day_twice_replaces_its_counts(tmp_path):
+    db = Database(str(tmp_path / "retro.db"))
+    db.save_retro_messages("C1", messages(60, 120, 180))
+    db.set_retro_sentiments("C1", [(f"{DAY + 60:.6f}", 'positive'), (f"{DAY + 120:.6f}", 'negative')], "model-a")
+    db.refresh_retro_rollups("C1", DAY + 60, DAY + 120, "model-a")
+
+    db.save_retro_messages("C1", messages(180, 240))
+    db.set_retro_sentiments("C1", [(f"{DAY + 180:.6f}", 'positive'), (f"{DAY + 240:.6f}", 'neutral')], "model-a")
+    db.refresh_retro_rollups("C1", DAY + 180, DAY + 240, "model-a")
+
+    trend = db.get_sentiment_trend("C1", "2024-03-01")
+    assert len(trend) == 1
+    row = trend.iloc[0]
+    assert (row['day'], row['positive'], row['negative'], row['neutral'], row['samples']) == ("2024-03-01", 2, 1, 1, 4)
+    assert row['sentiment_score'] == 0.25
+
+def test_labels_from_another_model_are_not_reused(tmp_path):
+    db = Database(str(tmp_path / "retro.db"))
+    db.save_retro_messages("C1", messages(60, 120))
+    db.set_retro_sentiments("C1", [(f"{DAY + 60:.6f}", 'positive'), (f"{DAY + 120:.6f}", 'positive')], "model-a")
+    db.set_retro_sentiments("C1", [(f"{DAY + 120:.6f}", 'negative')], "model-b")
+
+    rows = [row for chunk in db.iter_retro_messages("C1", DAY, DAY + 3600, "model-b") for row in chunk]
+    assert [label for _, _, label in rows] == [None, 'negative']
+
+    db.refresh_retro_rollups("C1", DAY, DAY + 3600, "model-b")
+    row = db.get_sentiment_trend("C1", "2024-03-01").iloc[0]
+    assert (row['positive'], row['negative'], row['samples']) == (0, 1, 1)
@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.sentiment_backends import plan_batches, classify_batched
+from bots.retrospective import RetrospectiveAnalyzer
+from bots.sentiment_cache import SentimentCache
+
+class FakeTokenizer:
+    def __call__(self, texts, truncation=True, max_length=128):
+        return {'input_ids': [text.split() for text in texts]}
+
+class FakeAnalyzer:
+    """Scores by word count and fails any batch containing 'boom'"""
+    tokenizer = FakeTokenizer()
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts, batch_size=None):
+        self.batches.append(list(texts))
+        if any('boom' in text for text in texts):
+            raise RuntimeError("inference failed")
+        return [[{'label': 'neutral', 'score': len(text.split())}] for text in texts]
+
+def test_batches_respect_token_budget():
+    lengths = [30, 2, 3, 30, 2, 10]
+    batches = plan_batches(lengths, token_budget=40, max_batch=3)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 3
+        assert len(batch) * max(lengths[i] for i in batch) <= 40 or len(batch) == 1
+
+def test_failed_batches_split_and_order_restored():
+    texts = ["a b c", "x", "boom y", "d e", "f g h i"]
+    analyzer = FakeAnalyzer()
+    results = classify_batched(analyzer, texts, token_budget=100, max_batch=8)
+    assert [r[0]['score'] if r else None for r in results] == [3, 1, None, 2, 4]
+    assert ["boom y"] in analyzer.batches
+
+class StrictTokenizer(FakeTokenizer):
+    """Rejects an empty batch, like Hugging Face tokenizers"""
+    def __call__(self, texts, truncation=True, max_length=128):
+        if not texts:
+            raise ValueError("empty batch")
+        return super().__call__(texts, truncation, max_length)
+
+def test_cached_and_labelled_chunks_skip_the_model(tmp_path):
+    analyzer = FakeAnalyzer()
+    analyzer.tokenizer = StrictTokenizer()
+    assert classify_batched(analyzer, []) == []
+
+    retro = RetrospectiveAnalyzer.__new__(RetrospectiveAnalyzer)
+    retro.sentiment_analyzer = analyzer
+    retro.sentiment_cache = SentimentCache("model", db_name=str(tmp_path / "cache.db"))
+    retro.sentiment_cache.put_many({"good sprint": [{'label': 'positive', 'score': 0.9}]})
+
+    # Every text cached
+    assert retro._classify(["good sprint"]) == [[{'label': 'positive', 'score': 0.9}]]
+    # Every row already labelled
+    labels, new_labels = retro._label_rows([("1.0", "good sprint", 'positive'), ("2.0", "meh", 'neutral')])
+    assert labels == [("1.0", 'positive'), ("2.0", 'neutral')] and new_labels == []
+    assert analyzer.batches == []
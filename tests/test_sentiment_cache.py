@@ -0,0 +1,22 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bots.sentiment_cache import SentimentCache
+
+RESULT = [{"label": "positive", "score": 0.9}]
+
+def test_hits_are_scoped_to_model(tmp_path):
+    db_name = str(tmp_path / "cache.db")
+    cache = SentimentCache("model-a", db_name=db_name)
+    cache.put_many({"great sprint": RESULT})
+    assert cache.get_many(["great sprint", "unknown"]) == {"great sprint": RESULT}
+    assert SentimentCache("model-b", db_name=db_name).get_many(["great sprint"]) == {}
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = SentimentCache("model", db_name=str(tmp_path / "cache.db"), max_entries=2)
+    cache.put_many({"one": RESULT})
+    cache.put_many({"two": RESULT})
+    cache.get_many(["one"])
+    cache.put_many({"three": RESULT})
+    assert set(cache.get_many(["one", "two", "three"])) == {"one", "three"}
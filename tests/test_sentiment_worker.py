@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from models.sentiment_worker import (
+    SentimentBatcher,
+    SentimentWorkerServer,
+    connect_sentiment_worker
+)
+
+def test_concurrent_callers_share_batches(tmp_path):
+    calls = []
+    def analyzer(texts):
+        calls.append(len(texts))
+        return [[{'label': 'neutral', 'score': len(text) / 10}] for text in texts]
+
+    batcher = SentimentBatcher(analyzer, max_batch=64, max_wait_ms=200)
+    batcher.start()
+    socket_path = str(tmp_path / "sentiment.sock")
+    server = SentimentWorkerServer(socket_path, batcher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = connect_sentiment_worker(socket_path)
+        assert client is not None
+        requests = [["a" * n, "b" * (n + 1)] for n in range(1, 9)]
+        with ThreadPoolExecutor(8) as pool:
+            responses = list(pool.map(client, requests))
+        for texts, results in zip(requests, responses):
+            assert [r[0]['score'] for r in results] == [len(t) / 10 for t in texts]
+        assert len(calls) < len(requests)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert connect_sentiment_worker(socket_path) is None
+
+def test_client_falls_back_when_worker_goes_away(tmp_path):
+    batcher = SentimentBatcher(lambda texts: [[{'label': 'worker', 'score': 1.0}] for _ in texts])
+    batcher.start()
+    socket_path = str(tmp_path / "sentiment.sock")
+    server = SentimentWorkerServer(socket_path, batcher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    loads = []
+    def load_local():
+        loads.append(1)
+        return lambda texts: [[{'label': 'local', 'score': 1.0}] for _ in texts]
+
+    client = connect_sentiment_worker(socket_path, fallback=load_local)
+    assert client(["a"])[0][0]['label'] == 'worker'
+    server.shutdown()
+    server.server_close()
+
+    assert client(["a", "b"])[1][0]['label'] == 'local'
+    assert client(["c"])[0][0]['label'] == 'local'
+    assert len(loads) == 1  # Loaded once, not per call
+
+    client.fallback = None
+    client._worker_down_since = None
+    with pytest.raises(OSError):
+        client(["a"])
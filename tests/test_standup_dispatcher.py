@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+from slack_sdk.errors import SlackApiError
+from bots.standup_dispatcher import StandupDispatcher, SlackRateLimits, new_run_id
+
+class FakeResponse(dict):
+    def __init__(self, status_code, error=None, headers=None):
+        super().__init__(ok=False, error=error)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+class FakeSlack:
+    """Rate limits the first post and rejects 'CBROKEN00'"""
+    def __init__(self):
+        self.posts = []
+        self.limited = False
+        self.lock = threading.Lock()
+
+    def chat_postMessage(self, channel, text):
+        with self.lock:
+            if not self.limited:
+                self.limited = True
+                raise SlackApiError("ratelimited", FakeResponse(429, "ratelimited", {"Retry-After": "0"}))
+            if channel == "CBROKEN00":
+                raise SlackApiError("channel_not_found", FakeResponse(404, "channel_not_found"))
+            self.posts.append(channel)
+            return {"ok": True, "ts": f"{len(self.posts)}.000"}
+
+def test_fan_out_retries_and_records(tmp_path):
+    slack = FakeSlack()
+    dispatcher = StandupDispatcher(slack, db_name=str(tmp_path / "standup.db"),
+                                   max_workers=8, limits=SlackRateLimits(post_rate=6000))
+    targets = [f"U{i:07d}" for i in range(40)] + ["CBROKEN00"]
+
+    summary = dispatcher.dispatch(targets, "standup", run_id="run-1")
+    assert (summary["sent"], summary["failed"], summary["skipped"]) == (40, 1, 0)
+    assert sorted(slack.posts) == sorted(targets[:-1])
+
+    # Re-running the same run only retries failures
+    summary = dispatcher.dispatch(targets, "standup", run_id="run-1")
+    assert (summary["sent"], summary["failed"], summary["skipped"]) == (0, 1, 40)
+    statuses = dict(dispatcher.conn.execute("SELECT target, status FROM standup_deliveries"))
+    assert statuses["CBROKEN00"] == "failed" and statuses["U0000000"] == "sent"
+
+def test_new_triggers_start_new_runs_and_retry_reuses_latest(tmp_path):
+    slack = FakeSlack()
+    slack.limited = True
+    dispatcher = StandupDispatcher(slack, db_name=str(tmp_path / "standup.db"),
+                                   limits=SlackRateLimits(post_rate=6000))
+    targets = ["U0000001", "CBROKEN00"]
+
+    first = dispatcher.dispatch(targets, "standup")
+    second = dispatcher.dispatch(targets, "standup", run_id=new_run_id("1700000000.000100"))
+    assert first["run_id"] != second["run_id"]
+    assert second["sent"] == 1 and slack.posts == ["U0000001", "U0000001"]
+    assert dispatcher.latest_run() == second["run_id"]
+
+    retry = dispatcher.dispatch(targets, "standup", run_id=dispatcher.latest_run())
+    assert (retry["sent"], retry["failed"], retry["skipped_targets"]) == (0, 1, ["U0000001"])
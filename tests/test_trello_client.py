@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from core.trello_client import TrelloAPIError, TrelloClient
+
+class StandInTrello(BaseHTTPRequestHandler):
+    """Minimal local Trello stand-in that fails the first N requests"""
+    protocol_version = "HTTP/1.1"
+    failures = {}
+    ports = set()
+
+    def do_GET(self):
+        StandInTrello.ports.add(self.client_address[1])
+        remaining = StandInTrello.failures.get(self.path.split('?')[0], 0)
+        if remaining:
+            StandInTrello.failures[self.path.split('?')[0]] = remaining - 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps([{"id": "c1", "name": "Card"}]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def trello_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInTrello)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StandInTrello.failures = {}
+    StandInTrello.ports = set()
+    yield f"http://127.0.0.1:{server.server_port}/1"
+    server.shutdown()
+
+def test_reuses_connection(trello_server):
+    client = TrelloClient(api_key="k", token="t", base_url=trello_server)
+    for _ in range(3):
+        assert client.get("boards/b1/cards") == [{"id": "c1", "name": "Card"}]
+    assert len(StandInTrello.ports) == 1  # Keep-alive: one TCP connection
+
+def test_retries_server_errors(trello_server):
+    StandInTrello.failures = {"/1/boards/b1/cards": 2}
+    client = TrelloClient(api_key="k", token="t", base_url=trello_server,
+                          backoff_factor=0)
+    assert client.get("boards/b1/cards")[0]['id'] == "c1"
+
+def test_raises_after_retries_exhausted(trello_server):
+    StandInTrello.failures = {"/1/boards/b1/cards": 5}
+    client = TrelloClient(api_key="k", token="t", base_url=trello_server,
+                          max_retries=1, backoff_factor=0)
+    with pytest.raises(TrelloAPIError):
+        client.get("boards/b1/cards")
@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import types
+import pandas as pd
+import pytest
+import models.risk_predictor as risk_predictor
+from models.model_store import ModelStore
+from models.risk_predictor import RiskPredictor
+
+class FakeProphet:
+    """Stands in for prophet.Prophet (not installed here); records warm-start inits"""
+    fail_warm = False
+    inits = []
+
+    def __init__(self, **params):
+        self.params = params
+
+    def fit(self, df, init=None):
+        FakeProphet.inits.append(init)
+        if init is not None and FakeProphet.fail_warm:
+            raise RuntimeError("optimizer failed to initialise")
+        return self
+
+@pytest.fixture
+def rmse(monkeypatch):
+    """Install a fake prophet package; the returned dict sets fit_rmse's result"""
+    prophet = types.ModuleType('prophet')
+    prophet.Prophet = FakeProphet
+    prophet.__version__ = "0.0-fake"
+    serialize = types.ModuleType('prophet.serialize')
+    serialize.model_to_json = lambda model: '{"fake": true}'
+    serialize.model_from_json = lambda payload: FakeProphet()
+    prophet.serialize = serialize
+    monkeypatch.setitem(sys.modules, 'prophet', prophet)
+    monkeypatch.setitem(sys.modules, 'prophet.serialize', serialize)
+
+    FakeProphet.fail_warm = False
+    FakeProphet.inits = []
+    value = {'rmse': 2.0}
+    monkeypatch.setattr(risk_predictor, 'fit_rmse', lambda model, df: value['rmse'])
+    monkeypatch.setattr(risk_predictor, 'warm_start_params', lambda model: {'k': 0.1})
+    monkeypatch.setattr(risk_predictor, 'PROPHET_WARM_START_TOLERANCE', 0.1)
+    monkeypatch.setattr(risk_predictor, 'PROPHET_MAX_WARM_STARTS', 2)
+    return value
+
+def series(day):
+    # A new day of data changes the fingerprint, so every call trains
+    return pd.DataFrame({'ds': pd.date_range("2024-01-01", periods=14 + day), 'y': 5.0})
+
+def make_predictor(tmp_path):
+    return RiskPredictor("b1", model_store=ModelStore(str(tmp_path)), backend='prophet')
+
+def test_warm_fit_rejects_rmse_beyond_tolerance(rmse, tmp_path):
+    predictor = make_predictor(tmp_path)
+    previous = ({'baseline_rmse': 2.0, 'warm_starts': 1}, '{}')
+
+    rmse['rmse'] = 2.15
+    assert predictor._warm_fit(series(0), previous) == {'rmse': 2.15, 'baseline_rmse': 2.0, 'warm_starts': 2}
+    rmse['rmse'] = 2.25
+    assert predictor._warm_fit(series(0), previous) is None
+    assert predictor._warm_fit(series(0), ({'warm_starts': 0}, '{}')) is None  # No baseline recorded
+
+def test_cold_fit_resets_the_baseline_after_max_warm_starts(rmse, tmp_path):
+    predictor = make_predictor(tmp_path)
+    history = []
+    for day in range(4):
+        rmse['rmse'] = 2.0 + day * 0.05
+        predictor._train_prophet(series(day), warm_start=True)
+        meta, _ = predictor.model_store.latest(predictor.series_name)
+        history.append((meta['warm_starts'], meta['baseline_rmse']))
+    assert history == [(0, 2.0), (1, 2.0), (2, 2.0), (0, 2.15)]
+    assert [init is not None for init in FakeProphet.inits] == [False, True, True, False]
+
+def test_warm_fit_errors_fall_back_to_cold_fit(rmse, tmp_path):
+    predictor = make_predictor(tmp_path)
+    predictor._train_prophet(series(0), warm_start=True)
+    FakeProphet.fail_warm = True
+    rmse['rmse'] = 3.0
+
+    predictor._train_prophet(series(1), warm_start=True)
+    meta, _ = predictor.model_store.latest(predictor.series_name)
+    assert (meta['warm_starts'], meta['baseline_rmse']) == (0, 3.0)
+    assert [init is not None for init in FakeProphet.inits] == [False, True, False]